@@ -0,0 +1,104 @@
+"""
+Simulation throughput benchmarks with a JSON history of the results
+"""
+
+import argparse
+import sys
+
+from benchmarks.runner import (
+    append_history,
+    compare,
+    find_baseline,
+    load_history,
+    run_benchmarks,
+)
+from benchmarks.workloads import get_workloads
+from config import PERIOD
+from simulator.simulation import Scheduling
+
+HISTORY_PATH = ".cache/benchmarks/history.json"
+# Relative change of a metric that counts as a regression
+THRESHOLD = 0.05
+
+
+def print_run(run: dict):
+    rss = run.get("peak_rss_kb")
+    print(
+        f"{run['time']} {run['scheduling']} period {run['period']} {run['label']}"
+        f" peak {rss if rss is not None else '?'} KiB"
+    )
+    for workload, results in run["results"].items():
+        print(
+            f"  {workload:<24} load {results['load_seconds']:6.2f} s"
+            f" {results['ticks_per_second']:>10.0f} ticks/s"
+            f" {results['cycles_per_second']:>8.1f} cycles/s"
+            f" {results['instructions_per_second']:>8.1f} instr/s"
+        )
+
+
+def check(history: list[dict], run: dict, threshold: float) -> bool:
+    # Prints the regressions against the baseline, True if there are none
+    baseline = find_baseline(history, run)
+    if baseline is None:
+        print("No earlier run with the same scheduling and period")
+        return True
+
+    regressions = compare(baseline, run, threshold)
+    print(f"Compared to {baseline['time']} {baseline['label']}:")
+    for regression in regressions:
+        print(f"  REGRESSION {regression.line()}")
+
+    if not regressions:
+        print(f"  No regressions beyond {threshold * 100:.1f}%")
+
+    return not regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON history file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="relative change that counts as a regression",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run and record the benchmarks")
+    run_parser.add_argument(
+        "--scheduling",
+        choices=[scheduling.value for scheduling in Scheduling],
+        default=Scheduling.EVENT.value,
+    )
+    run_parser.add_argument("--period", type=int, default=PERIOD)
+    run_parser.add_argument("--label", default="", help="note stored with the run")
+    run_parser.add_argument(
+        "--workload", action="append", help="only run workloads with this name"
+    )
+
+    commands.add_parser("compare", help="compare the last run to the one before")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    if args.command == "compare":
+        if not history:
+            print(f"No runs in {args.history}")
+            return 1
+
+        print_run(history[-1])
+        return 0 if check(history[:-1], history[-1], args.threshold) else 1
+
+    workloads = get_workloads()
+    if args.workload:
+        workloads = [w for w in workloads if w.name in args.workload]
+
+    scheduling = Scheduling(args.scheduling)
+    run = run_benchmarks(workloads, scheduling, args.period, args.label)
+    print_run(run)
+    append_history(args.history, run)
+    return 0 if check(history, run, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Runs the workloads and keeps the results in a JSON history
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak RSS is left out there
+    resource = None
+
+from benchmarks.workloads import Workload
+from config import INIT_TICKS, MODULES, STARTUP_TICKS, TABLES_PATH
+from simulator.simulation import Scheduling, SimulationEngine
+
+# Throughputs are better higher, every other metric is better lower
+THROUGHPUTS = ("ticks_per_second", "cycles_per_second", "instructions_per_second")
+COMPARED = THROUGHPUTS + ("load_seconds",)
+# Metrics of the whole run, peak RSS is shared by all workloads of a process
+RUN_COMPARED = ("peak_rss_kb",)
+# Name of the whole run in regressions
+RUN = "run"
+
+
+@dataclass(frozen=True)
+class Regression:
+    workload: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        # Relative change, positive when worse
+        change = (self.current - self.baseline) / self.baseline
+        return -change if self.metric in THROUGHPUTS else change
+
+    def line(self) -> str:
+        return (
+            f"{self.workload}: {self.metric} {self.baseline:.4g} -> "
+            f"{self.current:.4g} ({self.change * 100:+.1f}% worse)"
+        )
+
+
+def get_peak_rss() -> int | None:
+    # Peak resident set of the whole process in KiB, it never goes down
+    if resource is None:
+        return None
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_workload(
+    workload: Workload, scheduling: Scheduling, period: int
+) -> dict[str, float]:
+    start = time.perf_counter()
+    engine = SimulationEngine.load(MODULES, TABLES_PATH, workload.rom, scheduling)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.reset(INIT_TICKS, STARTUP_TICKS)
+
+    # An instruction starts whenever the step counter is back at zero
+    step_counter = engine.cpu.components["C2:STEP1"]
+    cycles = 0
+    instructions = 0
+    while cycles < workload.cycles and not engine.is_halted():
+        engine.step_cycles(1, period, sample=None, stop_on_halt=False)
+        cycles += 1
+        if not step_counter.get_variables()["Q"]:
+            instructions += 1
+
+    seconds = time.perf_counter() - start
+    return {
+        "load_seconds": load_seconds,
+        "seconds": seconds,
+        "ticks": engine.tick_count,
+        "cycles": cycles,
+        "instructions": instructions,
+        "ticks_per_second": engine.tick_count / seconds,
+        "cycles_per_second": cycles / seconds,
+        "instructions_per_second": instructions / seconds,
+    }
+
+
+def run_benchmarks(
+    workloads: list[Workload], scheduling: Scheduling, period: int, label: str = ""
+) -> dict:
+    results = {
+        workload.name: run_workload(workload, scheduling, period)
+        for workload in workloads
+    }
+    return {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "scheduling": str(scheduling),
+        "period": period,
+        "peak_rss_kb": get_peak_rss(),
+        "results": results,
+    }
+
+
+def load_history(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def append_history(path: str, run: dict):
+    history = load_history(path)
+    history.append(run)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w") as file:
+        json.dump(history, file, indent=2)
+
+
+def find_baseline(history: list[dict], run: dict) -> dict | None:
+    # Latest run of the history with the same scheduling and period
+    for baseline in reversed(history):
+        if (baseline["scheduling"], baseline["period"]) == (
+            run["scheduling"],
+            run["period"],
+        ):
+            return baseline
+
+    return None
+
+
+def compare_metrics(
+    name: str, reference: dict, results: dict, metrics: tuple, threshold: float
+) -> list[Regression]:
+    regressions = []
+    for metric in metrics:
+        current = results.get(metric)
+        previous = reference.get(metric)
+        if not current or not previous:
+            continue
+
+        regression = Regression(name, metric, previous, current)
+        if regression.change > threshold:
+            regressions.append(regression)
+
+    return regressions
+
+
+def compare(baseline: dict, run: dict, threshold: float) -> list[Regression]:
+    # Metrics worse than the baseline by more than threshold, a fraction
+    regressions = []
+    for workload, results in run["results"].items():
+        reference = baseline["results"].get(workload)
+        if reference is not None:
+            regressions += compare_metrics(
+                workload, reference, results, COMPARED, threshold
+            )
+
+    regressions += compare_metrics(RUN, baseline, run, RUN_COMPARED, threshold)
+    return regressions
@@ -0,0 +1,40 @@
+"""
+Fixed programs the benchmarks run
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+# Assembled with the asm_toolchain assembler and linker, the .bin files are
+# not in the repository
+EXAMPLES_PATH = Path(__file__).parent.parent.parent / "asm_toolchain/examples_asm"
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    rom: bytes
+    # Clock cycles to run after reset, the run also stops on halt
+    cycles: int
+
+
+# nop; nop; nop; nop; jmp 0x0000
+NOP_LOOP = bytes([0x00, 0x00, 0x00, 0x00, 0x75, 0x00, 0x00])
+
+# ROM of tests_manual/diag_alu.py and diag_jz.py:
+# ldi-ac 10; cmpi 5; jz 0x000B; ...; hlt
+DIAG = bytes([0x03, 0x0A, 0xDA, 0x05, 0x6B, 0x00, 0x0B, 0x00, 0x00, 0x00, 0xDD, 0xDD])
+
+
+def get_workloads(examples_path: Path = EXAMPLES_PATH) -> list[Workload]:
+    workloads = [
+        # Only the reset sequence
+        Workload("power-on", NOP_LOOP, 0),
+        Workload("nop-loop", NOP_LOOP, 200),
+        Workload("diag", DIAG, 100),
+    ]
+    for path in sorted(examples_path.rglob("*.bin")):
+        name = path.relative_to(examples_path).with_suffix("").as_posix()
+        workloads.append(Workload(f"example:{name}", path.read_bytes(), 1000))
+
+    return workloads
@@ -6,6 +6,7 @@ import csv
 import json
 
 PERIOD = 800
+# Upper bounds, power-on and reset release only run until the design settles
 INIT_TICKS = 200
 STARTUP_TICKS = 200
 CYCLES = 1000
@@ -22,6 +23,10 @@ MODULES = [
 ]
 
 TABLES_PATH = "../microcode/bin"
+# Engine state after the reset sequence, keyed by design, tables and ROM
+SNAPSHOT_PATH = ".cache/snapshots"
+# Parsed and resolved netlists keyed by their contents, tables are mapped on load
+DESIGN_PATH = ".cache/designs"
 
 
 def load_microcode_data() -> (
@@ -5,17 +5,22 @@ Core debugger
 import re
 
 from config import (
+    DESIGN_PATH,
     INIT_TICKS,
     MODULES,
     PERIOD,
+    SNAPSHOT_PATH,
     STARTUP_TICKS,
     TABLES_PATH,
     load_microcode_data,
 )
-from debug.breakpoint import BreakpointManager
+from debug.breakpoint import Breakpoint, BreakpointManager
 from debug.disassembler import Disassembler
 from debug.state import CPUState
 from debug.watch import WatchManager
+from simulator.emulator import MicrocodeEmulator
+from simulator.engine.profiler import ProfileReport
+from simulator.lockstep import load_engine, load_model
 from simulator.simulation import SimulationEngine, State, WaveformChunk
 
 
@@ -24,8 +29,14 @@ class DebuggerCore:
     Core debugger functionality
     """
 
-    def __init__(self, rom_path: str):
+    def __init__(
+        self,
+        rom_path: str,
+        snapshot_path: str | None = SNAPSHOT_PATH,
+        design_path: str | None = DESIGN_PATH,
+    ):
         self.rom_path = rom_path
+        self.snapshot_path = snapshot_path
         self.readers, self.writers, self.microcode, self.cycles = load_microcode_data()
 
         # Load ROM
@@ -33,9 +44,15 @@ class DebuggerCore:
             self.rom = f.read()
 
         # Initialize simulation
-        self.engine = SimulationEngine.load(MODULES, TABLES_PATH, self.rom)
+        self.engine = SimulationEngine.load(
+            MODULES, TABLES_PATH, self.rom, design_path=design_path
+        )
         self.period = PERIOD
         self._component_pins = self.engine.get_component_pins()
+        # Microcode level model for fast forwarding, created on first use
+        self.model: MicrocodeEmulator | None = None
+        # Profile of the last profiling run
+        self.profile: ProfileReport | None = None
 
         # State
         self.state = CPUState()
@@ -55,27 +72,27 @@ class DebuggerCore:
 
     def initialize(self) -> None:
         """
-        Init CPU
+        Init CPU, restoring the state after reset from the snapshot cache
+        when there is one
         """
-        self.engine.set_power(True)
-        self.engine.set_component_variable("I:PAD2", "RESET", 1)
-        self.engine.set_component_variable("I:PAD2", "WAIT", 0)
-
-        # Init ticks
-        for _ in range(INIT_TICKS):
-            chunk = self._tick(verbose=False)
-
-        # Release reset
-        self.engine.set_component_variable("I:PAD2", "RESET", 0)
+        label = f"reset {INIT_TICKS} {STARTUP_TICKS - 1}"
+        if self.snapshot_path is None or not self.engine.load_snapshot(
+            self.snapshot_path, label
+        ):
+            self._reset()
+            if self.snapshot_path is not None:
+                self.engine.save_snapshot(self.snapshot_path, label)
 
-        # Startup ticks
-        for _ in range(STARTUP_TICKS):
-            chunk = self._tick(verbose=False)
+        chunk = self._tick(verbose=False)
 
         self.last_chunk = chunk
         self.initialized = True
         self._update_state()
 
+    def _reset(self) -> None:
+        # Hold reset until the design settles, then startup until settled again
+        self.engine.reset(INIT_TICKS, STARTUP_TICKS - 1)
+
     def _tick(self, verbose: bool = True) -> WaveformChunk:
         chunk = self.engine.tick()
         return chunk
@@ -93,16 +110,7 @@ class DebuggerCore:
             self.instruction_history.pop(0)
         self.instruction_history.append(CPUState(**vars(self.state)))
 
-        # Clock low
-        self.engine.set_component_variable("I:PAD2", "CLOCK", 0)
-        for _ in range(self.period // 2):
-            self._tick(False)
-        self._tick(True)
-
-        # Clock high
-        self.engine.set_component_variable("I:PAD2", "CLOCK", 1)
-        for _ in range(self.period // 2):
-            chunk = self._tick(False)
+        (chunk,) = self.engine.step_cycles(1, self.period, stop_on_halt=False)
 
         self.last_chunk = chunk
         self.state.cycle += 1
@@ -178,6 +186,75 @@ class DebuggerCore:
 
         return self.state
 
+    def fast_forward(self, max_cycles: int) -> Breakpoint | None:
+        """
+        Run clock cycles in the microcode emulator, then continue at gate
+        level from the state it reached.
+
+        The emulator starts from the current engine state, so changes made
+        while inspecting the engine carry over. It stops before executing an
+        instruction at an enabled breakpoint, on halt or after max_cycles.
+
+        Args:
+            max_cycles: Maximum cycles to run
+
+        Returns:
+            The breakpoint hit, None otherwise
+        """
+        if not self.initialized:
+            self.initialize()
+
+        if self.model is None:
+            self.model = MicrocodeEmulator.load(TABLES_PATH, self.rom)
+
+        model = self.model
+        load_model(model, self.engine)
+        breakpoint = None
+        for _ in range(max_cycles):
+            if model.halted:
+                break
+
+            model.step()
+            self.state.cycle += 1
+
+            # The opcode was fetched by the step before, PC is past it
+            if model.step_counter == 0:
+                breakpoint = self.breakpoints.check(model.program_counter - 1)
+                if breakpoint:
+                    break
+
+        load_engine(self.engine, model, STARTUP_TICKS)
+        self.last_chunk = self._tick(verbose=False)
+        self._update_state()
+        return breakpoint
+
+    def start_profiling(self) -> None:
+        """
+        Start timing the components and phases of the simulation
+        """
+        self.engine.cpu.start_profiling()
+
+    def stop_profiling(self) -> ProfileReport | None:
+        """
+        Stop timing, the simulation runs without overhead again
+
+        Returns:
+            The profile of the run, None if not profiling
+        """
+        report = self.engine.cpu.stop_profiling()
+        if report is not None:
+            self.profile = report
+        return report
+
+    def get_profile(self) -> ProfileReport | None:
+        """
+        Get the profile so far while profiling, else of the last run
+        """
+        profiler = self.engine.cpu.profiler
+        if profiler is not None:
+            return profiler.report()
+        return self.profile
+
     def _update_state(self) -> None:
         """
         Update CPU state from last chunk
@@ -41,6 +41,7 @@ class UIStrings:
     HEADER_COMPONENT_PINS: str = "Component Pins: {component}"
     HEADER_COMPONENTS_LIST: str = "Components"
     HEADER_SHORT_CIRCUIT: str = "Short Circuit Check"
+    HEADER_PROFILE: str = "Profile"
 
 
 @dataclass(frozen=True)
@@ -54,6 +55,8 @@ class ExecutionStrings:
     PROGRAM_HALTED: str = "Program has halted"
     PROGRAM_HALTED_ALT: str = "Program halted"
     STOPPED_AFTER_CYCLES: str = "Stopped after {max_cycles} cycles"
+    FAST_FORWARDING: str = "Fast forwarding in the microcode emulator"
+    FAST_FORWARDED: str = "Ran {cycles} cycles, continuing at gate level"
     RESETTING_CPU: str = "Resetting CPU"
     RESET_COMPLETE: str = "CPU reset complete"
     INTERRUPTED: str = "Interrupted"
@@ -172,6 +175,11 @@ class UsageStrings:
     check 10                    - Check 10 clock cycles
     check 100                   - Check 100 clock cycles"""
     USAGE_SET_VAR: str = "Usage: set var <component> <variable> <value>"
+    USAGE_PROFILE: str = """Usage: profile <start|stop|report [count]|dump <path>>
+  Examples:
+    profile start               - Time every component from now on
+    profile report 20           - Show the 20 most expensive components
+    profile dump profile.json   - Write the whole profile as JSON"""
 
 
 @dataclass(frozen=True)
@@ -226,6 +234,19 @@ class SettingsStrings:
     DISASM_CONTEXT: str = "Disassembly context: {count} lines"
 
 
+@dataclass(frozen=True)
+class ProfileStrings:
+    """
+    Profiling messages
+    """
+
+    PROFILING_STARTED: str = "Profiling started"
+    PROFILING_STOPPED: str = "Profiling stopped"
+    NOT_PROFILING: str = "Profiling is not active"
+    NO_PROFILE: str = "No profile, use 'profile start' first"
+    PROFILE_DUMPED: str = "Profile written to {path}"
+
+
 @dataclass(frozen=True)
 class DebuggerStrings:
     ui: UIStrings = field(default_factory=UIStrings)
@@ -236,3 +257,4 @@ class DebuggerStrings:
     usage: UsageStrings = field(default_factory=UsageStrings)
     info: InfoStrings = field(default_factory=InfoStrings)
     settings: SettingsStrings = field(default_factory=SettingsStrings)
+    profile: ProfileStrings = field(default_factory=ProfileStrings)
@@ -16,7 +16,13 @@ from debug.disassembler import Disassembler
 from debug.state import CPUState
 from debug.ui import DebuggerStrings
 from debug.watch import Watch, WatchChange, WatchManager
-from simulator.simulation import LogLevel, SimulationEngine, State, WaveformChunk
+from simulator.simulation import (
+    CycleSample,
+    LogLevel,
+    SimulationEngine,
+    State,
+    WaveformChunk,
+)
 
 STRINGS = DebuggerStrings()
 
@@ -39,6 +45,7 @@ class DebuggerCLI(cmd.Cmd):
             "s": "step",
             "si": "stepi",
             "c": "continue",
+            "ff": "fastforward",
             "r": "run",
             "q": "quit",
             "p": "print",
@@ -286,6 +293,65 @@ class DebuggerCLI(cmd.Cmd):
 
         self._show_current_location()
 
+    def do_fastforward(self, arg: str) -> None:
+        """
+        Run in the microcode emulator, then continue at gate level.
+
+        Usage:
+            fastforward [cycles]
+
+        Alias: ff
+
+        Arguments:
+            cycles  - Maximum clock cycles to run (default: 100000)
+
+        Description:
+            Runs the program without the gate level simulation until the
+            instruction at a breakpoint is about to execute, the CPU halts
+            or the cycles run out. The registers, the step counter and the
+            memory are then loaded into the gate level simulation, which
+            continues from there. Changes made at gate level are picked up
+            by the next fastforward.
+
+        Examples:
+            (gdb-dragonfly) fastforward
+            (gdb-dragonfly) ff 5000
+        """
+        max_cycles = 100000
+        if arg:
+            try:
+                max_cycles = int(arg)
+            except ValueError:
+                print(colored(STRINGS.errors.INVALID_CYCLE_COUNT, Color.RED))
+                return
+
+        print(colored(STRINGS.execution.FAST_FORWARDING, Color.YELLOW))
+        start = self.debugger.state.cycle
+        bp = self.debugger.fast_forward(max_cycles)
+        print(
+            colored(
+                STRINGS.execution.FAST_FORWARDED.format(
+                    cycles=self.debugger.state.cycle - start
+                ),
+                Color.YELLOW,
+            )
+        )
+        if bp:
+            print(
+                colored(
+                    "\n"
+                    + STRINGS.breakpoints.BREAKPOINT_HIT.format(
+                        id=bp.id, address=bp.address
+                    ),
+                    Color.YELLOW,
+                    Color.BOLD,
+                )
+            )
+        elif self.debugger.state.halted:
+            print(colored("\n" + STRINGS.execution.PROGRAM_HALTED_ALT, Color.YELLOW))
+
+        self._show_current_location()
+
     def do_info(self, arg: str) -> None:
         """
         Display various information about the debugger state.
@@ -1018,13 +1084,13 @@ class DebuggerCLI(cmd.Cmd):
         conflicts_found = []
 
         for cycle in range(cycles):
-            # Clock low phase - no conflict checking (transients expected)
-            self.debugger.engine.set_component_variable("I:PAD2", "CLOCK", 0)
-            for _ in range(self.debugger.period // 2):
-                self.debugger._tick(False)
-
-            # Rising edge - THIS is where we check for conflicts
-            chunk = self.debugger._tick(True)
+            # Only the rising edge is checked, other ticks have bus transients
+            (chunk,) = self.debugger.engine.step_cycles(
+                1,
+                self.debugger.period,
+                CycleSample.RISING_EDGE,
+                stop_on_halt=False,
+            )
             for network, state in chunk.network_states.items():
                 if state == State.CONFLICT:
                     drivers = chunk.network_drivers.get(network, [])
@@ -1047,11 +1113,6 @@ class DebuggerCLI(cmd.Cmd):
                         )
                     )
 
-            # Clock high phase - no conflict checking
-            self.debugger.engine.set_component_variable("I:PAD2", "CLOCK", 1)
-            for _ in range(self.debugger.period // 2):
-                self.debugger._tick(False)
-
         # Summary
         print_separator()
         if conflicts_found:
@@ -1121,6 +1182,82 @@ class DebuggerCLI(cmd.Cmd):
         except ValueError:
             print(colored(STRINGS.errors.INVALID_PERIOD, Color.RED))
 
+    def do_profile(self, arg: str) -> None:
+        """
+        Profile where simulation time goes.
+
+        Usage:
+            profile start
+            profile stop
+            profile report [count]
+            profile dump <path>
+
+        Arguments:
+            count   - Number of components to show (default: 10)
+            path    - JSON file to write the profile to
+
+        Description:
+            Times every component, every IC class and the network and
+            backplane phases of the simulation while profiling is on.
+            Stopping swaps the plain simulation loop back in. Reports show
+            the profile so far, or the last one after stopping.
+
+        Examples:
+            (gdb-dragonfly) profile start
+            (gdb-dragonfly) profile report 20
+            (gdb-dragonfly) profile dump profile.json
+        """
+        parts = arg.split()
+        if not parts:
+            print(colored(STRINGS.usage.USAGE_PROFILE, Color.YELLOW))
+            return
+
+        subcmd = parts[0]
+        if subcmd == "start":
+            self.debugger.start_profiling()
+            print(colored(STRINGS.profile.PROFILING_STARTED, Color.GREEN))
+            return
+
+        if subcmd == "stop":
+            if self.debugger.stop_profiling() is None:
+                print(colored(STRINGS.profile.NOT_PROFILING, Color.RED))
+            else:
+                print(colored(STRINGS.profile.PROFILING_STOPPED, Color.GREEN))
+            return
+
+        if subcmd not in ("report", "dump"):
+            print(colored(STRINGS.usage.USAGE_PROFILE, Color.YELLOW))
+            return
+
+        report = self.debugger.get_profile()
+        if report is None:
+            print(colored(STRINGS.profile.NO_PROFILE, Color.YELLOW))
+            return
+
+        if subcmd == "dump":
+            if len(parts) < 2:
+                print(colored(STRINGS.usage.USAGE_PROFILE, Color.YELLOW))
+                return
+            report.dump(parts[1])
+            print(
+                colored(
+                    STRINGS.profile.PROFILE_DUMPED.format(path=parts[1]), Color.GREEN
+                )
+            )
+            return
+
+        count = 10
+        if len(parts) > 1:
+            try:
+                count = int(parts[1])
+            except ValueError:
+                print(colored(STRINGS.errors.INVALID_COUNT, Color.RED))
+                return
+
+        print_header(STRINGS.ui.HEADER_PROFILE)
+        for line in report.lines(count):
+            print(line)
+
     def do_rn(self, arg: str) -> None:
         """
         Read network value(s) - displays state of simulation networks.
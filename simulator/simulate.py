@@ -7,7 +7,13 @@ from config import (
     TABLES_PATH,
     load_microcode_data,
 )
-from simulator.simulation import LogLevel, SimulationEngine, State, WaveformChunk
+from simulator.simulation import (
+    CycleSample,
+    LogLevel,
+    SimulationEngine,
+    State,
+    WaveformChunk,
+)
 
 READERS, WRITERS, MICROCODE, INSTRUCTION_CYCLES = load_microcode_data()
 
@@ -56,8 +62,9 @@ class Simulator:
         self.simulation_engine.set_component_variable("I:PAD2", "RESET", 1)
         self.simulation_engine.set_component_variable("I:PAD2", "WAIT", 0)
 
-        for _ in range(ticks_init):
-            chunk = self.tick(verbose=False)
+        # Tick counts are upper bounds, both phases stop once the design settles
+        self.simulation_engine.settle(ticks_init - 1)
+        chunk = self.tick(verbose=False)
 
         for component, pins in self._component_pins.items():
             if "VCC" not in pins:
@@ -72,34 +79,33 @@ class Simulator:
 
         self.simulation_engine.set_component_variable("I:PAD2", "RESET", 0)
 
+        # Every startup tick is checked for conflicts, a short circuit may
+        # clear again before the design settles
         for _ in range(ticks_startup):
             chunk = self.tick()
+            if self.simulation_engine.cpu.is_settled():
+                break
 
         return chunk
 
     def tick(self, verbose: bool = True):
         chunk = self.simulation_engine.tick()
+        self.report(chunk, verbose)
+        return chunk
 
+    def report(self, chunk: WaveformChunk, verbose: bool = True):
         for level, source, message in chunk.logs:
             self.log(level, source, message, tick=chunk.tick)
 
         if verbose:
             self.check_conflicts(chunk)
 
-        return chunk
-
     def step(self):
-        self.simulation_engine.set_component_variable("I:PAD2", "CLOCK", 0)
-        for _ in range(self.period // 2):
-            c = self.tick(False)
-            # print(f"STATE: NNSSSSFFFIIIIIIII [{c.tick}]")
-            # print_bus(self, c, "STATE", "C3:/STATE", 17)
-        chunk = self.tick()
-        self.simulation_engine.set_component_variable("I:PAD2", "CLOCK", 1)
-        for _ in range(self.period // 2):
-            c = self.tick(False)
-            # print(f"STATE: NNSSSSFFFIIIIIIII [{c.tick}]")
-            # print_bus(self, c, "STATE", "C3:/STATE", 17)
+        # Logs of the skipped ticks are printed with the next captured chunk
+        (chunk,) = self.simulation_engine.step_cycles(
+            1, self.period, CycleSample.RISING_EDGE, stop_on_halt=False
+        )
+        self.report(chunk)
         return chunk
 
 
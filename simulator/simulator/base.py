@@ -16,6 +16,19 @@ class LogLevel(StrEnum):
     ERROR = "ERROR"
 
 
+class CycleSample(StrEnum):
+    # Last tick with CLOCK low, right before it rises
+    RISING_EDGE = "RISING_EDGE"
+    # Last tick of the cycle
+    END = "END"
+
+
+class StopReason(StrEnum):
+    PREDICATE = "PREDICATE"
+    HALT = "HALT"
+    LIMIT = "LIMIT"
+
+
 @dataclass(frozen=True)
 class WaveformChunk:
     network_drivers: dict[str, list[str]]
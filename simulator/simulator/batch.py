@@ -0,0 +1,138 @@
+from simulator.base import State
+from simulator.engine.entities.cpu import CPU
+from simulator.engine.lanes import LaneCPU
+from simulator.engine.loader import load
+from simulator.engine.motherboard import Memory
+from simulator.simulation import CHUNK_STATES, EventBus
+
+
+class BatchEngine:
+    # Runs the same design for several ROMs at once, one lane per ROM, with
+    # the timing of Scheduling.EVENT in every lane
+    lanes: int
+    cpu: LaneCPU
+    memories: list[Memory]
+    events: EventBus
+
+    def __init__(self, cpu: CPU, roms: list[bytes]):
+        if not roms:
+            raise ValueError("At least one ROM is required")
+
+        self._tick = 0
+        self.lanes = len(roms)
+        self.all = (1 << self.lanes) - 1
+        self.events = EventBus()
+        self.cpu = LaneCPU(cpu, self.lanes)
+        for component in self.cpu.components.values():
+            component.set_messaging_provider(self.events)
+
+        self.memories = []
+        for lane, rom in enumerate(roms):
+            memory = Memory()
+            memory.name = f"Motherboard[{lane}]"
+            memory.set_messaging_provider(self.events)
+            memory.set_rom(rom)
+            self.memories.append(memory)
+
+        self.interface = self.cpu.interface
+        self.interface.set_memories(self.memories)
+
+    @classmethod
+    def load(
+        cls, modules_path: str, tables_path: str, roms: list[bytes]
+    ) -> "BatchEngine":
+        return cls(load(modules_path, tables_path), roms)
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
+
+    def set_power(self, state: bool):
+        self.cpu.power = state
+
+    def set_component_variable(
+        self, component_name: str, var: str, value: int, lanes: int | None = None
+    ) -> bool:
+        # lanes is a bit mask of the instances to change, all by default
+        component = self.cpu.components.get(component_name)
+        if component is None:
+            return False
+
+        self.cpu.mark_dirty(component)
+        return component.set_variable(var, value, self.all if lanes is None else lanes)
+
+    def advance(self, ticks: int):
+        is_settled = self.cpu.is_settled
+        propagate = self.cpu.propagate
+        for _ in range(ticks):
+            if is_settled():
+                break
+
+            propagate()
+
+        self._tick += ticks
+
+    def settle(self, max_ticks: int) -> int:
+        ticks = 0
+        while ticks < max_ticks and not self.cpu.is_settled():
+            self.cpu.propagate()
+            ticks += 1
+
+        self._tick += ticks
+        return ticks
+
+    def is_halted(self) -> int:
+        # Bit mask of the halted lanes
+        return self.cpu.is_halted()
+
+    def _set_clock(self, value: bool):
+        self.interface.set_clock(value, self.all)
+        self.cpu.mark_dirty(self.interface)
+
+    def step_cycles(self, cycles: int, period: int, stop_on_halt: bool = True) -> int:
+        # Same clocking as SimulationEngine.step_cycles, stops once every lane
+        # halted, returns the number of cycles run
+        if period < 2:
+            raise ValueError(f"Clock period must be at least 2 ticks, got {period}")
+
+        half = period // 2
+        for cycle in range(1, cycles + 1):
+            self._set_clock(False)
+            self.advance(half + 1)
+            self._set_clock(True)
+            self.advance(half)
+
+            if stop_on_halt and self.is_halted() == self.all:
+                return cycle
+
+        return cycles
+
+    def get_network_states(self, lane: int) -> dict[str, State]:
+        netlist = self.cpu.netlist
+        return {
+            name: CHUNK_STATES[netlist.get_state(slot, lane)]
+            for name, slot in zip(netlist.names, netlist.slots)
+        }
+
+    def get_network_drivers(self, lane: int) -> dict[str, list[str]]:
+        netlist = self.cpu.netlist
+        sources = netlist.sources
+        driver_names = self.cpu.cpu.driver_names
+        return {
+            name: [
+                driver_names.get((i, slot)) or sources[i]
+                for i in netlist.get_drivers(slot, lane)
+            ]
+            for name, slot in zip(netlist.names, netlist.slots)
+        }
+
+    def get_variables(self, lane: int) -> dict[str, dict[str, int]]:
+        # Parts fused into another component have no variables of their own
+        components = self.cpu.components
+        return {
+            name: components[name].get_variables(lane) if name in components else {}
+            for name in self.cpu.cpu.parts
+        }
+
+    def collect_logs(self):
+        return self.events.collect_logs()
@@ -0,0 +1,316 @@
+from simulator.engine.entities.ics.ic74181 import IC74181
+from simulator.engine.loader import load_data
+from simulator.engine.motherboard import Memory
+
+# Bus component codes of microcode/components.py, a register is read from and
+# written to the bus under the same code
+DISABLE = 0x00
+MEMORY = 0x01
+STACK_POINTER_HIGH = 0x02
+STACK_POINTER_LOW = 0x03
+PROGRAM_COUNTER_HIGH = 0x04
+PROGRAM_COUNTER_LOW = 0x05
+ARGUMENT_HIGH = 0x06
+ARGUMENT_LOW = 0x07
+ACCUMULATOR = 0x08
+XH = 0x09
+YL = 0x0A
+YH = 0x0B
+ZL = 0x0C
+ZH = 0x0D
+FLAGS = 0x0E
+INSTRUCTION = 0x0F
+ADDRESS_HIGH = 0x10
+ADDRESS_LOW = 0x11
+# Writer only codes
+INTERRUPT_HANDLE_CONSTANT = 0x0F
+ALU = 0x10
+INTERRUPT_CODE = 0x11
+
+# Bits of the flags register the ALU fills, NOT_CARRY is the carry out of the
+# high 74181
+SIGN = 0x20
+NOT_CARRY = 0x40
+ZERO = 0x80
+
+# Table address bit of a step without a pending interrupt, the interface never
+# raises INTREQ
+NOT_INTERRUPT = 0x8000
+
+REGISTER_NAMES = {
+    STACK_POINTER_HIGH: "SPH",
+    STACK_POINTER_LOW: "SPL",
+    PROGRAM_COUNTER_HIGH: "PCH",
+    PROGRAM_COUNTER_LOW: "PCL",
+    ARGUMENT_HIGH: "ARGH",
+    ARGUMENT_LOW: "ARGL",
+    ACCUMULATOR: "AC",
+    XH: "XH",
+    YL: "YL",
+    YH: "YH",
+    ZL: "ZL",
+    ZH: "ZH",
+    FLAGS: "FR",
+    INSTRUCTION: "IR",
+    ADDRESS_HIGH: "ADDRH",
+    ADDRESS_LOW: "ADDRL",
+}
+
+# Counters and the instruction register, cleared by the reset line
+_RESET = (
+    STACK_POINTER_HIGH,
+    STACK_POINTER_LOW,
+    PROGRAM_COUNTER_HIGH,
+    PROGRAM_COUNTER_LOW,
+    INSTRUCTION,
+    ADDRESS_HIGH,
+    ADDRESS_LOW,
+)
+
+# Fields of a decoded control word
+READER = 0
+WRITER = 1
+ALU_SELECTION = 2
+ALU_MODE = 3
+ALU_CARRY = 4
+FLAGS_FROM_ALU = 5
+HALT = 11
+
+
+def decode(word: tuple[int, int, int, int]) -> tuple:
+    # Control word of code() in microcode/compiler.py back to its fields,
+    # inverted bits are active again
+    b0, b1, b2, b3 = word
+    reader = (
+        (b0 >> 2 & 1)
+        | (b0 >> 1 & 1) << 1
+        | (b0 & 1) << 2
+        | (b0 >> 7 & 1) << 3
+        | (~b2 >> 4 & 1) << 4
+    )
+    writer = (
+        (b0 >> 3 & 1)
+        | (b1 >> 2 & 1) << 1
+        | (b1 >> 1 & 1) << 2
+        | (b1 & 1) << 3
+        | (~b2 >> 3 & 1) << 4
+    )
+    selection = (
+        (b1 >> 4 & 1) | (b1 >> 3 & 1) << 1 | (b2 >> 2 & 1) << 2 | (b2 >> 1 & 1) << 3
+    )
+    return (
+        reader,
+        writer,
+        selection,
+        b0 >> 6 & 1,  # ALU mode
+        ~b0 >> 5 & 1,  # ALU carry
+        ~b0 >> 4 & 1,  # Flags from ALU
+        (b2 >> 6 & 1) - (b2 >> 5 & 1),  # Accumulator shift, 1 is left
+        b1 >> 5 & 1,  # Program counter increment
+        (b2 >> 7 & 1) - (b2 & 1),  # Stack pointer change
+        (b3 >> 3 & 1) - (b3 >> 2 & 1),  # Address change
+        ~b1 >> 7 & 1,  # Step counter clear
+        ~b1 >> 6 & 1,  # Halt
+        ~b3 & 1,  # Interrupt enable
+        ~b3 >> 1 & 1,  # Interrupt disable
+    )
+
+
+def alu(a: int, b: int, selection: int, mode: int, carry: int) -> tuple[int, int]:
+    # Two 74181 nibbles, the carry out of the low one is the carry in of the
+    # high one, A is the high argument and B the low one
+    low, carry = IC74181.compute(a & 0xF, b & 0xF, selection, mode, carry)
+    high, carry = IC74181.compute(a >> 4, b >> 4, selection, mode, carry)
+    return high << 4 | low, carry
+
+
+def alu_flags(value: int, carry: int) -> int:
+    # Flags register bits as the ALU board drives them, its NOR tree sets ZERO
+    # when both bit pairs of either nibble have a bit set
+    zero = (value & 0x03 and value & 0x0C) or (value & 0x30 and value & 0xC0)
+    return (value & 0x80 and SIGN) | (not carry and NOT_CARRY) | (zero and ZERO)
+
+
+class MicrocodeEmulator:
+    # Runs the microcode tables one step per clock cycle without the netlist,
+    # registers are indexed by their bus component code. Matches the design
+    # under Scheduling.SWEEP, EVENT and DELTA, part delays of TIMED may settle
+    # the races around the start of a step differently
+    registers: bytearray
+    step_counter: int
+    cycles: int
+    memory: Memory
+    # Memory writes as (address, value) are appended when set
+    writes: list[tuple[int, int]] | None
+
+    def __init__(self, tables: list[bytes] | list[memoryview], rom: bytes):
+        # Block k of the compiler is table 2k followed by table 2k + 1
+        self._blocks = [b"".join(tables[2 * k : 2 * k + 2]) for k in range(4)]
+        self._decoded = {}
+        self.memory = Memory()
+        self.memory.set_rom(rom)
+        self.registers = bytearray(ADDRESS_LOW + 1)
+        self.step_counter = 0
+        self.cycles = 0
+        self.writes = None
+
+    @classmethod
+    def load(cls, tables_path: str, rom: bytes) -> "MicrocodeEmulator":
+        return cls(load_data(tables_path), rom)
+
+    def reset(self):
+        for register in _RESET:
+            self.registers[register] = 0
+
+        self.step_counter = 0
+
+    def get_word(self, high: int) -> int:
+        # 16-bit register from the code of its high byte
+        return self.registers[high] << 8 | self.registers[high + 1]
+
+    def set_word(self, high: int, value: int):
+        self.registers[high] = value >> 8 & 0xFF
+        self.registers[high + 1] = value & 0xFF
+
+    @property
+    def program_counter(self) -> int:
+        return self.get_word(PROGRAM_COUNTER_HIGH)
+
+    @property
+    def stack_pointer(self) -> int:
+        return self.get_word(STACK_POINTER_HIGH)
+
+    @property
+    def address(self) -> int:
+        return self.get_word(ADDRESS_HIGH)
+
+    def get_registers(self) -> dict[str, int]:
+        return {name: self.registers[code] for code, name in REGISTER_NAMES.items()}
+
+    def get_table_address(self) -> int:
+        registers = self.registers
+        return (
+            registers[INSTRUCTION]
+            | (registers[FLAGS] & (SIGN | NOT_CARRY | ZERO)) << 3
+            | self.step_counter << 11
+            | NOT_INTERRUPT
+        )
+
+    def get_control(self) -> tuple:
+        # Decoded control word of the step about to run
+        address = self.get_table_address()
+        fields = self._decoded.get(address)
+        if fields is None:
+            fields = decode(tuple(block[address] for block in self._blocks))
+            self._decoded[address] = fields
+
+        return fields
+
+    @property
+    def halted(self) -> bool:
+        # The step about to run halts, like the HALT line of the interface
+        return bool(self.get_control()[HALT])
+
+    def get_internal_state(self) -> tuple:
+        return (
+            bytes(self.registers),
+            self.step_counter,
+            self.cycles,
+            self.memory.get_internal_state(),
+        )
+
+    def set_internal_state(self, state: tuple):
+        registers, self.step_counter, self.cycles, memory = state
+        self.registers[:] = registers
+        self.memory.set_internal_state(memory)
+
+    def step(self):
+        # One clock cycle: the writer drives the bus, the reader latches it,
+        # then the counters count
+        (
+            reader,
+            writer,
+            selection,
+            mode,
+            carry,
+            flags_from_alu,
+            shift,
+            pc_change,
+            sp_change,
+            address_change,
+            clear,
+            halt,
+            _,
+            _,
+        ) = self.get_control()
+        registers = self.registers
+        self.cycles += 1
+        if halt:
+            # The step counter stops, nothing else happens on a halt step
+            return
+
+        value = 0
+        if flags_from_alu or writer == ALU:
+            high, low = registers[ARGUMENT_HIGH], registers[ARGUMENT_LOW]
+            result, carry = alu(high, low, selection, mode, carry)
+            if flags_from_alu:
+                registers[FLAGS] = alu_flags(result, carry)
+            if writer == ALU:
+                value = result
+
+        if writer == MEMORY:
+            value = self.memory.read(self.address)
+        elif writer == ACCUMULATOR:
+            value = registers[ACCUMULATOR]
+            if shift > 0:
+                value = value << 1 & 0xFF
+            elif shift < 0:
+                value >>= 1
+        elif writer in (INTERRUPT_HANDLE_CONSTANT, INTERRUPT_CODE):
+            raise RuntimeError(f"Nothing drives the bus for writer 0x{writer:02X}")
+        elif DISABLE < writer < ALU:
+            value = registers[writer]
+
+        if reader == MEMORY:
+            self.memory.write(self.address, value)
+            if self.writes is not None:
+                self.writes.append((self.address, value))
+        elif reader != DISABLE:
+            registers[reader] = value
+
+        if pc_change:
+            self.set_word(PROGRAM_COUNTER_HIGH, self.program_counter + 1 & 0xFFFF)
+        if sp_change:
+            self.set_word(STACK_POINTER_HIGH, self.stack_pointer + sp_change & 0xFFFF)
+        if address_change:
+            self.set_word(ADDRESS_HIGH, self.address + address_change & 0xFFFF)
+
+        self.step_counter = 0 if clear else self.step_counter + 1 & 0xF
+
+        # Register clocks are gated by the high half of the clock, so the
+        # register the next step loads is clocked as soon as the step counter
+        # moves, with the value still on the bus. It is loaded again at the end
+        # of its step, unless the step reads it first, like shl and shr do
+        following = self.get_control()
+        if following[READER] > MEMORY and following[READER] != INSTRUCTION:
+            registers[following[READER]] = value
+        if following[FLAGS_FROM_ALU]:
+            # The new flags may select another control word for the step
+            registers[FLAGS] = alu_flags(
+                *alu(
+                    registers[ARGUMENT_HIGH],
+                    registers[ARGUMENT_LOW],
+                    following[ALU_SELECTION],
+                    following[ALU_MODE],
+                    following[ALU_CARRY],
+                )
+            )
+
+    def step_cycles(self, cycles: int, stop_on_halt: bool = True) -> int:
+        # Returns the number of cycles run
+        for cycle in range(1, cycles + 1):
+            self.step()
+            if stop_on_halt and self.halted:
+                return cycle
+
+        return cycles
@@ -0,0 +1,110 @@
+import hashlib
+import importlib.util
+import inspect
+import os
+from enum import StrEnum
+from types import ModuleType
+
+from simulator.engine.entities.cpu import CPU
+
+# Part of the cache key, bump whenever the module template below changes
+VERSION = 1
+
+
+class Backend(StrEnum):
+    # Every component propagates through its Python method
+    INTERPRETED = "INTERPRETED"
+    # Components with a code generator run from a module specialised for the design
+    COMPILED = "COMPILED"
+
+
+def design_hash(cpu: CPU) -> str:
+    # Generated code depends on the wiring and on the component classes only,
+    # EEPROM contents stay in the components
+    digest = hashlib.sha256(f"version {VERSION}\n".encode())
+    for name in cpu.netlist.names:
+        digest.update(f"network {name}\n".encode())
+
+    classes = set()
+    for component in cpu.components.values():
+        cls = type(component)
+        classes.add(cls)
+        digest.update(f"component {component.name} {cls.__qualname__}\n".encode())
+        for pin, network in sorted(component.pins.items()):
+            digest.update(f"pin {pin} {network.slot}\n".encode())
+        for slot, value in sorted(component.constants.items()):
+            digest.update(f"constant {slot} {value}\n".encode())
+        for slot in sorted(component.dead):
+            digest.update(f"dead {slot}\n".encode())
+
+    for cls in sorted(classes, key=lambda cls: cls.__qualname__):
+        digest.update(inspect.getsource(cls).encode())
+
+    return digest.hexdigest()[:16]
+
+
+def generate_source(cpu: CPU, key: str) -> str:
+    lines = [
+        f"# Generated for design {key}, do not edit",
+        "",
+        "",
+        "def bind(netlist, components):",
+        "    s = netlist.state",
+        "    drive = netlist.drive",
+        "    p = [component.propagate for component in components]",
+        "",
+    ]
+
+    sweep = []
+    for component in cpu.components.values():
+        body = component.generate()
+        if body is None:
+            sweep.append(f"p[{component.id}]()")
+            continue
+
+        lines.append(f"    # {component.name}")
+        lines.append(f"    def c{component.id}():")
+        lines.extend(f"        {line}" for line in body)
+        lines.append(f"    p[{component.id}] = c{component.id}")
+        lines.append("")
+
+        sweep.append(f"# {component.name}")
+        sweep.extend(body)
+
+    lines.append("    def sweep():")
+    lines.extend(f"        {line}" for line in sweep)
+    lines.append("")
+    lines.append("    return p, sweep")
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+def load_module(cpu: CPU, cache_path: str | None = None) -> ModuleType:
+    # Generated modules are written once per design and imported from there,
+    # without a cache path the module only lives in memory
+    key = design_hash(cpu)
+    name = f"design_{key}"
+    if cache_path is None:
+        module = ModuleType(name)
+        code = compile(generate_source(cpu, key), f"<{name}>", "exec")
+        exec(code, module.__dict__)
+        return module
+
+    path = os.path.join(cache_path, f"{name}.py")
+    if not os.path.exists(path):
+        os.makedirs(cache_path, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(generate_source(cpu, key))
+
+        os.replace(temporary, path)
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compile_cpu(cpu: CPU, cache_path: str | None = None):
+    cpu.use_compiled(load_module(cpu, cache_path).bind)
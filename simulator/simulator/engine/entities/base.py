@@ -1,7 +1,9 @@
+import copy
 from abc import ABC, abstractmethod
-from collections import deque
 from enum import StrEnum
 
+from simulator.engine.netlist import FLOATING, HIGH, Netlist
+
 
 class Propagatable(ABC):
     @abstractmethod
@@ -9,38 +11,55 @@ class Propagatable(ABC):
         pass
 
 
-class MessagingProvider:
-    def log(self, source: str, message: str):
-        pass
+# Simulated time of one tick, most 74LS/74HC delays round to a single tick,
+# only the slower 74181, 74LS154 and 28C256 parts take longer
+TICK_NS = 15
 
-    def ok(self, source: str, message: str):
-        pass
+# Message levels, in the order of LogLevel
+INFO = 0
+OK = 1
+WARNING = 2
+ERROR = 3
 
-    def warn(self, source: str, message: str):
-        pass
 
-    def error(self, source: str, message: str):
+class MessagingProvider:
+    # Discards every message, sources registered with it report nothing
+    def register(self, source: str) -> tuple[int, list[bool]]:
+        # Id of the source and the levels it reports, the provider may change
+        # the list in place later
+        return -1, [False, False, False, False]
+
+    def emit(self, level: int, source: int, message: str, args: tuple):
         pass
 
 
 class Messaging:
+    # Messages are str.format() templates, filled in with args only when they
+    # are displayed, a disabled level costs a single lookup
     name: str
     _provider: MessagingProvider = MessagingProvider()
+    _source: int = -1
+    _levels: list[bool] = [False, False, False, False]
 
     def set_messaging_provider(self, provider: MessagingProvider):
         self._provider = provider
+        self._source, self._levels = provider.register(self.name)
 
-    def log(self, message: str):
-        self._provider.log(self.name, message)
+    def log(self, message: str, *args):
+        if self._levels[INFO]:
+            self._provider.emit(INFO, self._source, message, args)
 
-    def ok(self, message: str):
-        self._provider.ok(self.name, message)
+    def ok(self, message: str, *args):
+        if self._levels[OK]:
+            self._provider.emit(OK, self._source, message, args)
 
-    def warn(self, message: str):
-        self._provider.warn(self.name, message)
+    def warn(self, message: str, *args):
+        if self._levels[WARNING]:
+            self._provider.emit(WARNING, self._source, message, args)
 
-    def error(self, message: str):
-        self._provider.error(self.name, message)
+    def error(self, message: str, *args):
+        if self._levels[ERROR]:
+            self._provider.emit(ERROR, self._source, message, args)
 
 
 class NetworkState(StrEnum):
@@ -50,118 +69,257 @@ class NetworkState(StrEnum):
     CONFLICT = "CONFLICT"
 
 
+# Indexed by netlist state code
+NETWORK_STATES = (
+    NetworkState.FLOATING,
+    NetworkState.DRIVEN_LOW,
+    NetworkState.DRIVEN_HIGH,
+    NetworkState.CONFLICT,
+)
+
+
 class Network(Propagatable, Messaging):
+    # View over one slot of the compiled netlist
     name: str
-
-    state: NetworkState
-    drivers: deque[str]
-    new_state: NetworkState
-    new_drivers: deque[str]
+    netlist: Netlist | None
+    slot: int
 
     def __init__(self, name: str):
         self.name = name + "!"
+        self.netlist = None
+        self.slot = -1
+
+    def bind(self, netlist: Netlist, slot: int):
+        self.netlist = netlist
+        self.slot = slot
+
+    def copy(self, netlist: Netlist) -> "Network":
+        network = Network.__new__(Network)
+        network.name = self.name
+        network.bind(netlist, self.slot)
+        return network
+
+    @property
+    def state(self) -> NetworkState:
+        return NETWORK_STATES[self.netlist.state[self.slot]]
+
+    @property
+    def drivers(self) -> list[str]:
+        sources = self.netlist.sources
+        return [sources[i] for i in self.netlist.get_drivers(self.slot)]
+
+    @property
+    def new_state(self) -> NetworkState:
+        return NETWORK_STATES[self.netlist.next[self.slot]]
 
-        self.state = NetworkState.FLOATING
-        self.drivers = deque()
-        self.new_state = NetworkState.FLOATING
-        self.new_drivers = deque()
+    @property
+    def new_drivers(self) -> list[str]:
+        sources = self.netlist.sources
+        return [sources[i] for i in self.netlist.get_next_drivers(self.slot)]
 
     def propagate(self):
-        self.drivers = self.new_drivers.copy()
-        self.state = self.new_state
-        self.new_state = NetworkState.FLOATING
-        self.new_drivers.clear()
+        self.netlist.commit({self.slot})
 
     def is_floating(self) -> bool:
-        return self.state == NetworkState.FLOATING
+        return self.netlist.state[self.slot] == FLOATING
 
     def set(self, component: str, value: bool):
-        if component in self.new_drivers:
-            return
+        self.netlist.drive(self.slot, self.netlist.source_ids[component], value)
 
-        if self.new_state != NetworkState.FLOATING:
-            self.new_state = NetworkState.CONFLICT
-            self.new_drivers.append(component)
-            return
-
-        self.new_state = NetworkState.DRIVEN_HIGH if value else NetworkState.DRIVEN_LOW
-        self.new_drivers.append(component)
+    def drive(self, source: int, value: bool):
+        self.netlist.drive(self.slot, source, value)
 
     def get(self):
         # Return True if last state was DRIVEN_HIGH
         # False if DRIVEN_LOW, CONFLICT or FLOATING
-        return self.state == NetworkState.DRIVEN_HIGH
+        return self.netlist.state[self.slot] == HIGH
 
     def __repr__(self):
-        return f"<Network {self.name}: {self.state} driven by {list(self.drivers)}>"
+        return f"<Network {self.name}: {self.state} driven by {self.drivers}>"
 
 
 class Component(Propagatable, Messaging):
+    # Pin constants (A0, N_OE, ...) are pin numbers on the class and netlist
+    # slots on a bound instance, so get() and set() index the netlist directly
     name: str
+    id: int
     pins: dict[str, Network]
 
+    # Names of pin constants propagate() only reads and only drives, pins in
+    # neither list may be both, VCC and GND count as inputs
+    _INPUTS: list[str] = []
+    _OUTPUTS: list[str] = []
+    # Typical propagation delay in ns by part number prefix (logic family)
+    _DELAYS: dict[str, int] = {}
+
+    # Ticks from an input change to the output change, used by TIMED scheduling
+    delay: int
+
+    # Set by the optimizer: slots of pins tied to a power rail with the value
+    # they have while the part is powered, and slots not worth driving
+    constants: dict[int, bool]
+    dead: set[int]
+
     def __init__(self, name: str, pins: dict[str, Network]):
         self.name = name
+        self.id = -1
         self.pins = pins
+        self.constants = {}
+        self.dead = set()
+        self.delay = 1
 
         self._init()
 
+    def set_part(self, part: str):
+        # Part number from the netlist, picks the delay of its family
+        for prefix, delay in self._DELAYS.items():
+            if part.startswith(prefix):
+                self.delay = max(1, round(delay / TICK_NS))
+
     def _init(self):
         pass
 
+    def bind(self, netlist: Netlist, source: int):
+        self.id = source
+        self._state = netlist.state
+        self._drive = netlist.drive
+
+        slots = {pin: network.slot for pin, network in self.pins.items()}
+        sink = netlist.sink
+        for name, value in self._get_pin_constants():
+            if isinstance(value, str):
+                setattr(self, name, slots.get(value, sink))
+            elif isinstance(value, list):
+                setattr(self, name, [slots.get(v, sink) for v in value])
+            else:
+                setattr(self, name, {slots.get(v, sink) for v in value})
+
+    def copy(self, netlist: Netlist, networks: dict[Network, Network]) -> "Component":
+        # Pin constants, folded constants and contents like EEPROM data are
+        # shared, the copy is not independent until set_internal_state()
+        component = copy.copy(self)
+        component.pins = {pin: networks[network] for pin, network in self.pins.items()}
+        component._state = netlist.state
+        component._drive = netlist.drive
+        return component
+
+    def get_pin_numbers(self, names: list[str]) -> set[str]:
+        result = set()
+        for name in names:
+            value = getattr(type(self), name, ())
+            if isinstance(value, str):
+                result.add(value)
+            else:
+                result.update(value)
+
+        return result
+
+    def get_read_pins(self) -> set[str]:
+        # Connected pins propagate() may read
+        return set(self.pins) - self.get_pin_numbers(self._OUTPUTS)
+
+    def get_driven_pins(self) -> set[str]:
+        # Connected pins propagate() may drive
+        inputs = self.get_pin_numbers(["VCC", "GND"] + self._INPUTS)
+        return set(self.pins) - inputs
+
+    def fold(self, constants: dict[int, bool], dead: set[int]):
+        self.constants = constants
+        self.dead = dead
+
+    def set_zero_delay(self, zero_delay: bool):
+        # Parts with a propagation delay longer than a tick drop it when set
+        pass
+
+    def get_parts(self) -> list["Component"]:
+        # Parts of the netlists this component stands for
+        return [self]
+
+    def get_driver_names(self) -> dict[int, str]:
+        # Part driving a slot, for the slots it is not this component
+        return {}
+
     def get_variable_sizes(self) -> dict[str, int]:
         return {}
 
     def get_variables(self) -> dict[str, int]:
         return {}
 
+    def get_internal_state(self) -> tuple:
+        # Everything besides pin states that affects the next propagate()
+        return ()
+
+    def set_internal_state(self, state: tuple):
+        # Inverse of get_internal_state(), restores a snapshot
+        pass
+
     def set_variable(self, var: str, value: int) -> bool:
         return False
 
-    def get_pin_aliases(self) -> list[tuple[str, str]]:
+    def _get_pin_constants(self) -> list[tuple[str, str | list[str] | set[str]]]:
         result = []
-        for name in dir(self):
+        for name in dir(type(self)):
             if not name.isupper():
                 continue
 
             if name.startswith("_"):
                 continue
 
-            value = getattr(self, name)
+            value = getattr(type(self), name)
+            if not isinstance(value, (str, list, set)):
+                raise AttributeError(f"Invalid constant type: {name}")
+
+            result.append((name, value))
+
+        return result
+
+    def get_pin_aliases(self) -> list[tuple[str, str]]:
+        result = []
+        for name, value in self._get_pin_constants():
             if isinstance(value, str):
                 result.append((value, name))
             elif isinstance(value, list):
                 for i, v in enumerate(value):
                     result.append((v, f"{name}{i}"))
-            elif isinstance(value, set):
+            else:
                 for v in value:
                     result.append((v, name))
-            else:
-                raise AttributeError(f"Invalid constant type: {name}")
 
         return result
 
-    def is_floating(self, pin: str) -> bool:
-        if pin not in self.pins:
-            return True
-
-        return self.pins[pin].is_floating()
-
-    def set(self, pin: str, value: bool):
-        if pin not in self.pins:
-            return
+    def is_floating(self, pin: int) -> bool:
+        return self._state[pin] == FLOATING
 
-        self.pins[pin].set(self.name, value)
+    def set(self, pin: int, value: bool):
+        self._drive(pin, self.id, value)
 
-    def get(self, pin: str) -> bool:
-        if pin not in self.pins:
-            return False
-
-        return self.pins[pin].get()
+    def get(self, pin: int) -> bool:
+        return self._state[pin] == HIGH
 
     @abstractmethod
     def propagate(self):
         pass
 
+    def generate(self) -> list[str] | None:
+        # Source of propagate() for the compiled backend, reads netlist state
+        # from `s` and drives through `drive`, None keeps propagate()
+        return None
+
+    def _code_get(self, pin: int) -> str:
+        # Only valid inside a _code_powered() check once constants are folded
+        if pin in self.constants:
+            return str(self.constants[pin])
+
+        return f"s[{pin}] == {HIGH}"
+
+    def _code_set(self, pin: int, value: str) -> str:
+        if pin in self.dead:
+            return "pass"
+
+        return f"drive({pin}, {self.id}, {value})"
+
+    def _code_powered(self) -> str:
+        return f"s[{self.VCC}] == {HIGH} and s[{self.GND}] != {HIGH}"
+
     def __repr__(self):
         return f"<Component {self.name} with pins {list(self.pins.keys())}>"
@@ -1,11 +1,7 @@
-from collections import deque
+import copy
 
-from simulator.engine.entities.base import (
-    Component,
-    Network,
-    NetworkState,
-    Propagatable,
-)
+from simulator.engine.entities.base import Component, Network, Propagatable
+from simulator.engine.netlist import Netlist
 
 
 class Backplane(Propagatable):
@@ -52,12 +48,20 @@ class Backplane(Propagatable):
     ]
 
     name: str
+    id: int
+    netlist: Netlist | None
     networks: dict[str, list[Network]]
+    vcc_slots: list[int]
+    gnd_slots: list[int]
     power: bool = False
 
     def __init__(self, name: str):
         self.name = name
+        self.id = -1
+        self.netlist = None
         self.networks = {}
+        self.vcc_slots = []
+        self.gnd_slots = []
         self.power = False
 
         for i in range(1, 83):
@@ -65,40 +69,36 @@ class Backplane(Propagatable):
             self.networks[f"A{i}"] = []
 
     def propagate(self):
-        for pin in self.VCC:
-            networks = self.networks[pin]
-            for network in networks:
-                network.set(self.name, self.power)
-
-        for pin in self.GND:
-            networks = self.networks[pin]
-            for network in networks:
-                network.set(self.name, not self.power)
-
-        # Naive synchronization
-        for pin, networks in self.networks.items():
-            state = NetworkState.FLOATING
-            drivers = set()
-            for network in networks:
-                drivers |= set(network.new_drivers)
-                if state == NetworkState.CONFLICT:
-                    continue
-
-                if network.new_state == NetworkState.CONFLICT:
-                    state = NetworkState.CONFLICT
-                elif (
-                    network.new_state != NetworkState.FLOATING
-                    and state == NetworkState.FLOATING
-                ):
-                    state = network.new_state
-                elif network.new_state == state and len(drivers) == 1:
-                    continue
-                elif network.new_state != NetworkState.FLOATING:
-                    state = NetworkState.CONFLICT
-
-            for network in networks:
-                network.new_state = state
-                network.new_drivers = deque(drivers)
+        # Networks sharing a pin are merged at load time, only power is left
+        self.drive_power()
+
+    def bind(self, netlist: Netlist, source: int):
+        self.netlist = netlist
+        self.id = source
+        self.vcc_slots = self._get_slots(self.VCC)
+        self.gnd_slots = self._get_slots(self.GND)
+
+    def copy(self, netlist: Netlist) -> "Backplane":
+        # Wiring is only used while loading, it stays shared
+        backplane = copy.copy(self)
+        backplane.netlist = netlist
+        return backplane
+
+    def _get_slots(self, pins: list[str]) -> list[int]:
+        return sorted({network.slot for pin in pins for network in self.networks[pin]})
+
+    def drive_power(self):
+        netlist = self.netlist
+        for slot in self.vcc_slots:
+            netlist.release(self.id, (slot,))
+            netlist.drive(slot, self.id, self.power)
+
+        for slot in self.gnd_slots:
+            netlist.release(self.id, (slot,))
+            netlist.drive(slot, self.id, not self.power)
+
+    def get_power_slots(self) -> set[int]:
+        return set(self.vcc_slots + self.gnd_slots)
 
     def power_on(self):
         self.power = True
@@ -122,5 +122,11 @@ class BusConnector(Component):
         for pin, network in self.pins.items():
             backplane.networks[pin].append(network)
 
+    def get_read_pins(self) -> set[str]:
+        return set()
+
+    def get_driven_pins(self) -> set[str]:
+        return set()
+
     def propagate(self):
         pass
@@ -1,26 +1,342 @@
+from enum import StrEnum
+from typing import Callable
+
 from simulator.engine.entities.base import Component, Network, Propagatable
 from simulator.engine.entities.busconnector import Backplane
 from simulator.engine.entities.interface import Interface
+from simulator.engine.netlist import Netlist
+from simulator.engine.optimizer import OptimizationReport
+from simulator.engine.profiler import Profiler, ProfileReport
+
+
+class Scheduling(StrEnum):
+    # Propagate every component and network on every tick
+    SWEEP = "SWEEP"
+    # Propagate only components whose networks or internal state changed
+    EVENT = "EVENT"
+    # Repeat EVENT delta cycles until stable on every tick, memories respond
+    # without delay. Not a levelised pass, gates keep their unit delay
+    DELTA = "DELTA"
+    # Like EVENT, but every part responds after the delay of its logic family
+    TIMED = "TIMED"
+
+
+# Delta cycles a single propagate may take in DELTA mode before it counts as
+# an oscillation
+DELTA_LIMIT = 1000
+
+# Ticks ahead TIMED mode can schedule, longer than any part delay
+WHEEL_SIZE = 16
+
+# Methods timed as a phase while profiling, the backplane drives power only
+PROFILED_PHASES = (
+    ("networks", "netlist", ("resolve", "commit", "swap")),
+    ("backplane", "backplane", ("drive_power",)),
+)
 
 
 class CPU(Propagatable):
+    scheduling: Scheduling
+    # Report of the optimizer passes run by the loader, None if skipped
+    optimization: OptimizationReport | None
+    # Set while profiling
+    profiler: Profiler | None
+
     def __init__(
         self,
         components: dict[str, Component],
         networks: dict[str, Network],
         interface: Interface,
         backplane: Backplane,
+        netlist: Netlist,
+        fanout: list[list[Component]],
     ):
         self.components = components
         self.networks = networks
         self.interface = interface
         self.backplane = backplane
+        self.netlist = netlist
+        self.fanout = fanout
 
-    def propagate(self):
+        # Components under the names of the netlists, fused parts stand for
+        # the parts they replaced, and their driver names by source and slot
+        self.parts = {
+            part.name: part
+            for component in components.values()
+            for part in component.get_parts()
+        }
+        self.driver_names = {
+            (component.id, slot): name
+            for component in components.values()
+            for slot, name in component.get_driver_names().items()
+        }
+
+        # Slots a component may drive, released and resolved when it propagates
+        self._component_slots = {
+            component: {component.pins[pin].slot for pin in component.get_driven_pins()}
+            for component in components.values()
+        }
+        # Indexed by source id, replaced by the compiled backend
+        self._propagators = [component.propagate for component in components.values()]
+        self._sweep = self._sweep_components
+        self._bind = None
+
+        # Readers of every slot grouped by delay, for TIMED mode
+        self._delayed_fanout = []
+        for readers in fanout:
+            delays = {}
+            for component in readers:
+                if component.delay >= WHEEL_SIZE:
+                    raise ValueError(
+                        f"Delay of {component.name} is too long: {component.delay}"
+                    )
+
+                delays.setdefault(component.delay, []).append(component)
+
+            self._delayed_fanout.append(list(delays.items()))
+
+        # Components due on every upcoming tick, a ring indexed by tick number
+        self._wheel = [set() for _ in range(WHEEL_SIZE)]
+        self._now = 0
+
+        self._dirty = set()
+        self._power = None
+        self._snapshot = None
+        self._settled = False
+        self.scheduling = Scheduling.SWEEP
+        self.optimization = None
+        self.profiler = None
+        self._plain = None
+
+    def use_compiled(self, bind: Callable):
+        # bind(netlist, components) of a generated module, returns the
+        # propagators and the sweep
+        self._bind = bind
+        self._propagators, self._sweep = bind(
+            self.netlist, list(self.components.values())
+        )
+
+    def copy(self) -> "CPU":
+        # Same design in the same state, only the state is copied
+        netlist = Netlist(self.netlist.names, self.netlist.sources, self.netlist.slots)
+        networks = {
+            network: network.copy(netlist) for network in self.networks.values()
+        }
+        components = {
+            name: component.copy(netlist, networks)
+            for name, component in self.components.items()
+        }
+        cpu = CPU(
+            components,
+            {name: networks[network] for name, network in self.networks.items()},
+            components[self.interface.name],
+            self.backplane.copy(netlist),
+            netlist,
+            [[components[c.name] for c in readers] for readers in self.fanout],
+        )
+        cpu.optimization = self.optimization
+        if self._bind is not None:
+            cpu.use_compiled(self._bind)
+
+        cpu.set_scheduling(self.scheduling)
+        cpu.set_internal_state(self.get_internal_state())
+        return cpu
+
+    def start_profiling(self) -> Profiler:
+        # Swaps in timed propagators and phases, stop_profiling swaps the
+        # plain ones back so there is no overhead once it stopped
+        if self.profiler is not None:
+            return self.profiler
+
+        profiler = Profiler(list(self.components.values()))
+        self._plain = (self._propagators, self._sweep)
+        propagators = [
+            profiler.wrap_component(i, propagate)
+            for i, propagate in enumerate(self._propagators)
+        ]
+
+        def sweep():
+            for propagate in propagators:
+                propagate()
+
+        self._propagators = propagators
+        self._sweep = sweep
+        for phase, owner, methods in PROFILED_PHASES:
+            owner = getattr(self, owner)
+            for method in methods:
+                wrapped = profiler.wrap_phase(phase, getattr(owner, method))
+                setattr(owner, method, wrapped)
+
+        self.propagate = profiler.wrap_total(self.propagate)
+        self.profiler = profiler
+        return profiler
+
+    def stop_profiling(self) -> ProfileReport | None:
+        if self.profiler is None:
+            return None
+
+        # Instance attributes shadow the methods of the class
+        self._propagators, self._sweep = self._plain
+        for _, owner, methods in PROFILED_PHASES:
+            owner = getattr(self, owner)
+            for method in methods:
+                delattr(owner, method)
+
+        del self.propagate
+        report = self.profiler.report()
+        self.profiler = None
+        self._plain = None
+        return report
+
+    def _sweep_components(self):
         for component in self.components.values():
             component.propagate()
 
+    def set_scheduling(self, scheduling: Scheduling):
+        self.netlist.set_holding(scheduling != Scheduling.SWEEP)
+        for component in self.components.values():
+            component.set_zero_delay(scheduling in (Scheduling.DELTA, Scheduling.TIMED))
+
+        self.scheduling = scheduling
+        self._dirty = set(self.components.values())
+        for due in self._wheel:
+            due.clear()
+        self._power = None
+        self._snapshot = None
+        self._settled = False
+
+    def mark_dirty(self, component: Component):
+        self._dirty.add(component)
+        self._settled = False
+
+    def is_settled(self) -> bool:
+        # Another tick would reproduce exactly the current state
+        if self._power != self.backplane.power:
+            return False
+
+        if self.scheduling == Scheduling.SWEEP:
+            return self._settled
+
+        if self.scheduling == Scheduling.TIMED:
+            return not self._dirty and not any(self._wheel)
+
+        return not self._dirty
+
+    def get_internal_state(self) -> tuple:
+        return (
+            self.backplane.power,
+            self._power,
+            self._settled,
+            sorted(component.id for component in self._dirty),
+            self.netlist.get_internal_state(),
+            [component.get_internal_state() for component in self.components.values()],
+            self._now,
+            [sorted(component.id for component in due) for due in self._wheel],
+        )
+
+    def set_internal_state(self, state: tuple):
+        # Scheduling is not part of the state, it has to match the saved one
+        power, self._power, self._settled, dirty, netlist, internal, now, wheel = state
+        self.backplane.power = power
+        components = list(self.components.values())
+        self._dirty = {components[i] for i in dirty}
+        self._now = now
+        self._wheel = [{components[i] for i in due} for due in wheel]
+        self.netlist.set_internal_state(netlist)
+        for component, component_state in zip(components, internal):
+            component.set_internal_state(component_state)
+
+        self._snapshot = None
+
+    def propagate(self):
+        if self.scheduling == Scheduling.EVENT:
+            self._propagate_events()
+            return
+
+        if self.scheduling == Scheduling.DELTA:
+            self._propagate_delta()
+            return
+
+        if self.scheduling == Scheduling.TIMED:
+            self._propagate_timed()
+            return
+
+        self._sweep()
+
         self.backplane.propagate()
+        changed = self.netlist.swap()
+
+        self._power = self.backplane.power
+        # Internal states are only compared once the pins stopped changing
+        if changed:
+            self._settled = False
+            self._snapshot = None
+            return
+
+        snapshot = [
+            component.get_internal_state() for component in self.components.values()
+        ]
+        self._settled = snapshot == self._snapshot
+        self._snapshot = snapshot
+
+    def _propagate_events(self):
+        for slot in self._evaluate():
+            self._dirty.update(self.fanout[slot])
+
+    def _propagate_timed(self):
+        # Readers of a changed slot are due as many ticks later as their delay,
+        # a tick with nothing due does nothing
+        wheel = self._wheel
+        now = self._now
+        self._now = now + 1
+        due = wheel[now % WHEEL_SIZE]
+        if due:
+            self._dirty |= due
+            due.clear()
+
+        for slot in self._evaluate():
+            for delay, readers in self._delayed_fanout[slot]:
+                wheel[(now + delay) % WHEEL_SIZE].update(readers)
+
+    def _evaluate(self) -> list[int]:
+        # Propagates the dirty components, returns the slots that changed
+        netlist = self.netlist
+        propagators = self._propagators
+        dirty = sorted(self._dirty, key=lambda c: c.id)
+        self._dirty = set()
+
+        touched = set()
+        for component in dirty:
+            slots = self._component_slots[component]
+            netlist.release(component.id, slots)
+
+            before = component.get_internal_state()
+            propagators[component.id]()
+            if component.get_internal_state() != before:
+                self._dirty.add(component)
+
+            touched |= slots
+
+        if self._power != self.backplane.power:
+            self._power = self.backplane.power
+            self.backplane.drive_power()
+            touched |= self.backplane.get_power_slots()
+
+        for slot in touched:
+            netlist.resolve(slot)
+
+        return netlist.commit(touched)
+
+    def _propagate_delta(self):
+        # Delta cycles until nothing changes, gates keep their unit delay so
+        # pulse generators built from inverter chains still fire
+        for _ in range(DELTA_LIMIT):
+            self._propagate_events()
+            if not self._dirty:
+                return
 
-        for network in self.networks.values():
-            network.propagate()
+        names = sorted(component.name for component in self._dirty)
+        raise RuntimeError(
+            f"Oscillation: no stable state after {DELTA_LIMIT} delta cycles, "
+            f"still changing: {names}"
+        )
@@ -1,6 +1,7 @@
 from collections import deque
 
 from simulator.engine.entities.base import Component
+from simulator.engine.netlist import HIGH, Netlist
 
 
 class IC28C256(Component):
@@ -37,7 +38,33 @@ class IC28C256(Component):
     N_OE = "22"
     N_WE = "27"
 
-    memory: bytearray
+    _INPUTS = [
+        "A0",
+        "A1",
+        "A2",
+        "A3",
+        "A4",
+        "A5",
+        "A6",
+        "A7",
+        "A8",
+        "A9",
+        "A10",
+        "A11",
+        "A12",
+        "A13",
+        "A14",
+        "N_CS",
+        "N_OE",
+        "N_WE",
+    ]
+    _OUTPUTS = ["D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7"]
+    # Access time
+    _DELAYS = {"28C": 150}
+
+    # Read-only contents, e.g. a mapped table file, until a write replaces
+    # them with a private copy
+    memory: bytes | memoryview | bytearray
 
     # Used for pseudo-delay in reading
     # Since 74ls04 has abous 10-15ns delay, we say that one tick is 15ns
@@ -46,13 +73,28 @@ class IC28C256(Component):
     # and compute output based on value from 10 ticks ago
     # yet still if OE or CS go high, we tri-state outputs in 3 ticks
     history: deque[int]
+    zero_delay: bool
     _SIZE = 32768
+    _BLANK = bytes(_SIZE)
 
     def _init(self):
-        self.memory = bytearray([0] * self._SIZE)
+        self.memory = self._BLANK
         self.history = deque(maxlen=10)
+        self.zero_delay = False
+
+    def set_zero_delay(self, zero_delay: bool):
+        if zero_delay != self.zero_delay:
+            self.history.clear()
+
+        self.zero_delay = zero_delay
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.history)
 
-    def load_data(self, data: bytes | list[int], offset: int = 0):
+    def set_internal_state(self, state: tuple):
+        self.history = deque(state, maxlen=10)
+
+    def load_data(self, data: bytes | memoryview | list[int], offset: int = 0):
         if offset < 0 or offset >= self._SIZE:
             raise ValueError(f"Offset {offset} is out of bounds")
 
@@ -62,7 +104,19 @@ class IC28C256(Component):
                 f"Data too long: {length} bytes at offset {offset} exceeds memory size"
             )
 
-        self.memory[offset : offset + length] = data
+        # Whole read-only images are shared without a copy, anything else is
+        # copied on write. Engine clones share the contents either way
+        if length == self._SIZE and isinstance(data, (bytes, memoryview)):
+            readonly = memoryview(data).readonly
+        else:
+            readonly = False
+
+        if readonly:
+            self.memory = data
+        else:
+            memory = bytearray(self.memory)
+            memory[offset : offset + length] = data
+            self.memory = memory
         self.log(
             f"Loaded {length} bytes. Range: 0x{offset:04X} - 0x{offset+length-1:04X}"
         )
@@ -72,8 +126,7 @@ class IC28C256(Component):
             return
 
         if self.get(self.N_CS):
-            self.history.append(-1)
-            self._process()
+            self._push(-1)
             return
 
         if not self.get(self.N_WE):
@@ -82,8 +135,7 @@ class IC28C256(Component):
             return
 
         if self.get(self.N_OE):
-            self.history.append(-1)
-            self._process()
+            self._push(-1)
             return
 
         address = 0
@@ -118,7 +170,15 @@ class IC28C256(Component):
         if self.get(self.A14):
             address |= 1 << 14
 
-        self.history.append(self.memory[address])
+        self._push(self.memory[address])
+
+    def _push(self, data: int):
+        if self.zero_delay:
+            if data != -1:
+                self._set_outputs(data)
+            return
+
+        self.history.append(data)
         self._process()
 
     def _process(self):
@@ -126,8 +186,9 @@ class IC28C256(Component):
             if self.history[i] == -1:
                 return
 
-        data = self.history[0]
+        self._set_outputs(self.history[0])
 
+    def _set_outputs(self, data: int):
         self.set(self.D0, bool((data >> 0) & 1))
         self.set(self.D1, bool((data >> 1) & 1))
         self.set(self.D2, bool((data >> 2) & 1))
@@ -136,3 +197,137 @@ class IC28C256(Component):
         self.set(self.D5, bool((data >> 5) & 1))
         self.set(self.D6, bool((data >> 6) & 1))
         self.set(self.D7, bool((data >> 7) & 1))
+
+
+class IC28C256Bank(Component):
+    # EEPROMs sharing their address, power and control networks, fused by the
+    # loader into one part that decodes the address once, keeps one delay line
+    # of addresses and drives the data pins of all of them from their contents.
+    # Data pin 8 * k + i is D<i> of the k-th chip
+    VCC = "VCC"
+    GND = "GND"
+    N_CS = "N_CS"
+    N_OE = "N_OE"
+    N_WE = "N_WE"
+    A = [f"A{i}" for i in range(15)]
+    D = [f"D{i}" for i in range(64)]
+
+    _INPUTS = ["A", "N_CS", "N_OE", "N_WE"]
+    _OUTPUTS = ["D"]
+
+    chips: list[IC28C256]
+    # Contents of the chips, shared with them and read-only until a chip is
+    # written, set by load_memories()
+    memories: list[bytes | memoryview | bytearray]
+    # Same delay line as IC28C256, of addresses
+    history: deque[int]
+    zero_delay: bool
+
+    def __init__(self, name: str, chips: list[IC28C256]):
+        if not 1 < len(chips) <= 8:
+            raise ValueError(f"Cannot fuse {len(chips)} EEPROMs into one bank")
+
+        first = chips[0]
+        pins = {
+            pin: first.pins[getattr(IC28C256, pin)]
+            for pin in ["VCC", "GND", "N_CS", "N_OE", "N_WE"]
+        }
+        for pin in self.A:
+            pins[pin] = first.pins[getattr(IC28C256, pin)]
+
+        for k, chip in enumerate(chips):
+            for i in range(8):
+                network = chip.pins.get(getattr(IC28C256, f"D{i}"))
+                if network is not None:
+                    pins[self.D[8 * k + i]] = network
+
+        self.chips = chips
+        super().__init__(name, pins)
+        self.delay = first.delay
+
+    def _init(self):
+        self.memories = []
+        self.history = deque(maxlen=10)
+        self.zero_delay = False
+
+    def bind(self, netlist: Netlist, source: int):
+        super().bind(netlist, source)
+        # Connected data pins with their chip and the bit of its byte
+        self._outputs = [
+            (slot, bit // 8, bit % 8)
+            for bit, slot in enumerate(self.D)
+            if slot != netlist.sink
+        ]
+
+    def get_parts(self) -> list[Component]:
+        return list(self.chips)
+
+    def get_driver_names(self) -> dict[int, str]:
+        return {slot: self.chips[chip].name for slot, chip, _ in self._outputs}
+
+    def load_memories(self):
+        # Picks up the contents of the chips, after they were loaded or written
+        self.memories = [chip.memory for chip in self.chips]
+
+    def read(self, address: int) -> list[int]:
+        return [memory[address] for memory in self.memories]
+
+    def set_zero_delay(self, zero_delay: bool):
+        if zero_delay != self.zero_delay:
+            self.history.clear()
+
+        self.zero_delay = zero_delay
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.history)
+
+    def set_internal_state(self, state: tuple):
+        self.history = deque(state, maxlen=10)
+
+    def propagate(self):
+        if not self.get(self.VCC) or self.get(self.GND):
+            return
+
+        if self.get(self.N_CS):
+            self._push(-1)
+            return
+
+        if not self.get(self.N_WE):
+            self.error("Write operation is not supported")
+
+            return
+
+        if self.get(self.N_OE):
+            self._push(-1)
+            return
+
+        state = self._state
+        address = 0
+        for bit, slot in enumerate(self.A):
+            if state[slot] == HIGH:
+                address |= 1 << bit
+
+        self._push(address)
+
+    def _push(self, address: int):
+        if self.zero_delay:
+            if address != -1:
+                self._set_outputs(address)
+            return
+
+        self.history.append(address)
+        self._process()
+
+    def _process(self):
+        for i in range(len(self.history) - 3):
+            if self.history[i] == -1:
+                return
+
+        self._set_outputs(self.history[0])
+
+    def _set_outputs(self, address: int):
+        data = self.read(address)
+        drive = self._drive
+        source = self.id
+        for slot, chip, bit in self._outputs:
+            drive(slot, source, (data[chip] >> bit) & 1)
@@ -1,4 +1,5 @@
 from simulator.engine.entities.base import Component
+from simulator.engine.netlist import HIGH
 
 
 class IC74138(Component):
@@ -20,6 +21,10 @@ class IC74138(Component):
     Y6 = "9"
     Y7 = "7"
 
+    _INPUTS = ["A0", "A1", "A2", "N_E0", "N_E1", "E2"]
+    _OUTPUTS = ["Y0", "Y1", "Y2", "Y3", "Y4", "Y5", "Y6", "Y7"]
+    _DELAYS = {"74LS": 22, "74HC": 13}
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
@@ -61,3 +66,31 @@ class IC74138(Component):
                 self.set(pin, False)
             else:
                 self.set(pin, True)
+
+    def generate(self) -> list[str]:
+        outputs = [
+            self.Y0,
+            self.Y1,
+            self.Y2,
+            self.Y3,
+            self.Y4,
+            self.Y5,
+            self.Y6,
+            self.Y7,
+        ]
+
+        lines = [
+            f"if {self._code_powered()}:",
+            f"    if {self._code_get(self.E2)} and s[{self.N_E0}] != {HIGH}"
+            f" and s[{self.N_E1}] != {HIGH}:",
+            f"        idx = ({self._code_get(self.A2)}) * 4"
+            f" + ({self._code_get(self.A1)}) * 2 + ({self._code_get(self.A0)})",
+        ]
+        for i, pin in enumerate(outputs):
+            lines.append(f"        {self._code_set(pin, f'idx != {i}')}")
+
+        lines.append("    else:")
+        for pin in outputs:
+            lines.append(f"        {self._code_set(pin, 'True')}")
+
+        return lines
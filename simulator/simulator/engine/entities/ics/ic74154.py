@@ -1,4 +1,5 @@
 from simulator.engine.entities.base import Component
+from simulator.engine.netlist import HIGH
 
 
 class IC74154(Component):
@@ -32,6 +33,27 @@ class IC74154(Component):
     Y14 = "16"
     Y15 = "17"
 
+    _INPUTS = ["A0", "A1", "A2", "A3", "N_E0", "N_E1"]
+    _OUTPUTS = [
+        "Y0",
+        "Y1",
+        "Y2",
+        "Y3",
+        "Y4",
+        "Y5",
+        "Y6",
+        "Y7",
+        "Y8",
+        "Y9",
+        "Y10",
+        "Y11",
+        "Y12",
+        "Y13",
+        "Y14",
+        "Y15",
+    ]
+    _DELAYS = {"74LS": 23, "74HC": 17}
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
@@ -75,3 +97,39 @@ class IC74154(Component):
 
         for i, pin in enumerate(outputs):
             self.set(pin, i != idx)  # Selected is False (LOW), others True
+
+    def generate(self) -> list[str]:
+        outputs = [
+            self.Y0,
+            self.Y1,
+            self.Y2,
+            self.Y3,
+            self.Y4,
+            self.Y5,
+            self.Y6,
+            self.Y7,
+            self.Y8,
+            self.Y9,
+            self.Y10,
+            self.Y11,
+            self.Y12,
+            self.Y13,
+            self.Y14,
+            self.Y15,
+        ]
+
+        lines = [
+            f"if {self._code_powered()}:",
+            f"    if s[{self.N_E0}] != {HIGH} and s[{self.N_E1}] != {HIGH}:",
+            f"        idx = ({self._code_get(self.A3)}) * 8"
+            f" + ({self._code_get(self.A2)}) * 4"
+            f" + ({self._code_get(self.A1)}) * 2 + ({self._code_get(self.A0)})",
+        ]
+        for i, pin in enumerate(outputs):
+            lines.append(f"        {self._code_set(pin, f'idx != {i}')}")
+
+        lines.append("    else:")
+        for pin in outputs:
+            lines.append(f"        {self._code_set(pin, 'True')}")
+
+        return lines
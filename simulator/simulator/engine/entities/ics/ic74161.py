@@ -22,6 +22,10 @@ class IC74161(Component):
     Q2 = "12"
     Q3 = "11"
 
+    _INPUTS = ["CLK", "N_MR", "N_PE", "CET", "CEP", "D0", "D1", "D2", "D3"]
+    _OUTPUTS = ["TC", "Q0", "Q1", "Q2", "Q3"]
+    _DELAYS = {"74LS": 16, "74HC": 17}
+
     count: int
     prev_clk: bool
 
@@ -39,10 +43,16 @@ class IC74161(Component):
             "Q": self.count,
         }
 
+    def get_internal_state(self) -> tuple:
+        return self.count, self.prev_clk
+
+    def set_internal_state(self, state: tuple):
+        self.count, self.prev_clk = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q":
             value &= 0x0F
-            self.log(f"Setting Q to {value} ({value:01X})")
+            self.log("Setting Q to {} ({:01X})", value, value)
             self.count = value
         else:
             return False
@@ -17,7 +17,11 @@ class IC74181(Component):
     G = "17"  # Carry Generate not used
     N_CN4 = "16"  # Carry Out (Active LOW)
 
-    def _get(self, pin_list: list[str]) -> int:
+    _INPUTS = ["A", "B", "S", "M", "N_CN"]
+    _OUTPUTS = ["F", "AEQB", "P", "G", "N_CN4"]
+    _DELAYS = {"74LS": 24, "74HC": 30}
+
+    def _get(self, pin_list: list[int]) -> int:
         val = 0
         for i, pin in enumerate(pin_list):
             if self.get(pin):
@@ -49,6 +53,13 @@ class IC74181(Component):
 
         carry_in = 1 if not self.get(self.N_CN) else 0
 
+        result, carry_out = self.compute(a, b, s, m, carry_in)
+
+        self._set_output(result)
+        self.set(self.N_CN4, not carry_out)
+
+    @staticmethod
+    def compute(a: int, b: int, s: int, m: bool, carry_in: int) -> tuple[int, int]:
         result = 0
         carry_out = 0
 
@@ -108,5 +119,4 @@ class IC74181(Component):
 
             result = val & 0xF
 
-        self._set_output(result)
-        self.set(self.N_CN4, not carry_out)
+        return result, carry_out
@@ -20,6 +20,10 @@ class IC74193(Component):
     Q1 = "2"
     D1 = "1"
 
+    _INPUTS = ["D0", "D1", "D2", "D3", "CLR", "N_LOAD", "N_UP", "N_DOWN"]
+    _OUTPUTS = ["Q0", "Q1", "Q2", "Q3", "N_CO", "N_BO"]
+    _DELAYS = {"74LS": 20, "74HC": 20}
+
     value: int
     prev_up: bool
     prev_down: bool
@@ -40,10 +44,16 @@ class IC74193(Component):
             "Q": self.value,
         }
 
+    def get_internal_state(self) -> tuple:
+        return self.value, self.prev_up, self.prev_down
+
+    def set_internal_state(self, state: tuple):
+        self.value, self.prev_up, self.prev_down = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q":
             value &= 0x0F
-            self.log(f"Setting Q to {value} ({value:01X})")
+            self.log("Setting Q to {} ({:01X})", value, value)
             self.value = value
         else:
             return False
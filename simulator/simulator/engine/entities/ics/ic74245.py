@@ -1,4 +1,5 @@
 from simulator.engine.entities.base import Component
+from simulator.engine.netlist import HIGH
 
 
 class IC74245(Component):
@@ -10,14 +11,52 @@ class IC74245(Component):
     A = ["2", "3", "4", "5", "6", "7", "8", "9"]
     DIR = "1"
 
+    _INPUTS = ["N_CE", "DIR"]
+    _DELAYS = {"74LS": 10, "74HC": 13}
+
+    # Fixed by the optimizer when DIR or N_CE is tied to a power rail
+    direction: bool | None
+    enabled: bool
+
+    def _init(self):
+        self.direction = None
+        self.enabled = False
+
+    def fold(self, constants: dict[int, bool], dead: set[int]):
+        super().fold(constants, dead)
+        self.direction = constants.get(self.DIR)
+        self.enabled = constants.get(self.N_CE) is False
+
+    def _get_side(self, a_side: bool) -> set[str]:
+        return set(type(self).A if a_side else type(self).B)
+
+    def get_read_pins(self) -> set[str]:
+        # With a fixed direction the source side is only read, the other only
+        # driven
+        pins = super().get_read_pins()
+        if self.direction is not None:
+            pins -= self._get_side(not self.direction)
+
+        return pins
+
+    def get_driven_pins(self) -> set[str]:
+        pins = super().get_driven_pins()
+        if self.direction is not None:
+            pins -= self._get_side(self.direction)
+
+        return pins
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
 
-        if self.get(self.N_CE):
+        if not self.enabled and self.get(self.N_CE):
             return
 
-        direction = self.get(self.DIR)
+        direction = self.direction
+        if direction is None:
+            direction = self.get(self.DIR)
+
         for a_pin, b_pin in zip(self.A, self.B):
             if direction:  # A to B
                 value = self.get(a_pin)
@@ -25,3 +64,27 @@ class IC74245(Component):
             else:  # B to A
                 value = self.get(b_pin)
                 self.set(a_pin, value)
+
+    def generate(self) -> list[str]:
+        condition = self._code_powered()
+        if not self.enabled:
+            condition += f" and s[{self.N_CE}] != {HIGH}"
+
+        a_to_b = [
+            self._code_set(b_pin, self._code_get(a_pin))
+            for a_pin, b_pin in zip(self.A, self.B)
+        ]
+        b_to_a = [
+            self._code_set(a_pin, self._code_get(b_pin))
+            for a_pin, b_pin in zip(self.A, self.B)
+        ]
+        if self.direction is not None:
+            body = a_to_b if self.direction else b_to_a
+            return [f"if {condition}:"] + [f"    {line}" for line in body]
+
+        return (
+            [f"if {condition}:", f"    if {self._code_get(self.DIR)}:"]
+            + [f"        {line}" for line in a_to_b]
+            + ["    else:"]
+            + [f"        {line}" for line in b_to_a]
+        )
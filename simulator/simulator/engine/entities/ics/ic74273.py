@@ -26,6 +26,10 @@ class IC74273(Component):
     Q6 = "16"
     Q7 = "19"
 
+    _INPUTS = ["CLK", "N_MR", "D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7"]
+    _OUTPUTS = ["Q0", "Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7"]
+    _DELAYS = {"74LS": 18, "74HC": 16}
+
     state: int
     prev_clk: bool
 
@@ -43,10 +47,16 @@ class IC74273(Component):
             "Q": self.state,
         }
 
+    def get_internal_state(self) -> tuple:
+        return self.state, self.prev_clk
+
+    def set_internal_state(self, state: tuple):
+        self.state, self.prev_clk = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q":
             value &= 0xFF
-            self.log(f"Setting Q to {value} ({value:02X})")
+            self.log("Setting Q to {} ({:02X})", value, value)
             self.state = value
         else:
             return False
@@ -20,6 +20,9 @@ class IC74573(Component):
     ]
     Q = ["2", "5", "6", "9", "12", "15", "16", "19"]
 
+    _INPUTS = ["N_OE", "LE", "D"]
+    _OUTPUTS = ["Q"]
+
     internal_state: int
 
     def _init(self):
@@ -35,10 +38,16 @@ class IC74573(Component):
             "Q": self.internal_state,
         }
 
+    def get_internal_state(self) -> tuple:
+        return (self.internal_state,)
+
+    def set_internal_state(self, state: tuple):
+        (self.internal_state,) = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q":
             value &= 0xFF
-            self.log(f"Setting Q to {value} ({value:02X})")
+            self.log("Setting Q to {} ({:02X})", value, value)
             self.internal_state = value
         else:
             return False
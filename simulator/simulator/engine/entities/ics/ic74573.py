@@ -26,6 +26,10 @@ class IC74573(Component):
     Q6 = "13"
     Q7 = "12"
 
+    _INPUTS = ["N_OE", "LE", "D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7"]
+    _OUTPUTS = ["Q0", "Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7"]
+    _DELAYS = {"74LS": 18, "74HC": 15}
+
     internal_state: int
 
     def _init(self):
@@ -41,10 +45,16 @@ class IC74573(Component):
             "Q": self.internal_state,
         }
 
+    def get_internal_state(self) -> tuple:
+        return (self.internal_state,)
+
+    def set_internal_state(self, state: tuple):
+        (self.internal_state,) = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q":
             value &= 0xFF
-            self.log(f"Setting Q to {value} ({value:02X})")
+            self.log("Setting Q to {} ({:02X})", value, value)
             self.internal_state = value
         else:
             return False
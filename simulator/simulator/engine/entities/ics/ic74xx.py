@@ -18,6 +18,10 @@ class IC7400(Component):
     B1 = "2"
     A1 = "1"
 
+    _INPUTS = ["A1", "B1", "A2", "B2", "A3", "B3", "A4", "B4"]
+    _OUTPUTS = ["Y1", "Y2", "Y3", "Y4"]
+    _DELAYS = {"74LS": 9, "74HC": 8}
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
@@ -38,6 +42,19 @@ class IC7400(Component):
         b4 = self.get(self.A1)
         self.set(self.Y1, not (a4 and b4))
 
+    def generate(self) -> list[str]:
+        lines = [f"if {self._code_powered()}:"]
+        for a, b, y in (
+            (self.A2, self.B2, self.Y2),
+            (self.A3, self.B3, self.Y3),
+            (self.A4, self.B4, self.Y4),
+            (self.B1, self.A1, self.Y1),
+        ):
+            value = f"not ({self._code_get(a)} and {self._code_get(b)})"
+            lines.append(f"    {self._code_set(y, value)}")
+
+        return lines
+
 
 class IC7402(Component):
     VCC = "14"
@@ -56,6 +73,10 @@ class IC7402(Component):
     A1 = "2"
     B1 = "3"
 
+    _INPUTS = ["A1", "B1", "A2", "B2", "A3", "B3", "A4", "B4"]
+    _OUTPUTS = ["Y1", "Y2", "Y3", "Y4"]
+    _DELAYS = {"74LS": 10, "74HC": 8}
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
@@ -75,6 +96,19 @@ class IC7402(Component):
         b4 = self.get(self.B1)
         self.set(self.Y1, not (a4 or b4))
 
+    def generate(self) -> list[str]:
+        lines = [f"if {self._code_powered()}:"]
+        for a, b, y in (
+            (self.B2, self.A2, self.Y2),
+            (self.B3, self.A3, self.Y3),
+            (self.B4, self.A4, self.Y4),
+            (self.A1, self.B1, self.Y1),
+        ):
+            value = f"not ({self._code_get(a)} or {self._code_get(b)})"
+            lines.append(f"    {self._code_set(y, value)}")
+
+        return lines
+
 
 class IC7404(Component):
     VCC = "14"
@@ -93,6 +127,10 @@ class IC7404(Component):
     Y1 = "2"
     A1 = "1"
 
+    _INPUTS = ["A1", "A2", "A3", "A4", "A5", "A6"]
+    _OUTPUTS = ["Y1", "Y2", "Y3", "Y4", "Y5", "Y6"]
+    _DELAYS = {"74LS": 10, "74HC": 8}
+
     def propagate(self):
         if not self.get(self.VCC) or self.get(self.GND):
             return
@@ -104,6 +142,20 @@ class IC7404(Component):
         self.set(self.Y5, not self.get(self.A5))
         self.set(self.Y6, not self.get(self.A6))
 
+    def generate(self) -> list[str]:
+        lines = [f"if {self._code_powered()}:"]
+        for a, y in (
+            (self.A1, self.Y1),
+            (self.A2, self.Y2),
+            (self.A3, self.Y3),
+            (self.A4, self.Y4),
+            (self.A5, self.Y5),
+            (self.A6, self.Y6),
+        ):
+            lines.append(f"    {self._code_set(y, f'not {self._code_get(a)}')}")
+
+        return lines
+
 
 class IC74109(Component):
     VCC = "16"
@@ -125,6 +177,21 @@ class IC74109(Component):
     Q2 = "10"
     N_Q2 = "9"
 
+    _INPUTS = [
+        "N_R1",
+        "N_S1",
+        "CLK1",
+        "J1",
+        "N_K1",
+        "N_R2",
+        "N_S2",
+        "CLK2",
+        "J2",
+        "N_K2",
+    ]
+    _OUTPUTS = ["Q1", "N_Q1", "Q2", "N_Q2"]
+    _DELAYS = {"74LS": 20, "74HC": 16}
+
     state1: bool
     state2: bool
     prev_clk1: bool
@@ -148,12 +215,18 @@ class IC74109(Component):
             "Q2": int(self.state2),
         }
 
+    def get_internal_state(self) -> tuple:
+        return self.state1, self.state2, self.prev_clk1, self.prev_clk2
+
+    def set_internal_state(self, state: tuple):
+        self.state1, self.state2, self.prev_clk1, self.prev_clk2 = state
+
     def set_variable(self, var: str, value: int) -> bool:
         if var == "Q1":
-            self.log(f"Setting Q1 to {int(bool(value))}")
+            self.log("Setting Q1 to {}", int(bool(value)))
             self.state1 = bool(value)
         elif var == "Q2":
-            self.log(f"Setting Q2 to {int(bool(value))}")
+            self.log("Setting Q2 to {}", int(bool(value)))
             self.state2 = bool(value)
         else:
             return False
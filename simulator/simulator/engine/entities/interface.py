@@ -3,6 +3,14 @@ from typing import Callable
 from simulator.engine.entities.base import Component
 
 
+def _no_read(address: int) -> int | None:
+    return None
+
+
+def _no_write(address: int, value: int):
+    pass
+
+
 class Interface(Component):
     ADDRESS = [
         "22",
@@ -42,6 +50,9 @@ class Interface(Component):
     N_WAIT = "15"
     GND = {"1", "3", "19", "20", "21", "38"}  # Not used, driven by backplane
 
+    _INPUTS = ["ADDRESS", "N_MEMREAD", "N_MEMWRITE", "N_HALT", "N_INTACK"]
+    _OUTPUTS = ["INTREQ", "RESET", "N_CLK", "N_WAIT"]
+
     reset: bool
     wait: bool
     clock: bool
@@ -58,18 +69,18 @@ class Interface(Component):
         self.clock = False
         self.clock_new = False
         self.value = 0
-        self.read_callback = lambda address: None
-        self.write_callback = lambda address, value: None
+        self.read_callback = _no_read
+        self.write_callback = _no_write
 
     def set_variable(self, var: str, value: int) -> bool:
         if var == "RESET":
-            self.log(f"Setting reset to {'ACTIVE' if value else 'INACTIVE'}")
+            self.log("Setting reset to {}", "ACTIVE" if value else "INACTIVE")
             self.reset = bool(value)
         elif var == "WAIT":
-            self.log(f"Setting wait to {'ACTIVE' if value else 'INACTIVE'}")
+            self.log("Setting wait to {}", "ACTIVE" if value else "INACTIVE")
             self.wait = bool(value)
         elif var == "CLOCK":
-            self.log(f"Setting clock to {'HIGH' if value else 'LOW'}")
+            self.log("Setting clock to {}", "HIGH" if value else "LOW")
             self.clock_new = bool(value)
         else:
             return False
@@ -90,6 +101,16 @@ class Interface(Component):
             "CLOCK": int(self.clock_new),
         }
 
+    def get_internal_state(self) -> tuple:
+        return self.reset, self.wait, self.clock, self.clock_new, self.value
+
+    def set_internal_state(self, state: tuple):
+        self.reset, self.wait, self.clock, self.clock_new, self.value = state
+
+    def set_clock(self, value: bool):
+        # Same as setting CLOCK, without a log entry for every edge
+        self.clock_new = value
+
     def set_read_callback(self, callback: Callable[[int], int]):
         self.log("Setting read callback")
         self.read_callback = callback
@@ -121,7 +142,7 @@ class Interface(Component):
                 # Read
                 value = self.read_callback(address)
                 if value is None:
-                    self.error(f"Illegal memory read at address {address:04X}")
+                    self.error("Illegal memory read at address {:04X}", address)
                 else:
                     self.value = value
 
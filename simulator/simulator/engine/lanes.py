@@ -0,0 +1,857 @@
+from abc import abstractmethod
+from collections import deque
+
+from simulator.engine.entities.base import Component, Messaging, Propagatable
+from simulator.engine.entities.busconnector import BusConnector
+from simulator.engine.entities.cpu import CPU
+from simulator.engine.entities.ics.ic28c256 import IC28C256, IC28C256Bank
+from simulator.engine.entities.ics.ic74138 import IC74138
+from simulator.engine.entities.ics.ic74154 import IC74154
+from simulator.engine.entities.ics.ic74161 import IC74161
+from simulator.engine.entities.ics.ic74181 import IC74181
+from simulator.engine.entities.ics.ic74193 import IC74193
+from simulator.engine.entities.ics.ic74245 import IC74245
+from simulator.engine.entities.ics.ic74273 import IC74273
+from simulator.engine.entities.ics.ic74373 import IC74573 as IC74373
+from simulator.engine.entities.ics.ic74573 import IC74573
+from simulator.engine.entities.ics.ic74574 import IC74574
+from simulator.engine.entities.ics.ic74xx import IC7400, IC7402, IC7404, IC74109
+from simulator.engine.entities.interface import Interface
+from simulator.engine.netlist import CONFLICT, FLOATING, HIGH, LOW
+
+# Every network holds one bit per CPU instance (lane) in a Python int, so a
+# gate is evaluated for all lanes with a single bitwise operation
+
+
+def iter_lanes(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class LaneNetlist:
+    names: list[str]
+    slots: list[int]
+    sources: list[str]
+    lanes: int
+    all: int
+
+    # Lanes reading HIGH, lanes with at least one driver, lanes with more
+    high: list[int]
+    driven: list[int]
+    conflict: list[int]
+    drivers: list[dict[int, int]]
+
+    # Source id -> (lanes, values) it drives, as held drivers of EVENT mode
+    held: list[dict[int, tuple[int, int]]]
+
+    def __init__(
+        self,
+        names: list[str],
+        sources: list[str],
+        lanes: int,
+        slots: list[int] | None = None,
+    ):
+        self.names = names
+        self.slots = list(range(len(names))) if slots is None else slots
+        self.sources = sources
+        self.size = max(self.slots, default=-1) + 1
+        self.sink = self.size
+        self.lanes = lanes
+        self.all = (1 << lanes) - 1
+
+        self.high = [0] * (self.size + 1)
+        self.driven = [0] * (self.size + 1)
+        self.conflict = [0] * (self.size + 1)
+        self.drivers = [{} for _ in range(self.size + 1)]
+        self.held = [{} for _ in range(self.size + 1)]
+
+        self.next_high = [0] * (self.size + 1)
+        self.next_conflict = [0] * (self.size + 1)
+        self.next_drivers = [{} for _ in range(self.size + 1)]
+
+        self._gathered = {}
+        self._spread = {}
+
+    def drive(self, slot: int, source: int, mask: int, value: int):
+        # The first value a source drives in a lane wins, as in Netlist.drive
+        if not mask:
+            return
+
+        held = self.held[slot]
+        old = held.get(source)
+        if old is None:
+            held[source] = (mask, value & mask)
+            return
+
+        old_mask, old_value = old
+        new = mask & ~old_mask
+        if new:
+            held[source] = (old_mask | new, old_value | (value & new))
+
+    def release(self, source: int, slots):
+        for slot in slots:
+            self.held[slot].pop(source, None)
+
+    def resolve(self, slot: int):
+        drivers = {}
+        seen = 0
+        many = 0
+        high = 0
+        for source, (mask, value) in self.held[slot].items():
+            drivers[source] = mask
+            many |= seen & mask
+            seen |= mask
+            high |= value
+
+        self.next_drivers[slot] = drivers
+        self.next_high[slot] = high & ~many
+        self.next_conflict[slot] = many
+
+    def commit(self, slots: set[int]) -> list[int]:
+        changed = []
+        for slot in slots:
+            drivers = self.next_drivers[slot]
+            driven = 0
+            for mask in drivers.values():
+                driven |= mask
+
+            high = self.next_high[slot]
+            conflict = self.next_conflict[slot]
+            if (
+                high != self.high[slot]
+                or driven != self.driven[slot]
+                or conflict != self.conflict[slot]
+            ):
+                changed.append(slot)
+
+            self.high[slot] = high
+            self.driven[slot] = driven
+            self.conflict[slot] = conflict
+            self.drivers[slot] = drivers
+
+        return changed
+
+    def get_state(self, slot: int, lane: int) -> int:
+        if (self.conflict[slot] >> lane) & 1:
+            return CONFLICT
+
+        if (self.high[slot] >> lane) & 1:
+            return HIGH
+
+        if (self.driven[slot] >> lane) & 1:
+            return LOW
+
+        return FLOATING
+
+    def get_drivers(self, slot: int, lane: int) -> list[int]:
+        drivers = self.drivers[slot]
+        return sorted(source for source in drivers if (drivers[source] >> lane) & 1)
+
+    def gather(self, slots: list[int]) -> list[int]:
+        # Value of a bus (least significant pin first) for every lane
+        planes = tuple(self.high[slot] for slot in slots)
+        values = self._gathered.get(planes)
+        if values is not None:
+            return values
+
+        width = self.lanes
+        rows = [format(plane, f"0{width}b") for plane in reversed(planes)]
+        values = [int("".join(column), 2) for column in zip(*rows)]
+        values.reverse()
+
+        if len(self._gathered) > 64:
+            self._gathered.clear()
+        self._gathered[planes] = values
+        return values
+
+    def scatter(self, values: list[int], bits: int) -> list[int]:
+        # Inverse of gather, one plane per bit of the values
+        spread = self._spread.get(bits)
+        if spread is None:
+            spread = self._spread[bits] = [
+                sum(((value >> bit) & 1) << (bit * self.lanes) for bit in range(bits))
+                for value in range(1 << bits)
+            ]
+
+        word = 0
+        for lane, value in enumerate(values):
+            word |= spread[value] << lane
+
+        return [(word >> (bit * self.lanes)) & self.all for bit in range(bits)]
+
+
+def to_int(planes: list[int], lane: int) -> int:
+    value = 0
+    for bit, plane in enumerate(planes):
+        value |= ((plane >> lane) & 1) << bit
+
+    return value
+
+
+def set_lanes(planes: list[int], value: int, lanes: int):
+    for bit in range(len(planes)):
+        if (value >> bit) & 1:
+            planes[bit] |= lanes
+        else:
+            planes[bit] &= ~lanes
+
+
+class LaneComponent(Propagatable, Messaging):
+    # Lane model of a component, pins are read from the bound component
+    chip: Component
+    name: str
+    id: int
+
+    def __init__(self, chip: Component, netlist: LaneNetlist):
+        self.chip = chip
+        self.name = chip.name
+        self.id = chip.id
+        self.netlist = netlist
+        self.high = netlist.high
+        self._init()
+
+    def _init(self):
+        pass
+
+    def powered(self) -> int:
+        return self.high[self.chip.VCC] & ~self.high[self.chip.GND]
+
+    def drive(self, pin: int, mask: int, value: int):
+        self.netlist.drive(pin, self.id, mask, value)
+
+    def get_variables(self, lane: int) -> dict[str, int]:
+        return {}
+
+    def get_internal_state(self) -> tuple:
+        return ()
+
+    def set_variable(self, var: str, value: int, lanes: int) -> bool:
+        return False
+
+
+class LaneBusConnector(LaneComponent):
+    def propagate(self):
+        pass
+
+
+class LaneIC7400(LaneComponent):
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        self.drive(c.Y2, on, ~(high[c.A2] & high[c.B2]))
+        self.drive(c.Y3, on, ~(high[c.A3] & high[c.B3]))
+        self.drive(c.Y4, on, ~(high[c.A4] & high[c.B4]))
+        self.drive(c.Y1, on, ~(high[c.B1] & high[c.A1]))
+
+
+class LaneIC7402(LaneComponent):
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        self.drive(c.Y2, on, ~(high[c.B2] | high[c.A2]))
+        self.drive(c.Y3, on, ~(high[c.B3] | high[c.A3]))
+        self.drive(c.Y4, on, ~(high[c.B4] | high[c.A4]))
+        self.drive(c.Y1, on, ~(high[c.A1] | high[c.B1]))
+
+
+class LaneIC7404(LaneComponent):
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        self.drive(c.Y1, on, ~high[c.A1])
+        self.drive(c.Y2, on, ~high[c.A2])
+        self.drive(c.Y3, on, ~high[c.A3])
+        self.drive(c.Y4, on, ~high[c.A4])
+        self.drive(c.Y5, on, ~high[c.A5])
+        self.drive(c.Y6, on, ~high[c.A6])
+
+
+class LaneIC74109(LaneComponent):
+    def _init(self):
+        self.state = [0, 0]
+        self.prev_clk = [0, 0]
+
+    def get_variables(self, lane: int) -> dict[str, int]:
+        return {
+            "Q1": (self.state[0] >> lane) & 1,
+            "Q2": (self.state[1] >> lane) & 1,
+        }
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.state), tuple(self.prev_clk)
+
+    def set_variable(self, var: str, value: int, lanes: int) -> bool:
+        if var not in ("Q1", "Q2"):
+            return False
+
+        self.log("Setting {} to {}", var, int(bool(value)))
+        index = int(var[1]) - 1
+        state = [self.state[index]]
+        set_lanes(state, int(bool(value)), lanes)
+        self.state[index] = state[0]
+        return True
+
+    def propagate(self):
+        c = self.chip
+        on = self.powered()
+        self._process_flipflop(
+            on, c.N_R1, c.N_S1, c.CLK1, c.J1, c.N_K1, c.Q1, c.N_Q1, 0
+        )
+        self._process_flipflop(
+            on, c.N_R2, c.N_S2, c.CLK2, c.J2, c.N_K2, c.Q2, c.N_Q2, 1
+        )
+
+    def _process_flipflop(
+        self, on, clr_pin, pre_pin, clk_pin, j_pin, nk_pin, q_pin, nq_pin, index
+    ):
+        high = self.high
+        clr = high[clr_pin]
+        pre = high[pre_pin]
+        clocked = on & clr & pre
+        preset = on & ~pre
+
+        q = self.state[index]
+        clk = high[clk_pin]
+        edge = clocked & clk & ~self.prev_clk[index]
+        j = high[j_pin]
+        nk = high[nk_pin]
+        sampled = (~j & nk & q) | (j & nk) | (j & ~nk & ~q)
+        next_q = (q & ~edge) | (sampled & edge)
+
+        next_q = (next_q & clocked) | preset
+        q = (q & ~on) | (next_q & on)
+        self.state[index] = q
+        self.prev_clk[index] = (self.prev_clk[index] & ~clocked) | (clk & clocked)
+
+        self.drive(q_pin, on, q)
+        self.drive(nq_pin, on, ~q)
+
+
+class LaneDecoder(LaneComponent):
+    # 74138 and 74154, selected output LOW while enabled, all HIGH otherwise
+    inputs: list[int]
+    outputs: list[int]
+
+    @abstractmethod
+    def _enabled(self) -> int:
+        pass
+
+    def propagate(self):
+        high = self.high
+        on = self.powered()
+        enabled = self._enabled()
+        select = [high[pin] for pin in self.inputs]
+        for i, pin in enumerate(self.outputs):
+            selected = enabled
+            for bit, plane in enumerate(select):
+                selected &= plane if (i >> bit) & 1 else ~plane
+            self.drive(pin, on, ~selected)
+
+
+class LaneIC74138(LaneDecoder):
+    def _init(self):
+        c = self.chip
+        self.inputs = [c.A0, c.A1, c.A2]
+        self.outputs = [c.Y0, c.Y1, c.Y2, c.Y3, c.Y4, c.Y5, c.Y6, c.Y7]
+
+    def _enabled(self) -> int:
+        c = self.chip
+        high = self.high
+        return high[c.E2] & ~high[c.N_E0] & ~high[c.N_E1]
+
+
+class LaneIC74154(LaneDecoder):
+    def _init(self):
+        c = self.chip
+        self.inputs = [c.A0, c.A1, c.A2, c.A3]
+        self.outputs = [getattr(c, f"Y{i}") for i in range(16)]
+
+    def _enabled(self) -> int:
+        c = self.chip
+        return self.netlist.all & ~self.high[c.N_E0] & ~self.high[c.N_E1]
+
+
+class LaneIC74245(LaneComponent):
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        enabled = self.powered() & ~high[c.N_CE]
+        direction = high[c.DIR]
+        a_to_b = enabled & direction
+        b_to_a = enabled & ~direction
+        for a_pin, b_pin in zip(c.A, c.B):
+            self.drive(b_pin, a_to_b, high[a_pin])
+            self.drive(a_pin, b_to_a, high[b_pin])
+
+
+class LaneIC74181(LaneComponent):
+    # Lanes are evaluated through a table of the scalar model
+    _table: list[int] | None = None
+
+    def _init(self):
+        c = self.chip
+        self.inputs = c.A + c.B + c.S + [c.M, c.N_CN]
+        if LaneIC74181._table is None:
+            table = []
+            for key in range(1 << 14):
+                result, carry_out = IC74181.compute(
+                    key & 0xF,
+                    (key >> 4) & 0xF,
+                    (key >> 8) & 0xF,
+                    bool((key >> 12) & 1),
+                    0 if (key >> 13) & 1 else 1,
+                )
+                table.append(result | (carry_out << 4))
+            LaneIC74181._table = table
+
+    def propagate(self):
+        c = self.chip
+        on = self.powered()
+        if not on:
+            return
+
+        table = self._table
+        values = [table[key] for key in self.netlist.gather(self.inputs)]
+        planes = self.netlist.scatter(values, 5)
+        for pin, plane in zip(c.F, planes):
+            self.drive(pin, on, plane)
+        self.drive(c.N_CN4, on, ~planes[4])
+
+
+class LaneRegister(LaneComponent):
+    # Eight bit state shared by the registers and latches
+    bits = 8
+
+    def _init(self):
+        self.state = [0] * self.bits
+        self.prev_clk = 0
+
+    def get_variables(self, lane: int) -> dict[str, int]:
+        return {"Q": to_int(self.state, lane)}
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.state), self.prev_clk
+
+    def set_variable(self, var: str, value: int, lanes: int) -> bool:
+        if var != "Q":
+            return False
+
+        value &= (1 << self.bits) - 1
+        width = (self.bits + 3) // 4
+        self.log("Setting Q to {} ({:0{}X})", value, value, width)
+        set_lanes(self.state, value, lanes)
+        return True
+
+    def _load(self, lanes: int, pins: list[int]):
+        high = self.high
+        for bit, pin in enumerate(pins):
+            self.state[bit] = (self.state[bit] & ~lanes) | (high[pin] & lanes)
+
+    def _update_outputs(self, lanes: int, pins: list[int]):
+        for pin, plane in zip(pins, self.state):
+            self.drive(pin, lanes, plane)
+
+
+class LaneIC74273(LaneRegister):
+    def _init(self):
+        super()._init()
+        c = self.chip
+        self.inputs = [c.D0, c.D1, c.D2, c.D3, c.D4, c.D5, c.D6, c.D7]
+        self.outputs = [c.Q0, c.Q1, c.Q2, c.Q3, c.Q4, c.Q5, c.Q6, c.Q7]
+
+    def propagate(self):
+        c = self.chip
+        on = self.powered()
+        reset = on & ~self.high[c.N_MR]
+        clk = self.high[c.CLK]
+
+        self._load(on & ~reset & clk & ~self.prev_clk, self.inputs)
+        self.state = [plane & ~reset for plane in self.state]
+        self._update_outputs(on, self.outputs)
+        self.prev_clk = (self.prev_clk & ~on) | (clk & on)
+
+
+class LaneIC74574(LaneIC74273):
+    def propagate(self):
+        c = self.chip
+        on = self.powered()
+        clk = self.high[c.CLK]
+
+        self._load(on & clk & ~self.prev_clk, self.inputs)
+        self.prev_clk = (self.prev_clk & ~on) | (clk & on)
+        self._update_outputs(on & ~self.high[c.N_OE], self.outputs)
+
+
+class LaneIC74573(LaneIC74273):
+    def get_internal_state(self) -> tuple:
+        return (tuple(self.state),)
+
+    def propagate(self):
+        c = self.chip
+        on = self.powered()
+        self._load(on & self.high[c.LE], self.inputs)
+        self._update_outputs(on & ~self.high[c.N_OE], self.outputs)
+
+
+class LaneIC74373(LaneIC74573):
+    def _init(self):
+        LaneRegister._init(self)
+        self.inputs = self.chip.D
+        self.outputs = self.chip.Q
+
+
+class LaneCounter(LaneRegister):
+    bits = 4
+
+    def _init(self):
+        super()._init()
+        c = self.chip
+        self.inputs = [c.D0, c.D1, c.D2, c.D3]
+        self.outputs = [c.Q0, c.Q1, c.Q2, c.Q3]
+
+
+class LaneIC74161(LaneCounter):
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        reset = on & ~high[c.N_MR]
+        running = on & ~reset
+        clk = high[c.CLK]
+        edge = running & clk & ~self.prev_clk
+
+        carry = edge & high[c.N_PE] & high[c.CEP] & high[c.CET]
+        for bit in range(4):
+            plane = self.state[bit]
+            self.state[bit] = plane ^ carry
+            carry &= plane
+
+        self._load(edge & ~high[c.N_PE], self.inputs)
+        self.state = [plane & ~reset for plane in self.state]
+        self._update_outputs(on, self.outputs)
+
+        full = self.state[0] & self.state[1] & self.state[2] & self.state[3]
+        self.drive(c.TC, on, full & high[c.CET] & running)
+        self.prev_clk = (self.prev_clk & ~running) | (clk & running)
+
+
+class LaneIC74193(LaneCounter):
+    def _init(self):
+        super()._init()
+        self.prev_up = 0
+        self.prev_down = 0
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.state), self.prev_up, self.prev_down
+
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        clear = on & high[c.CLR]
+        load = on & ~clear & ~high[c.N_LOAD]
+        counting = on & ~clear & ~load
+
+        up = high[c.N_UP]
+        down = high[c.N_DOWN]
+        increment = counting & up & ~self.prev_up
+        decrement = counting & down & ~self.prev_down
+        carry = increment & ~decrement
+        borrow = decrement & ~increment
+
+        state = self.state
+        carry_out = carry & state[0] & state[1] & state[2] & state[3]
+        borrow_out = borrow & ~(state[0] | state[1] | state[2] | state[3])
+        for bit in range(4):
+            plane = state[bit]
+            state[bit] = plane ^ (carry | borrow)
+            carry &= plane
+            borrow &= ~plane
+
+        self._load(load, self.inputs)
+        self.state = [plane & ~clear for plane in state]
+
+        self.drive(c.N_CO, on, ~carry_out)
+        self.drive(c.N_BO, on, ~borrow_out)
+        self._update_outputs(on, self.outputs)
+
+        self.prev_up = (self.prev_up & ~counting) | (up & counting)
+        self.prev_down = (self.prev_down & ~counting) | (down & counting)
+
+
+class LaneIC28C256(LaneComponent):
+    # Write enable is expected to be tied inactive, lanes with it active read as
+    # tri-stated instead of skipping the tick
+    def _init(self):
+        c = self.chip
+        self.memory = c.memory
+        self.history = deque(maxlen=c.history.maxlen)
+        self.inputs = [getattr(c, f"A{i}") for i in range(15)]
+        self.outputs = [c.D0, c.D1, c.D2, c.D3, c.D4, c.D5, c.D6, c.D7]
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.history)
+
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        if not on:
+            return
+
+        writing = on & ~high[c.N_CS] & ~high[c.N_WE]
+        if writing:
+            self.error("Write operation is not supported (lanes {:#x})", writing)
+
+        invalid = on & (high[c.N_CS] | high[c.N_OE] | writing)
+        if invalid == on:
+            data = (0,) * 8
+        else:
+            memory = self.memory
+            addresses = self.netlist.gather(self.inputs)
+            data = tuple(self.netlist.scatter([memory[a] for a in addresses], 8))
+
+        self.history.append((invalid, data))
+
+        # Outputs stay driven until three entries after the last invalid one
+        history = self.history
+        pending = 0
+        for i in range(len(history) - 3):
+            pending |= history[i][0]
+
+        invalid, data = history[0]
+        valid = on & ~pending & ~writing
+        for pin, plane in zip(self.outputs, data):
+            self.drive(pin, valid, plane | invalid)
+
+
+class LaneIC28C256Bank(LaneComponent):
+    # Same as LaneIC28C256 for all chips of a bank, one byte plane per data pin
+    def _init(self):
+        c = self.chip
+        self.history = deque(maxlen=c.history.maxlen)
+        self.blank = (0,) * (8 * len(c.chips))
+
+    def get_internal_state(self) -> tuple:
+        return tuple(self.history)
+
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        on = self.powered()
+        if not on:
+            return
+
+        writing = on & ~high[c.N_CS] & ~high[c.N_WE]
+        if writing:
+            self.error("Write operation is not supported (lanes {:#x})", writing)
+
+        invalid = on & (high[c.N_CS] | high[c.N_OE] | writing)
+        if invalid == on:
+            data = self.blank
+        else:
+            addresses = self.netlist.gather(c.A)
+            data = ()
+            for memory in c.memories:
+                data += tuple(self.netlist.scatter([memory[a] for a in addresses], 8))
+
+        self.history.append((invalid, data))
+
+        history = self.history
+        pending = 0
+        for i in range(len(history) - 3):
+            pending |= history[i][0]
+
+        invalid, data = history[0]
+        valid = on & ~pending & ~writing
+        for slot, chip, bit in c._outputs:
+            self.drive(slot, valid, data[8 * chip + bit] | invalid)
+
+
+class LaneInterface(LaneComponent):
+    def _init(self):
+        self.reset = 0
+        self.wait = 0
+        self.clock = 0
+        self.clock_new = 0
+        self.values = [0] * self.netlist.lanes
+        self.planes = [0] * 8
+        self.memories = []
+
+    def set_memories(self, memories: list):
+        self.memories = memories
+
+    def set_variable(self, var: str, value: int, lanes: int) -> bool:
+        if var == "RESET":
+            self.log("Setting reset to {}", "ACTIVE" if value else "INACTIVE")
+            self.reset = self.reset | lanes if value else self.reset & ~lanes
+        elif var == "WAIT":
+            self.log("Setting wait to {}", "ACTIVE" if value else "INACTIVE")
+            self.wait = self.wait | lanes if value else self.wait & ~lanes
+        elif var == "CLOCK":
+            self.log("Setting clock to {}", "HIGH" if value else "LOW")
+            self.set_clock(value, lanes)
+        else:
+            return False
+
+        return True
+
+    def set_clock(self, value: bool, lanes: int):
+        if value:
+            self.clock_new |= lanes
+        else:
+            self.clock_new &= ~lanes
+
+    def get_variables(self, lane: int) -> dict[str, int]:
+        return {
+            "RESET": (self.reset >> lane) & 1,
+            "WAIT": (self.wait >> lane) & 1,
+            "CLOCK": (self.clock_new >> lane) & 1,
+        }
+
+    def get_internal_state(self) -> tuple:
+        return self.reset, self.wait, self.clock, self.clock_new, tuple(self.values)
+
+    def propagate(self):
+        c = self.chip
+        high = self.high
+        netlist = self.netlist
+        reading = netlist.all & ~high[c.N_MEMREAD]
+        writing = netlist.all & ~high[c.N_MEMWRITE]
+
+        both = reading & writing
+        if both:
+            self.warn("Both MEMREAD and MEMWRITE are active, ignoring ({:#x})", both)
+        active = netlist.all & ~both
+
+        # Falling edge: update memory
+        falling = active & ~self.clock_new & self.clock
+        if falling & (reading | writing):
+            addresses = netlist.gather(c.ADDRESS)
+            if falling & writing:
+                data = netlist.gather(c.DATA)
+                for lane in iter_lanes(falling & writing):
+                    self.memories[lane].write(addresses[lane], data[lane])
+
+            for lane in iter_lanes(falling & reading & ~writing):
+                value = self.memories[lane].read(addresses[lane])
+                if value is None:
+                    self.error("Illegal memory read at address {:04X}", addresses[lane])
+                else:
+                    self.values[lane] = value
+            self.planes = netlist.scatter(self.values, 8)
+
+        for pin, plane in zip(c.DATA, self.planes):
+            self.drive(pin, active & reading, plane)
+
+        self.drive(c.INTREQ, active, 0)
+        self.drive(c.RESET, active, self.reset)
+        self.drive(c.N_WAIT, active, ~self.wait)
+        self.drive(c.N_CLK, active, ~self.clock_new)
+        self.clock = (self.clock & ~active) | (self.clock_new & active)
+
+
+LANE_MODELS = {
+    BusConnector: LaneBusConnector,
+    Interface: LaneInterface,
+    IC7400: LaneIC7400,
+    IC7402: LaneIC7402,
+    IC7404: LaneIC7404,
+    IC74109: LaneIC74109,
+    IC74138: LaneIC74138,
+    IC74154: LaneIC74154,
+    IC74161: LaneIC74161,
+    IC74181: LaneIC74181,
+    IC74193: LaneIC74193,
+    IC74245: LaneIC74245,
+    IC74273: LaneIC74273,
+    IC74373: LaneIC74373,
+    IC74573: LaneIC74573,
+    IC74574: LaneIC74574,
+    IC28C256: LaneIC28C256,
+    IC28C256Bank: LaneIC28C256Bank,
+}
+
+
+class LaneCPU:
+    # Event-driven scheduling of the lane models, one tick is one gate delay
+    # for every lane exactly like Scheduling.EVENT
+    def __init__(self, cpu: CPU, lanes: int):
+        self.cpu = cpu
+        self.backplane = cpu.backplane
+        netlist = cpu.netlist
+        self.netlist = LaneNetlist(netlist.names, netlist.sources, lanes, netlist.slots)
+
+        self.components = {}
+        for name, chip in cpu.components.items():
+            model = LANE_MODELS.get(type(chip))
+            if model is None:
+                raise ValueError(f"No lane model for {type(chip).__name__} ({name})")
+
+            self.components[name] = model(chip, self.netlist)
+
+        self.interface = self.components[cpu.interface.name]
+        by_id = list(self.components.values())
+        self._slots = [cpu._component_slots[chip] for chip in cpu.components.values()]
+        self.fanout = [[by_id[chip.id] for chip in readers] for readers in cpu.fanout]
+
+        self.power = False
+        self._power = None
+        self._dirty = set(self.components.values())
+
+    def mark_dirty(self, component: LaneComponent):
+        self._dirty.add(component)
+
+    def is_settled(self) -> bool:
+        return self._power == self.power and not self._dirty
+
+    def is_halted(self) -> int:
+        netlist = self.netlist
+        slot = self.cpu.interface.N_HALT
+        return netlist.driven[slot] & ~netlist.high[slot] & ~netlist.conflict[slot]
+
+    def _drive_power(self, touched: set[int]):
+        netlist = self.netlist
+        source = self.backplane.id
+        value = netlist.all if self.power else 0
+        for slots, level in (
+            (self.backplane.vcc_slots, value),
+            (self.backplane.gnd_slots, ~value),
+        ):
+            for slot in slots:
+                netlist.release(source, (slot,))
+                netlist.drive(slot, source, netlist.all, level)
+
+        touched |= self.backplane.get_power_slots()
+
+    def propagate(self):
+        netlist = self.netlist
+        dirty = sorted(self._dirty, key=lambda c: c.id)
+        self._dirty = set()
+
+        touched = set()
+        for component in dirty:
+            slots = self._slots[component.id]
+            netlist.release(component.id, slots)
+
+            before = component.get_internal_state()
+            component.propagate()
+            if component.get_internal_state() != before:
+                self._dirty.add(component)
+
+            touched |= slots
+
+        if self._power != self.power:
+            self._power = self.power
+            self._drive_power(touched)
+
+        for slot in touched:
+            netlist.resolve(slot)
+
+        for slot in netlist.commit(touched):
+            self._dirty.update(self.fanout[slot])
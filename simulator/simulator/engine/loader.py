@@ -1,13 +1,25 @@
+import hashlib
+import mmap
+import os
+import pickle
+import warnings
+from pathlib import Path
+
 from simulator.engine.entities.base import Component, Network
 from simulator.engine.entities.busconnector import Backplane, BusConnector
 from simulator.engine.entities.cpu import CPU
-from simulator.engine.entities.ics.ic28c256 import IC28C256
+from simulator.engine.entities.ics.ic28c256 import IC28C256, IC28C256Bank
 from simulator.engine.entities.interface import Interface
+from simulator.engine.netlist import Netlist
+from simulator.engine.optimizer import OptimizationReport, optimize
 from simulator.engine.parser import parse
 
+# Part of the cache key, bump whenever the layout of the cached design changes
+VERSION = 1
+
 
 def load_components(
-    modules: list[tuple[str, str]]
+    modules: list[tuple[str, str]],
 ) -> tuple[dict[str, Component], dict[str, Network], Interface, Backplane]:
     backplane = Backplane("BP")
     all_components = {}
@@ -19,9 +31,7 @@ def load_components(
             raise ValueError("Module name 'BP' is reserved for Backplane")
 
         with open(filename, "r") as f:
-            data = f.read()
-
-        components, networks = parse(data)
+            components, networks = parse(f)
 
         for component in components:
             if isinstance(component, Interface):
@@ -52,25 +62,33 @@ def load_components(
     return all_components, all_networks, interface, backplane
 
 
-def load_data(path: str) -> list[bytes]:
+def load_data(path: str) -> list[memoryview]:
+    # Read-only mappings of the tables, processes loading the same files share
+    # one copy in the page cache
     result = []
     for i in range(8):
         with open(f"{path}/table{i}.bin", "rb") as f:
-            data = f.read()
-            if len(data) != 32768:
-                raise ValueError(f"table{i}.bin has incorrect size: {len(data)} bytes")
+            size = os.fstat(f.fileno()).st_size
+            if size != 32768:
+                raise ValueError(f"table{i}.bin has incorrect size: {size} bytes")
 
-            result.append(data)
+            result.append(memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)))
 
     return result
 
 
-def setup_tables(components: dict[str, Component], data: list[bytes]):
-    set_ = set()
+def setup_tables(components: dict[str, Component], data: list[memoryview]):
+    chips = []
+    banks = []
     for component in components.values():
-        if not isinstance(component, IC28C256):
-            continue
+        if isinstance(component, IC28C256Bank):
+            chips.extend(component.chips)
+            banks.append(component)
+        elif isinstance(component, IC28C256):
+            chips.append(component)
 
+    set_ = set()
+    for component in chips:
         _, name = component.name.split(":", 1)
 
         if not name.startswith("TABLE"):
@@ -83,10 +101,200 @@ def setup_tables(components: dict[str, Component], data: list[bytes]):
         missing = sorted(set(range(8)) - set_)
         raise ValueError(f"Missing EEPROM tables: {missing}")
 
+    for bank in banks:
+        bank.load_memories()
+
+
+def merge_networks(networks: dict[str, Network], backplane: Backplane) -> list[int]:
+    # Networks joined through a backplane pin are one physical net, returns the
+    # slot of every network numbered in order of first appearance
+    index = {network: i for i, network in enumerate(networks.values())}
+    parent = list(range(len(index)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+
+        return i
+
+    for pin_networks in backplane.networks.values():
+        for first, network in zip(pin_networks, pin_networks[1:]):
+            a, b = find(index[first]), find(index[network])
+            parent[max(a, b)] = min(a, b)
+
+    slots = []
+    numbering = {}
+    for i in range(len(parent)):
+        slots.append(numbering.setdefault(find(i), len(numbering)))
+
+    return slots
+
+
+def fuse_eeproms(
+    components: dict[str, Component],
+    networks: dict[str, Network],
+    backplane: Backplane,
+) -> list[str]:
+    # EEPROMs on the same address, power and control networks with separate
+    # data networks become one IC28C256Bank in place of the first of them.
+    # Chips sharing data networks stay apart, a bank is a single driver and
+    # could not show their conflict. Returns the names of the banks
+    slots = dict(zip(networks.values(), merge_networks(networks, backplane)))
+    inputs = ["VCC", "GND", "N_CS", "N_OE", "N_WE"] + [f"A{i}" for i in range(15)]
+    data = [f"D{i}" for i in range(8)]
+
+    groups = {}
+    for component in components.values():
+        if type(component) is not IC28C256:
+            continue
+
+        pins = [component.pins.get(getattr(IC28C256, pin)) for pin in inputs]
+        if None in pins:
+            continue
+
+        key = (component.delay, tuple(slots[network] for network in pins))
+        groups.setdefault(key, []).append(component)
+
+    # Chip name to its bank, None for the chips after the first of a bank
+    replaced = {}
+    names = []
+    for chips in groups.values():
+        used = []
+        for chip in chips:
+            pins = [getattr(IC28C256, pin) for pin in data]
+            used.append({slots[chip.pins[pin]] for pin in pins if pin in chip.pins})
+
+        if not 1 < len(chips) <= 8:
+            continue
+
+        if len(set().union(*used)) != sum(map(len, used)):
+            continue
+
+        bank = IC28C256Bank("+".join(chip.name for chip in chips), chips)
+        replaced.update(dict.fromkeys(chip.name for chip in chips[1:]))
+        replaced[chips[0].name] = bank
+        names.append(bank.name)
+
+    fused = {}
+    for name, component in components.items():
+        component = replaced.get(name, component)
+        if component is not None:
+            fused[component.name] = component
 
-def load(modules: list[tuple[str, str]], tables_path: str) -> CPU:
+    components.clear()
+    components.update(fused)
+    return names
+
+
+def compile_netlist(
+    components: dict[str, Component],
+    networks: dict[str, Network],
+    backplane: Backplane,
+) -> Netlist:
+    # Components get source ids in propagation order, backplane goes last
+    sources = list(components) + [backplane.name]
+    slots = merge_networks(networks, backplane)
+    netlist = Netlist(list(networks), sources, slots)
+
+    for slot, network in zip(slots, networks.values()):
+        network.bind(netlist, slot)
+
+    for source, component in enumerate(components.values()):
+        component.bind(netlist, source)
+
+    backplane.bind(netlist, len(components))
+
+    return netlist
+
+
+def build_fanout(
+    components: dict[str, Component], netlist: Netlist
+) -> list[list[Component]]:
+    # Components woken up when a network changes, only those that read it
+    fanout = [[] for _ in range(netlist.size)]
+    for component in components.values():
+        for slot in {component.pins[pin].slot for pin in component.get_read_pins()}:
+            fanout[slot].append(component)
+
+    return fanout
+
+
+def hash_sources(root: Path) -> str:
+    # Every Python source below root, by its path relative to root
+    digest = hashlib.sha256()
+    for source in sorted(root.rglob("*.py")):
+        digest.update(f"source {source.relative_to(root).as_posix()}\n".encode())
+        digest.update(source.read_bytes())
+
+    return digest.hexdigest()
+
+
+def design_key(modules: list[tuple[str, str]], optimize_design: bool) -> str:
+    # Content of the netlists and the source of the engine, the cached objects
+    # are only valid for the classes that pickled them
+    digest = hashlib.sha256(f"version {VERSION} {optimize_design}\n".encode())
+    for filename, module in modules:
+        digest.update(f"module {module}\n".encode())
+        digest.update(Path(filename).read_bytes())
+
+    digest.update(f"sources {hash_sources(Path(__file__).parent)}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def build(modules: list[tuple[str, str]], optimize_design: bool = True) -> tuple:
+    # Design without the table contents, the optimizer does not look at them
     components, networks, interface, backplane = load_components(modules)
-    tables_data = load_data(tables_path)
-    setup_tables(components, tables_data)
+    report = None
+    if optimize_design:
+        report = OptimizationReport(fused=fuse_eeproms(components, networks, backplane))
+
+    netlist = compile_netlist(components, networks, backplane)
+    if optimize_design:
+        optimize(components, backplane, netlist, report)
+
+    fanout = build_fanout(components, netlist)
+    return components, networks, interface, backplane, netlist, fanout, report
+
+
+def load_cached(
+    modules: list[tuple[str, str]], optimize_design: bool, cache_path: str
+) -> tuple:
+    # Resolved design from a single read of the cache, parsed and written
+    # there on a miss. A truncated or stale file counts as a miss
+    path = os.path.join(
+        cache_path, f"design_{design_key(modules, optimize_design)}.pkl"
+    )
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.loads(f.read())
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as error:
+            warnings.warn(f"Ignoring cached design {path}: {error!r}")
+
+    parts = build(modules, optimize_design)
+    os.makedirs(cache_path, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(pickle.dumps(parts, pickle.HIGHEST_PROTOCOL))
+
+    os.replace(temporary, path)
+    return parts
+
+
+def load(
+    modules: list[tuple[str, str]],
+    tables_path: str,
+    optimize_design: bool = True,
+    cache_path: str | None = None,
+) -> CPU:
+    if cache_path is None:
+        parts = build(modules, optimize_design)
+    else:
+        parts = load_cached(modules, optimize_design, cache_path)
 
-    return CPU(components, networks, interface, backplane)
+    *parts, report = parts
+    setup_tables(parts[0], load_data(tables_path))
+    cpu = CPU(*parts)
+    cpu.optimization = report
+    return cpu
@@ -2,17 +2,14 @@ from simulator.engine.entities.base import Messaging
 from simulator.engine.entities.cpu import CPU
 
 
-class Motherboard(Messaging):
+class Memory(Messaging):
+    # Address space seen through the interface: ROM, RAM and stack
     name: str = "Motherboard"
     _rom: bytes
     _rw: bytearray
     _stack: bytearray
 
-    def __init__(self, cpu: CPU):
-        self.cpu = cpu
-        self.cpu.interface.set_read_callback(self._cb_read)
-        self.cpu.interface.set_write_callback(self._cb_write)
-
+    def __init__(self):
         self._rom = bytes(10240)
         self._rw = bytearray(6144)
         self._stack = bytearray(1024)
@@ -29,8 +26,16 @@ class Motherboard(Messaging):
 
         self._rom = data
 
-    def _cb_read(self, address: int) -> int:
-        self.log(f"Read from address 0x{address:04X}")
+    def get_internal_state(self) -> tuple:
+        return bytes(self._rw), bytes(self._stack)
+
+    def set_internal_state(self, state: tuple):
+        rw, stack = state
+        self._rw[:] = rw
+        self._stack[:] = stack
+
+    def read(self, address: int) -> int:
+        self.log("Read from address 0x{:04X}", address)
 
         if address <= 0x2800:
             return self._rom[address]
@@ -43,8 +48,8 @@ class Motherboard(Messaging):
 
         raise RuntimeError(f"Invalid read address: 0x{address:04X}")
 
-    def _cb_write(self, address: int, value: int) -> None:
-        self.log(f"Write to address 0x{address:04X} with value 0x{value:02X}")
+    def write(self, address: int, value: int) -> None:
+        self.log("Write to address 0x{:04X} with value 0x{:02X}", address, value)
 
         if address <= 0x2800:
             return
@@ -59,5 +64,13 @@ class Motherboard(Messaging):
 
         raise RuntimeError(f"Invalid write address: 0x{address:04X}")
 
+
+class Motherboard(Memory):
+    def __init__(self, cpu: CPU):
+        super().__init__()
+        self.cpu = cpu
+        self.cpu.interface.set_read_callback(self.read)
+        self.cpu.interface.set_write_callback(self.write)
+
     def propagate(self):
         self.cpu.propagate()
@@ -0,0 +1,189 @@
+FLOATING = 0
+LOW = 1
+HIGH = 2
+CONFLICT = 3
+
+UNDRIVEN = -1
+
+
+def get_sources(mask: int) -> list[int]:
+    # Source ids set in a driver mask, in ascending order
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+
+    return result
+
+
+class Netlist:
+    # Compiled form of the design: networks are numbered densely (slots) and
+    # drivers are identified by small integer ids (components, then backplane)
+    names: list[str]
+    # Slot of every name, networks joined through the backplane share one
+    slots: list[int]
+    sources: list[str]
+    sink: int
+
+    state: bytearray
+    next: bytearray
+    # First driver of every slot, further drivers of conflicting slots only,
+    # as a mask of source ids
+    driver: list[int]
+    next_driver: list[int]
+    extra: dict[int, int]
+    next_extra: dict[int, int]
+
+    # Event-driven mode: drivers keep their value until they are released
+    holding: bool
+    held: list[dict[int, int]]
+
+    def __init__(
+        self, names: list[str], sources: list[str], slots: list[int] | None = None
+    ):
+        self.names = names
+        self.slots = list(range(len(names))) if slots is None else slots
+        self.sources = sources
+        self.source_ids = {name: i for i, name in enumerate(sources)}
+        self.size = max(self.slots, default=-1) + 1
+        # Shared slot for unconnected pins: always reads as LOW, writes are lost
+        self.sink = self.size
+
+        self._floating = bytes(self.size + 1)
+        self._undriven = [UNDRIVEN] * (self.size + 1)
+
+        # Updated in place, so components may keep a reference to it
+        self.state = bytearray(self.size + 1)
+        self.next = bytearray(self.size + 1)
+        self.driver = list(self._undriven)
+        self.next_driver = list(self._undriven)
+        self.extra = {}
+        self.next_extra = {}
+
+        self.holding = False
+        self.held = [{} for _ in range(self.size + 1)]
+
+    def drive(self, slot: int, source: int, value: bool):
+        code = HIGH if value else LOW
+        if self.holding:
+            self.held[slot].setdefault(source, code)
+            return
+
+        first = self.next_driver[slot]
+        if first == UNDRIVEN:
+            self.next_driver[slot] = source
+            self.next[slot] = code
+            return
+
+        if first == source:
+            return
+
+        self.next_extra[slot] = self.next_extra.get(slot, 0) | (1 << source)
+        self.next[slot] = CONFLICT
+
+    def get_drivers(self, slot: int) -> list[int]:
+        first = self.driver[slot]
+        if first == UNDRIVEN:
+            return []
+
+        return [first] + get_sources(self.extra.get(slot, 0))
+
+    def get_next_drivers(self, slot: int) -> list[int]:
+        first = self.next_driver[slot]
+        if first == UNDRIVEN:
+            return []
+
+        return [first] + get_sources(self.next_extra.get(slot, 0))
+
+    def swap(self) -> bool:
+        # Returns whether any slot changed its state or drivers
+        self.next[self.sink] = FLOATING
+        changed = (
+            self.next != self.state
+            or self.next_driver != self.driver
+            or self.next_extra != self.extra
+        )
+        self.state[:] = self.next
+        self.next[:] = self._floating
+        self.driver, self.next_driver = self.next_driver, self.driver
+        self.next_driver[:] = self._undriven
+        self.extra = self.next_extra
+        self.next_extra = {}
+        return changed
+
+    def commit(self, slots: set[int]) -> list[int]:
+        # Apply next state of the given slots only, returns slots that changed
+        state = self.state
+        next_ = self.next
+        driver = self.driver
+        next_driver = self.next_driver
+        extra = self.extra
+        next_extra = self.next_extra
+
+        changed = []
+        for slot in slots:
+            code = next_[slot]
+            if code != state[slot]:
+                changed.append(slot)
+                state[slot] = code
+
+            driver[slot] = next_driver[slot]
+            # Both are empty unless some network is in conflict
+            if extra or next_extra:
+                more = next_extra.pop(slot, 0)
+                if more:
+                    extra[slot] = more
+                else:
+                    extra.pop(slot, None)
+
+            next_[slot] = FLOATING
+            next_driver[slot] = UNDRIVEN
+
+        return changed
+
+    def get_internal_state(self) -> tuple:
+        # Next state is empty between ticks, only held drivers carry over
+        return (
+            bytes(self.state),
+            list(self.driver),
+            dict(self.extra),
+            [dict(held) for held in self.held],
+        )
+
+    def set_internal_state(self, state: tuple):
+        code, driver, extra, held = state
+        self.state[:] = code
+        self.driver[:] = driver
+        self.extra = dict(extra)
+        for slot, drivers in enumerate(held):
+            self.held[slot] = dict(drivers)
+
+    def set_holding(self, holding: bool):
+        self.holding = holding
+        for held in self.held:
+            held.clear()
+
+    def release(self, source: int, slots: set[int]):
+        for slot in slots:
+            self.held[slot].pop(source, None)
+
+    def resolve(self, slot: int):
+        # Rebuild next state from held drivers, ordered as a full sweep would
+        held = self.held[slot]
+        if len(held) == 1:
+            ((source, code),) = held.items()
+            self.next[slot] = code
+            self.next_driver[slot] = source
+        elif not held:
+            self.next[slot] = FLOATING
+            self.next_driver[slot] = UNDRIVEN
+        else:
+            first, *more = sorted(held)
+            self.next[slot] = CONFLICT
+            self.next_driver[slot] = first
+            mask = 0
+            for source in more:
+                mask |= 1 << source
+
+            self.next_extra[slot] = mask
@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+
+from simulator.engine.entities.base import Component
+from simulator.engine.entities.busconnector import Backplane
+from simulator.engine.entities.ics.ic74245 import IC74245
+from simulator.engine.netlist import Netlist
+
+
+@dataclass
+class OptimizationReport:
+    # Inputs tied to VCC or GND (pull-ups included, the parser joins them to
+    # VCC), read as constants by the generated code only, the interpreted
+    # backend still reads the rails
+    folded: list[str] = field(default_factory=list)
+    # Unconnected outputs, they drive the sink slot nothing reads, skipped by
+    # the generated code only
+    pruned: list[str] = field(default_factory=list)
+    # Transceivers with a fixed direction or enable, copying one way only
+    direct: list[str] = field(default_factory=list)
+    # EEPROM banks fused by the loader before the netlist was compiled
+    fused: list[str] = field(default_factory=list)
+
+    def lines(self) -> list[str]:
+        lines = [
+            f"Folded {len(self.folded)} inputs tied to power rails (compiled backend)",
+            f"Skipped {len(self.pruned)} unconnected outputs (compiled backend)",
+            f"Fixed {len(self.direct)} transceivers",
+        ]
+        lines.extend(f"  {transceiver}" for transceiver in self.direct)
+        lines.append(f"Fused {len(self.fused)} EEPROM banks")
+        lines.extend(f"  {bank}" for bank in self.fused)
+        return lines
+
+
+def _pin_name(component: Component, pin: str) -> str:
+    aliases = dict(component.get_pin_aliases())
+    return f"{component.name}.{aliases.get(pin, pin)}"
+
+
+def _get_rails(backplane: Backplane) -> dict[int, bool]:
+    rails = dict.fromkeys(backplane.vcc_slots, True)
+    rails.update(dict.fromkeys(backplane.gnd_slots, False))
+    return rails
+
+
+def fix_transceivers(
+    components: dict[str, Component], backplane: Backplane, report: OptimizationReport
+):
+    # Goes first, a fixed direction turns one side into plain inputs
+    rails = _get_rails(backplane)
+    for component in components.values():
+        if not isinstance(component, IC74245):
+            continue
+
+        controls = (component.DIR, component.N_CE)
+        constants = {slot: rails[slot] for slot in controls if slot in rails}
+        component.fold(constants, component.dead)
+        if component.direction is not None or component.enabled:
+            direction = {True: "A to B", False: "B to A", None: "either way"}
+            report.direct.append(f"{component.name} {direction[component.direction]}")
+
+
+def fold_rails(
+    components: dict[str, Component], backplane: Backplane, report: OptimizationReport
+):
+    rails = _get_rails(backplane)
+    for component in components.values():
+        constants = {}
+        inputs = component.get_read_pins() - component.get_driven_pins()
+        inputs -= component.get_pin_numbers(["VCC", "GND"])
+        for pin in sorted(inputs):
+            slot = component.pins[pin].slot
+            if slot not in rails:
+                continue
+
+            constants[slot] = rails[slot]
+            report.folded.append(_pin_name(component, pin))
+
+        component.fold(constants, component.dead)
+
+
+def prune_outputs(
+    components: dict[str, Component], netlist: Netlist, report: OptimizationReport
+):
+    # Unconnected pins all share the sink slot, which nothing can read
+    for component in components.values():
+        dead = set()
+        for pin in sorted(component.get_pin_numbers(component._OUTPUTS)):
+            if pin not in component.pins:
+                dead.add(netlist.sink)
+                report.pruned.append(_pin_name(component, pin))
+
+        component.fold(component.constants, dead)
+
+
+def optimize(
+    components: dict[str, Component],
+    backplane: Backplane,
+    netlist: Netlist,
+    report: OptimizationReport | None = None,
+) -> OptimizationReport:
+    # Runs on a bound netlist, the fanout and the CPU are built afterwards from
+    # the pins the components read and drive
+    if report is None:
+        report = OptimizationReport()
+
+    fix_transceivers(components, backplane, report)
+    fold_rails(components, backplane, report)
+    prune_outputs(components, netlist, report)
+    return report
@@ -1,3 +1,6 @@
+import re
+from typing import Iterable
+
 from simulator.engine.entities.base import Component, Network
 from simulator.engine.entities.busconnector import BusConnector
 from simulator.engine.entities.ics.ic28c256 import IC28C256
@@ -53,103 +56,141 @@ MAPPING = {
 }
 
 
-def _parse(
-    data: str,
-) -> tuple[dict[str, tuple[str, str]], dict[str, list[tuple[str, str]]]]:
-    lines = [line.strip() for line in data.splitlines() if line.strip()]
+# Fields are separated by any run of whitespace, quoted ones may contain it
+TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _tokenize(line: str) -> list[str]:
+    return [quoted or plain for quoted, plain in TOKEN.findall(line)]
+
 
+def _fields(fields: list[str], count: int, number: int) -> list[str]:
+    if len(fields) != count:
+        raise ValueError(
+            f"Line {number}: expected {count} fields, got {' '.join(fields)}"
+        )
+
+    return fields
+
+
+def _parse(
+    lines: Iterable[str],
+) -> tuple[
+    dict[str, tuple[str, str]],
+    dict[str, list[tuple[str, str]]],
+    dict[str, list[str]],
+]:
+    # Single pass over the lines, also indexes the networks of every component
+    # in order of appearance
     last_net = None
 
     components = {}
     networks = {}
+    component_nets = {}
+
+    for number, line in enumerate(lines, 1):
+        fields = _tokenize(line)
+        if not fields:
+            continue
 
-    for line in lines:
-        if line.startswith(".ADD_COM"):
-            line = line.removeprefix(".ADD_COM").strip()
-            uuid, type_, footprint = line.split("     ")
+        directive = fields[0]
+        if directive == ".ADD_COM":
+            uuid, type_, footprint = _fields(fields[1:], 3, number)
 
             if uuid in components:
-                raise ValueError(f"Component {uuid} defined multiple times")
+                raise ValueError(
+                    f"Line {number}: Component {uuid} defined multiple times"
+                )
 
-            components[uuid] = (type_[1:-1], footprint[1:-1])  # Remove quotes
-        elif line.startswith(".ADD_TER"):
-            line = line.removeprefix(".ADD_TER").strip()
+            components[uuid] = (type_, footprint)
+            continue
 
-            data, net_name = line.split("     ")
-            net_name = net_name[1:-1]  # Remove quotes
-            component_uuid, pin_name = data.split("   ")
+        if directive == ".ADD_TER":
+            component_uuid, pin_name, net_name = _fields(fields[1:], 3, number)
 
             if net_name in networks:
-                raise ValueError(f"Network {net_name} defined multiple times")
-
-            if component_uuid not in components:
-                raise ValueError(f"Component {component_uuid} not defined")
+                raise ValueError(
+                    f"Line {number}: Network {net_name} defined multiple times"
+                )
 
-            networks[net_name] = [(component_uuid, pin_name)]
+            networks[net_name] = []
             last_net = net_name
-        elif line.startswith(".TER") or not line.startswith("."):
-            line = line.removeprefix(".TER").strip()
+        elif directive == ".TER" or not directive.startswith("."):
+            if directive == ".TER":
+                fields = fields[1:]
 
-            component_uuid, pin_name = line.split("   ")
+            component_uuid, pin_name = _fields(fields, 2, number)
 
             if last_net is None:
-                raise ValueError(".TER found before any .ADD_TER")
+                raise ValueError(f"Line {number}: .TER found before any .ADD_TER")
+        else:
+            continue  # Ignore other directives
 
-            if component_uuid not in components:
-                raise ValueError(f"Component {component_uuid} not defined")
+        if component_uuid not in components:
+            raise ValueError(f"Line {number}: Component {component_uuid} not defined")
 
-            networks[last_net].append((component_uuid, pin_name))
-        elif line.startswith("."):
-            continue  # Ignore other directives
+        networks[last_net].append((component_uuid, pin_name))
+        nets = component_nets.setdefault(component_uuid, [])
+        if not nets or nets[-1] != last_net:
+            nets.append(last_net)
 
-    return components, networks
+    return components, networks, component_nets
 
 
 def _replace_resistors(
     components_data: dict[str, tuple[str, str]],
     networks_data: dict[str, list[tuple[str, str]]],
-) -> dict[str, tuple[str, str]]:
-    to_remove = []
+    component_nets: dict[str, list[str]],
+) -> tuple[dict[str, tuple[str, str]], dict[str, list[tuple[str, str]]]]:
+    # Pull-up resistors join their network to VCC, networks already joined
+    # count as VCC for the resistors that follow
+    resistors = set()
+    pulled_up = set()
     for uuid, (type_name, _) in components_data.items():
         if type_name not in NAMES_RESISTOR:
             continue
 
-        to_remove.append(uuid)
-        connected_nets = []
-        new_net = []
-        for net_name, terminals in networks_data.items():
-            for component_uuid, pin in terminals:
-                if component_uuid == uuid:
-                    connected_nets.append(net_name)
-                    break
-            else:
-                continue
-
-            for component_uuid, pin in terminals:
-                if component_uuid != uuid:
-                    new_net.append((component_uuid, pin))
+        resistors.add(uuid)
+        connected_nets = list(
+            dict.fromkeys(
+                "VCC" if net in pulled_up else net
+                for net in component_nets.get(uuid, [])
+            )
+        )
 
         if len(connected_nets) != 2:
             raise ValueError(f"Resistor {uuid} does not have exactly two connections")
 
-        if connected_nets[0] == "VCC":
-            networks_data["VCC"] = new_net
-            del networks_data[connected_nets[1]]
-        elif connected_nets[1] == "VCC":
-            networks_data["VCC"] = new_net
-            del networks_data[connected_nets[0]]
-        else:
+        if "VCC" not in connected_nets:
             raise ValueError(f"Resistor {uuid} is not connected to VCC")
 
-    for uuid in to_remove:
+        connected_nets.remove("VCC")
+        (net_name,) = connected_nets
+        pulled_up.add(net_name)
+        networks_data["VCC"].extend(networks_data.pop(net_name))
+
+    if resistors:
+        networks_data["VCC"] = [
+            (component_uuid, pin)
+            for component_uuid, pin in networks_data["VCC"]
+            if component_uuid not in resistors
+        ]
+
+    for uuid in resistors:
         del components_data[uuid]
 
     return components_data, networks_data
 
 
-def parse(data: str) -> tuple[list[Component], list[Network]]:
-    components_data, networks_data = _parse(data)
-    components_data, networks_data = _replace_resistors(components_data, networks_data)
+def parse(data: str | Iterable[str]) -> tuple[list[Component], list[Network]]:
+    # Netlist text or its lines, e.g. an open file
+    if isinstance(data, str):
+        data = data.splitlines()
+
+    components_data, networks_data, component_nets = _parse(data)
+    components_data, networks_data = _replace_resistors(
+        components_data, networks_data, component_nets
+    )
 
     pinouts: dict[str, dict[str, str]] = {}
 
@@ -177,6 +218,7 @@ def parse(data: str) -> tuple[list[Component], list[Network]]:
 
         component_class = MAPPING[type_name]
         component = component_class(name=uuid, pins=pinouts.get(uuid, {}))
+        component.set_part(type_name)
         components.append(component)
 
     return components, networks
@@ -0,0 +1,117 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from simulator.engine.entities.base import Component
+
+
+@dataclass
+class ProfileReport:
+    # Seconds spent in CPU.propagate since profiling started
+    total: float = 0.0
+    # Name to calls and seconds, components by instance, then by IC class
+    components: dict[str, tuple[int, float]] = field(default_factory=dict)
+    classes: dict[str, tuple[int, float]] = field(default_factory=dict)
+    # Backplane power and network resolution
+    phases: dict[str, tuple[int, float]] = field(default_factory=dict)
+
+    def lines(self, count: int = 10) -> list[str]:
+        lines = [f"Propagate: {self.total * 1000:.1f} ms"]
+        for title, entries in (
+            ("Phases", self.phases),
+            ("IC classes", self.classes),
+            (f"Top {count} components", self.components),
+        ):
+            lines.append(f"{title}:")
+            ranked = sorted(entries.items(), key=lambda item: -item[1][1])
+            for name, (calls, seconds) in ranked[:count]:
+                share = seconds / self.total * 100 if self.total else 0.0
+                lines.append(
+                    f"  {name:<24} {calls:>10} calls {seconds * 1000:>10.1f} ms"
+                    f" {share:>5.1f}%"
+                )
+
+        return lines
+
+    def to_dict(self) -> dict:
+        def entries(values: dict[str, tuple[int, float]]) -> dict:
+            return {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in values.items()
+            }
+
+        return {
+            "total": self.total,
+            "phases": entries(self.phases),
+            "classes": entries(self.classes),
+            "components": entries(self.components),
+        }
+
+    def dump(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+class Profiler:
+    # Call counts and wall time of every component propagator and of the
+    # backplane and network phases, measured by wrappers the CPU installs
+    # while profiling
+    def __init__(self, components: list[Component]):
+        self._names = [component.name for component in components]
+        self._classes = [type(component).__name__ for component in components]
+        self._calls = [0] * len(components)
+        self._times = [0.0] * len(components)
+        self._phases = {}
+        self._total = [0, 0.0]
+
+    def wrap_component(self, index: int, function: Callable) -> Callable:
+        calls = self._calls
+        times = self._times
+        counter = time.perf_counter
+
+        def timed():
+            start = counter()
+            function()
+            times[index] += counter() - start
+            calls[index] += 1
+
+        return timed
+
+    def wrap_phase(self, phase: str, function: Callable) -> Callable:
+        entry = self._phases.setdefault(phase, [0, 0.0])
+        return self._wrap(entry, function)
+
+    def wrap_total(self, function: Callable) -> Callable:
+        return self._wrap(self._total, function)
+
+    def _wrap(self, entry: list, function: Callable) -> Callable:
+        counter = time.perf_counter
+
+        def timed(*args):
+            start = counter()
+            result = function(*args)
+            entry[1] += counter() - start
+            entry[0] += 1
+            return result
+
+        return timed
+
+    def report(self) -> ProfileReport:
+        report = ProfileReport(total=self._total[1])
+        for name, ic_class, calls, seconds in zip(
+            self._names, self._classes, self._calls, self._times
+        ):
+            if not calls:
+                continue
+
+            report.components[name] = (calls, seconds)
+            class_calls, class_seconds = report.classes.get(ic_class, (0, 0.0))
+            report.classes[ic_class] = (class_calls + calls, class_seconds + seconds)
+
+        report.phases = {
+            phase: (calls, seconds)
+            for phase, (calls, seconds) in self._phases.items()
+            if calls
+        }
+        return report
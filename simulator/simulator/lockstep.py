@@ -0,0 +1,254 @@
+from collections import deque
+from dataclasses import dataclass
+
+from simulator.emulator import (
+    ACCUMULATOR,
+    ADDRESS_HIGH,
+    ADDRESS_LOW,
+    ARGUMENT_HIGH,
+    ARGUMENT_LOW,
+    FLAGS,
+    FLAGS_FROM_ALU,
+    INSTRUCTION,
+    PROGRAM_COUNTER_HIGH,
+    PROGRAM_COUNTER_LOW,
+    READER,
+    REGISTER_NAMES,
+    STACK_POINTER_HIGH,
+    STACK_POINTER_LOW,
+    XH,
+    YH,
+    YL,
+    ZH,
+    ZL,
+    MicrocodeEmulator,
+)
+from simulator.engine.entities.cpu import Scheduling
+from simulator.simulation import SimulationEngine
+
+# Components holding the registers of the emulator, 4-bit counters from the
+# low nibble to the high one
+REGISTER_COMPONENTS = {
+    STACK_POINTER_HIGH: ("SP:U2", "SP:U3"),
+    STACK_POINTER_LOW: ("SP:U4", "SP:U5"),
+    PROGRAM_COUNTER_HIGH: ("PC:U2", "PC:U3"),
+    PROGRAM_COUNTER_LOW: ("PC:U4", "PC:U5"),
+    ARGUMENT_HIGH: ("ALU:U1",),
+    ARGUMENT_LOW: ("ALU:U6",),
+    ACCUMULATOR: ("REG:XL1",),
+    XH: ("REG:XH1",),
+    YL: ("REG:YL1",),
+    YH: ("REG:YH1",),
+    ZL: ("REG:ZL1",),
+    ZH: ("REG:ZH1",),
+    FLAGS: ("C2:U2",),
+    INSTRUCTION: ("C1:INSTRUCTION1",),
+    ADDRESS_HIGH: ("I:U6", "I:U5"),
+    ADDRESS_LOW: ("I:U8", "I:U7"),
+}
+STEP_COUNTER = "C2:STEP1"
+
+
+def _format(value) -> str:
+    if isinstance(value, tuple):
+        return "[" + ", ".join(f"{a:04X}<-{v:02X}" for a, v in value) + "]"
+
+    if isinstance(value, bool):
+        return str(value)
+
+    return f"{value:02X}"
+
+
+def get_engine_registers(engine: SimulationEngine) -> dict[int, int]:
+    # Registers of the engine by their bus component code
+    components = engine.cpu.components
+    return {
+        code: sum(
+            components[name].get_variables()["Q"] << 4 * i
+            for i, name in enumerate(names)
+        )
+        for code, names in REGISTER_COMPONENTS.items()
+    }
+
+
+def load_model(model: MicrocodeEmulator, engine: SimulationEngine):
+    # Registers, step counter and memory of the engine into the model
+    for code, value in get_engine_registers(engine).items():
+        model.registers[code] = value
+
+    model.step_counter = engine.cpu.components[STEP_COUNTER].get_variables()["Q"]
+    model.memory.set_internal_state(engine.motherboard.get_internal_state())
+
+
+def _seed_registers(engine: SimulationEngine, model: MicrocodeEmulator):
+    for code, names in REGISTER_COMPONENTS.items():
+        value = model.registers[code]
+        if len(names) == 1:
+            engine.set_component_variable(names[0], "Q", value)
+            continue
+
+        for i, name in enumerate(names):
+            engine.set_component_variable(name, "Q", value >> 4 * i & 0xF)
+
+    engine.set_component_variable(STEP_COUNTER, "Q", model.step_counter)
+
+
+def load_engine(engine: SimulationEngine, model: MicrocodeEmulator, settle: int):
+    # Seeds the register ICs and the memory of the engine from the model at
+    # the end of a cycle. The new control word may clock registers while the
+    # engine settles, so they are seeded again once it has
+    engine.motherboard.set_internal_state(model.memory.get_internal_state())
+    engine.set_component_variable("I:PAD2", "CLOCK", 1)
+    _seed_registers(engine, model)
+    engine.settle(settle)
+    _seed_registers(engine, model)
+    engine.settle(settle)
+
+
+@dataclass(frozen=True)
+class CycleRecord:
+    cycle: int
+    # Engine registers by name, STEP is the step counter
+    registers: dict[str, int]
+    writes: tuple[tuple[int, int], ...]
+
+    def line(self) -> str:
+        registers = " ".join(
+            f"{name}={value:02X}" for name, value in self.registers.items()
+        )
+        if self.writes:
+            registers += f" WRITES={_format(self.writes)}"
+
+        return f"{self.cycle:6d} {registers}"
+
+
+@dataclass(frozen=True)
+class Divergence:
+    cycle: int
+    # Name to the engine value and the model value
+    differences: dict[str, tuple]
+    # Cycles before the divergent one, oldest first
+    history: list[CycleRecord]
+
+    def lines(self) -> list[str]:
+        lines = [f"Divergence at cycle {self.cycle}"]
+        lines.extend(
+            f"  {name}: engine {_format(engine)} model {_format(model)}"
+            for name, (engine, model) in self.differences.items()
+        )
+        if self.history:
+            lines.append(f"Last {len(self.history)} cycles of the engine:")
+            lines.extend(record.line() for record in self.history)
+
+        return lines
+
+
+class LockstepRunner:
+    # Clocks SimulationEngine and MicrocodeEmulator together and compares the
+    # registers, the step counter, the halt line and the memory writes after
+    # every cycle
+    engine: SimulationEngine
+    model: MicrocodeEmulator
+    cycle: int
+
+    def __init__(
+        self, engine: SimulationEngine, model: MicrocodeEmulator, history: int = 16
+    ):
+        self.engine = engine
+        self.model = model
+        self.cycle = 0
+        self.history = deque(maxlen=history)
+
+        self._engine_writes = []
+        self._write = engine.motherboard.write
+        engine.interface.set_write_callback(self._record_write)
+        model.writes = []
+
+        self._step_counter = engine.cpu.components[STEP_COUNTER]
+
+    @classmethod
+    def load(
+        cls,
+        modules_path: str,
+        tables_path: str,
+        rom: bytes,
+        scheduling: Scheduling = Scheduling.DELTA,
+        history: int = 16,
+    ) -> "LockstepRunner":
+        engine = SimulationEngine.load(modules_path, tables_path, rom, scheduling)
+        return cls(engine, MicrocodeEmulator.load(tables_path, rom), history)
+
+    def _record_write(self, address: int, value: int):
+        self._engine_writes.append((address, value))
+        self._write(address, value)
+
+    def sync(self):
+        # Loads the engine state into the model, after the reset sequence
+        # the registers it does not clear keep their power up value
+        load_model(self.model, self.engine)
+        self._engine_writes.clear()
+        self.model.writes.clear()
+
+    def reset(self, init_ticks: int, startup_ticks: int):
+        # Reset sequence of the debugger on the engine, then sync
+        self.engine.reset(init_ticks, startup_ticks)
+        self.sync()
+        self.cycle = 0
+        self.history.clear()
+
+    def _compare(self) -> tuple[dict[str, tuple], CycleRecord]:
+        engine_registers = get_engine_registers(self.engine)
+        model_registers = self.model.registers
+        halted = self.model.halted
+
+        # The register the next step reads may already hold the bus value of
+        # this step, its latch races the clock
+        skipped = set()
+        if not halted:
+            following = self.model.get_control()
+            skipped.add(following[READER])
+            if following[FLAGS_FROM_ALU]:
+                skipped.add(FLAGS)
+
+        differences = {}
+        registers = {}
+        for code, value in engine_registers.items():
+            name = REGISTER_NAMES[code]
+            registers[name] = value
+            if code not in skipped and value != model_registers[code]:
+                differences[name] = (value, model_registers[code])
+
+        step = self._step_counter.get_variables()["Q"]
+        registers["STEP"] = step
+        if step != self.model.step_counter:
+            differences["STEP"] = (step, self.model.step_counter)
+
+        if self.engine.is_halted() != halted:
+            differences["HALT"] = (self.engine.is_halted(), halted)
+
+        writes = tuple(self._engine_writes)
+        if self._engine_writes != self.model.writes:
+            differences["WRITES"] = (writes, tuple(self.model.writes))
+
+        self._engine_writes.clear()
+        self.model.writes.clear()
+        return differences, CycleRecord(self.cycle, registers, writes)
+
+    def run(
+        self, max_cycles: int, period: int, stop_on_halt: bool = True
+    ) -> Divergence | None:
+        # Runs until the first divergence, None if there was none
+        for _ in range(max_cycles):
+            self.engine.step_cycles(1, period, sample=None, stop_on_halt=False)
+            self.model.step()
+            self.cycle += 1
+
+            differences, record = self._compare()
+            if differences:
+                return Divergence(self.cycle, differences, list(self.history))
+
+            self.history.append(record)
+            if stop_on_halt and self.model.halted:
+                break
+
+        return None
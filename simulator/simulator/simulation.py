@@ -1,72 +1,256 @@
-from simulator.base import LogLevel, State, WaveformChunk
-from simulator.engine.entities.base import MessagingProvider, NetworkState
-from simulator.engine.entities.cpu import CPU
+import hashlib
+import marshal
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from simulator.base import CycleSample, LogLevel, State, StopReason, WaveformChunk
+from simulator.engine.compiler import Backend, compile_cpu, design_hash
+from simulator.engine.entities.base import Component, MessagingProvider
+from simulator.engine.entities.cpu import CPU, Scheduling
+from simulator.engine.entities.ics.ic28c256 import IC28C256, IC28C256Bank
 from simulator.engine.entities.interface import Interface
-from simulator.engine.loader import load
+from simulator.engine.loader import hash_sources, load
 from simulator.engine.motherboard import Motherboard
+from simulator.engine.netlist import LOW, UNDRIVEN, Netlist, get_sources
+
+# Indexed by netlist state code
+CHUNK_STATES = (State.FLOATING, State.LOW, State.HIGH, State.CONFLICT)
+
 
-STATE_MAPPING = {
-    NetworkState.DRIVEN_HIGH: State.HIGH,
-    NetworkState.DRIVEN_LOW: State.LOW,
-    NetworkState.FLOATING: State.FLOATING,
-    NetworkState.CONFLICT: State.CONFLICT,
-}
+# Part of the snapshot key, bump whenever the saved state layout changes
+SNAPSHOT_VERSION = 2
 
+# Indexed by message level
+LOG_LEVELS = (LogLevel.INFO, LogLevel.OK, LogLevel.WARNING, LogLevel.ERROR)
 
-class StoringMessagingProvider(MessagingProvider):
-    _logs: list[tuple[LogLevel, str, str]]
+
+class EventBus(MessagingProvider):
+    # Keeps messages as (level, source id, template, args) until they are read,
+    # every level of every source is enabled by default
+    sources: list[str]
 
     def __init__(self):
-        self._logs = []
+        self.sources = []
+        self._ids = {}
+        self._levels = []
+        self._defaults = [True, True, True, True]
+        self._events = []
+
+    def register(self, source: str) -> tuple[int, list[bool]]:
+        id_ = self._ids.get(source)
+        if id_ is None:
+            id_ = self._ids[source] = len(self.sources)
+            self.sources.append(source)
+            self._levels.append(list(self._defaults))
 
-    def log(self, source: str, message: str):
-        self._logs.append((LogLevel.INFO, source, message))
+        return id_, self._levels[id_]
 
-    def ok(self, source: str, message: str):
-        self._logs.append((LogLevel.OK, source, message))
+    def set_level(self, level: LogLevel, enabled: bool, source: str | None = None):
+        # Without a source it applies to every source, registered later included
+        code = LOG_LEVELS.index(level)
+        if source is None:
+            self._defaults[code] = enabled
+            targets = self._levels
+        else:
+            targets = [self.register(source)[1]]
+
+        for levels in targets:
+            levels[code] = enabled
+
+    def emit(self, level: int, source: int, message: str, args: tuple):
+        self._events.append((level, source, message, args))
 
-    def warn(self, source: str, message: str):
-        self._logs.append((LogLevel.WARNING, source, message))
+    def collect(self) -> list[tuple[int, int, str, tuple]]:
+        events = self._events
+        self._events = []
+        return events
 
-    def error(self, source: str, message: str):
-        self._logs.append((LogLevel.ERROR, source, message))
+    def format(
+        self, events: list[tuple[int, int, str, tuple]]
+    ) -> list[tuple[LogLevel, str, str]]:
+        sources = self.sources
+        return [
+            (
+                LOG_LEVELS[level],
+                sources[source],
+                message.format(*args) if args else message,
+            )
+            for level, source, message, args in events
+        ]
 
     def collect_logs(self) -> list[tuple[LogLevel, str, str]]:
-        logs = self._logs
-        self._logs = []
-        return logs
+        return self.format(self.collect())
+
+
+class LazyWaveformChunk:
+    # Same interface as WaveformChunk, but the network and variable dicts are
+    # built from a raw snapshot of the netlist only when they are read, logs
+    # are formatted on first access. Drivers and variables are reported under
+    # the names of the netlists, components lists the parts
+    tick: int
+
+    def __init__(
+        self,
+        netlist: Netlist,
+        components: list[Component],
+        driver_names: dict[tuple[int, int], str],
+        events: list[tuple[int, int, str, tuple]],
+        bus: EventBus,
+        tick: int,
+    ):
+        self.tick = tick
+        self._events = events
+        self._bus = bus
+        self._logs = None
+
+        self._names = netlist.names
+        self._slots = netlist.slots
+        self._sources = netlist.sources
+        self._driver_names = driver_names
+        self._state = bytes(netlist.state)
+        self._driver = list(netlist.driver)
+        self._extra = dict(netlist.extra)
+        self._components = components
+
+        self._network_drivers = None
+        self._network_states = None
+        self._variables = None
+
+    @property
+    def logs(self) -> list[tuple[LogLevel, str, str]]:
+        if self._logs is None:
+            self._logs = self._bus.format(self._events)
+            self._events = None
+
+        return self._logs
+
+    @property
+    def network_drivers(self) -> dict[str, list[str]]:
+        if self._network_drivers is None:
+            sources = self._sources
+            driver_names = self._driver_names
+            extra = self._extra
+            result = {}
+            for name, slot in zip(self._names, self._slots):
+                first = self._driver[slot]
+                if first == UNDRIVEN:
+                    result[name] = []
+                else:
+                    drivers = [first] + get_sources(extra.get(slot, 0))
+                    result[name] = [
+                        driver_names.get((i, slot)) or sources[i] for i in drivers
+                    ]
+
+            self._network_drivers = result
+
+        return self._network_drivers
+
+    @property
+    def network_states(self) -> dict[str, State]:
+        if self._network_states is None:
+            self._network_states = {
+                name: CHUNK_STATES[self._state[slot]]
+                for name, slot in zip(self._names, self._slots)
+            }
+
+        return self._network_states
+
+    @property
+    def variables(self) -> dict[str, dict[str, int]]:
+        self.freeze()
+        return self._variables
+
+    def freeze(self):
+        if self._variables is None:
+            self._variables = {
+                component.name: dict(component.get_variables())
+                for component in self._components
+            }
+            self._components = None
+
+    def materialize(self) -> WaveformChunk:
+        return WaveformChunk(
+            network_drivers=self.network_drivers,
+            network_states=self.network_states,
+            logs=self.logs,
+            tick=self.tick,
+            variables=self.variables,
+        )
+
+
+@dataclass(frozen=True)
+class RunResult:
+    chunk: LazyWaveformChunk | None
+    cycles: int
+    reason: StopReason
 
 
 class SimulationEngine:
     _tick: int
-    provider: StoringMessagingProvider
+    _last_chunk: LazyWaveformChunk | None
+    events: EventBus
     motherboard: Motherboard
     cpu: CPU
     interface: Interface
 
-    def __init__(self, cpu: CPU, rom: bytes):
+    def __init__(self, cpu: CPU, rom: bytes, scheduling: Scheduling = Scheduling.SWEEP):
         self._tick = 0
-        self.provider = StoringMessagingProvider()
+        self._last_chunk = None
+        self.events = EventBus()
         for component in cpu.components.values():
-            component.set_messaging_provider(self.provider)
+            component.set_messaging_provider(self.events)
         for network in cpu.networks.values():
-            network.set_messaging_provider(self.provider)
+            network.set_messaging_provider(self.events)
         self.motherboard = Motherboard(cpu)
-        self.motherboard.set_messaging_provider(self.provider)
+        self.motherboard.set_messaging_provider(self.events)
         self.motherboard.set_rom(rom)
         self.cpu = cpu
+        self._components = list(cpu.components.values())
+        self._parts = list(cpu.parts.values())
+        self.cpu.set_scheduling(scheduling)
         self.interface = cpu.interface
+        self._design_key = None
 
     @classmethod
     def load(
-        cls, modules_path: str, tables_path: str, rom: bytes
+        cls,
+        modules_path: str,
+        tables_path: str,
+        rom: bytes,
+        scheduling: Scheduling = Scheduling.SWEEP,
+        backend: Backend = Backend.INTERPRETED,
+        cache_path: str | None = None,
+        optimize: bool = True,
+        design_path: str | None = None,
     ) -> "SimulationEngine":
-        cpu = load(modules_path, tables_path)
-        return cls(cpu, rom)
+        # cache_path holds the generated modules of the compiled backend,
+        # design_path the resolved designs of the loader
+        cpu = load(modules_path, tables_path, optimize, design_path)
+        if backend == Backend.COMPILED:
+            compile_cpu(cpu, cache_path)
+
+        return cls(cpu, rom, scheduling)
+
+    def clone(self) -> "SimulationEngine":
+        # Independent engine in the current state, the design and the ROM are
+        # shared, logs not yet in a chunk stay with this engine
+        engine = SimulationEngine(
+            self.cpu.copy(), self.motherboard._rom, self.cpu.scheduling
+        )
+        engine.set_internal_state(self.get_internal_state())
+        engine._design_key = self._design_key
+        return engine
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
 
     def get_component_pins(self) -> dict[str, dict[str, str]]:
         result = {}
-        for component in self.cpu.components.values():
+        for component in self.cpu.parts.values():
             aliases = component.get_pin_aliases()
             aliases_map = {}
             for pin, alias in aliases:
@@ -92,7 +276,7 @@ class SimulationEngine:
 
     def get_component_variable_sizes(self) -> dict[str, dict[str, str]]:
         result = {}
-        for component in self.cpu.components.values():
+        for component in self.cpu.parts.values():
             result[component.name] = component.get_variable_sizes()
 
         return result
@@ -102,36 +286,217 @@ class SimulationEngine:
         if component is None:
             return False
 
+        self._freeze_last_chunk()
+        self.cpu.mark_dirty(component)
         return component.set_variable(var, value)
 
+    def set_scheduling(self, scheduling: Scheduling):
+        self.cpu.set_scheduling(scheduling)
+
+    def set_log_level(self, level: LogLevel, enabled: bool, source: str | None = None):
+        self.events.set_level(level, enabled, source)
+
     def set_power(self, state: bool):
         if state:
             self.cpu.backplane.power_on()
         else:
             self.cpu.backplane.power_off()
 
-    def tick(self) -> WaveformChunk:
-        self.motherboard.propagate()
-
-        network_drivers = {}
-        network_states = {}
-        for network in self.cpu.networks.values():
-            network_drivers[network.name] = list(network.drivers)
-            network_states[network.name] = STATE_MAPPING[network.state]
-
-        variables = {}
-        for component in self.cpu.components.values():
-            variables[component.name] = {}
-            for name, value in component.get_variables().items():
-                variables[component.name][name] = value
-
-        logs = self.provider.collect_logs()
-        chunk = WaveformChunk(
-            network_drivers=network_drivers,
-            network_states=network_states,
-            logs=logs,
-            tick=self._tick,
-            variables=variables,
+    def reset(self, init_ticks: int, startup_ticks: int):
+        # Power up holding reset until the design settles, then release it
+        self.set_power(True)
+        self.set_component_variable(self.interface.name, "RESET", 1)
+        self.set_component_variable(self.interface.name, "WAIT", 0)
+        self.settle(init_ticks)
+        self.set_component_variable(self.interface.name, "RESET", 0)
+        self.settle(startup_ticks)
+
+    def get_internal_state(self) -> tuple:
+        return (
+            self._tick,
+            self.cpu.get_internal_state(),
+            self.motherboard.get_internal_state(),
+        )
+
+    def set_internal_state(self, state: tuple):
+        # Messages still waiting for a chunk belong to the discarded state
+        self._freeze_last_chunk()
+        self.events.collect()
+
+        self._tick, cpu, motherboard = state
+        self.cpu.set_internal_state(cpu)
+        self.motherboard.set_internal_state(motherboard)
+
+    def get_snapshot_key(self, label: str) -> str:
+        # A snapshot depends on the design, the source of the simulator, the
+        # EEPROM and ROM contents, the scheduling and on the steps that reached
+        # it, named by the label
+        digest = hashlib.sha256(
+            f"version {SNAPSHOT_VERSION} {marshal.version}\n".encode()
         )
+        if self._design_key is None:
+            sources = hash_sources(Path(__file__).parent)
+            self._design_key = f"{design_hash(self.cpu)} {sources}"
+
+        digest.update(f"design {self._design_key}\n".encode())
+        digest.update(f"scheduling {self.cpu.scheduling}\n".encode())
+        digest.update(f"label {label}\n".encode())
+        for component in self._components:
+            if isinstance(component, IC28C256):
+                digest.update(component.memory)
+            elif isinstance(component, IC28C256Bank):
+                for memory in component.memories:
+                    digest.update(memory)
+
+        digest.update(self.motherboard._rom)
+        return digest.hexdigest()[:16]
+
+    def _get_snapshot_file(self, path: str, label: str) -> str:
+        return os.path.join(path, f"state_{self.get_snapshot_key(label)}.bin")
+
+    def save_snapshot(self, path: str, label: str):
+        os.makedirs(path, exist_ok=True)
+        file = self._get_snapshot_file(path, label)
+        temporary = f"{file}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(zlib.compress(marshal.dumps(self.get_internal_state())))
+
+        os.replace(temporary, file)
+
+    def load_snapshot(self, path: str, label: str) -> bool:
+        # Returns False if there is no usable snapshot, the state is unchanged
+        try:
+            with open(self._get_snapshot_file(path, label), "rb") as f:
+                state = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            return False
+
+        self.set_internal_state(state)
+        return True
+
+    def _freeze_last_chunk(self):
+        # Variables of the last chunk are read from the components, so they
+        # have to be copied before anything can change them
+        if self._last_chunk is not None:
+            self._last_chunk.freeze()
+            self._last_chunk = None
+
+    def tick(self, capture: bool = True) -> LazyWaveformChunk | None:
+        # Logs of ticks that are not captured go to the next captured chunk
+        self._freeze_last_chunk()
+
+        if not self.cpu.is_settled():
+            self.motherboard.propagate()
+
         self._tick += 1
+        if not capture:
+            return None
+
+        self._last_chunk = LazyWaveformChunk(
+            self.cpu.netlist,
+            self._parts,
+            self.cpu.driver_names,
+            self.events.collect(),
+            self.events,
+            self._tick - 1,
+        )
+        return self._last_chunk
+
+    def advance(self, ticks: int):
+        self._freeze_last_chunk()
+
+        # Once settled, the remaining ticks would not change anything
+        is_settled = self.cpu.is_settled
+        propagate = self.motherboard.propagate
+        for _ in range(ticks):
+            if is_settled():
+                break
+
+            propagate()
+
+        self._tick += ticks
+
+    def settle(self, max_ticks: int) -> int:
+        # Run until nothing changes anymore, returns the number of ticks taken
+        self._freeze_last_chunk()
+
+        ticks = 0
+        while ticks < max_ticks and not self.cpu.is_settled():
+            self.motherboard.propagate()
+            ticks += 1
+
+        self._tick += ticks
+        return ticks
+
+    def is_halted(self) -> bool:
+        return self.cpu.netlist.state[self.interface.N_HALT] == LOW
+
+    def _set_clock(self, value: bool):
+        self._freeze_last_chunk()
+        self.interface.set_clock(value)
+        self.cpu.mark_dirty(self.interface)
+
+    def _run_cycle(
+        self, period: int, sample: CycleSample | None
+    ) -> LazyWaveformChunk | None:
+        # CLOCK low for period // 2 + 1 ticks, then high for period // 2 ticks
+        half = period // 2
+        chunk = None
+
+        self._set_clock(False)
+        if sample == CycleSample.RISING_EDGE:
+            self.advance(half)
+            chunk = self.tick()
+        else:
+            self.advance(half + 1)
+
+        self._set_clock(True)
+        if sample == CycleSample.END:
+            self.advance(half - 1)
+            chunk = self.tick()
+        else:
+            self.advance(half)
+
         return chunk
+
+    def step_cycles(
+        self,
+        cycles: int,
+        period: int,
+        sample: CycleSample | None = CycleSample.END,
+        stop_on_halt: bool = True,
+    ) -> list[LazyWaveformChunk]:
+        if period < 2:
+            raise ValueError(f"Clock period must be at least 2 ticks, got {period}")
+
+        chunks = []
+        for _ in range(cycles):
+            chunk = self._run_cycle(period, sample)
+            if chunk is not None:
+                chunks.append(chunk)
+
+            if stop_on_halt and self.is_halted():
+                break
+
+        return chunks
+
+    def run_until(
+        self,
+        predicate: Callable[[LazyWaveformChunk], bool],
+        max_cycles: int,
+        period: int,
+        sample: CycleSample = CycleSample.END,
+    ) -> RunResult:
+        if period < 2:
+            raise ValueError(f"Clock period must be at least 2 ticks, got {period}")
+
+        chunk = None
+        for cycle in range(1, max_cycles + 1):
+            chunk = self._run_cycle(period, sample)
+            if predicate(chunk):
+                return RunResult(chunk, cycle, StopReason.PREDICATE)
+
+            if self.is_halted():
+                return RunResult(chunk, cycle, StopReason.HALT)
+
+        return RunResult(chunk, max_cycles, StopReason.LIMIT)
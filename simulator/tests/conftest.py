@@ -7,6 +7,7 @@ import os
 import sys
 import tempfile
 from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
 from typing import Generator
 from unittest.mock import MagicMock, PropertyMock, patch
 
@@ -19,6 +20,51 @@ from debug.breakpoint import Breakpoint, BreakpointManager
 from debug.disassembler import Disassembler
 from debug.state import CPUState
 from debug.watch import Watch, WatchManager
+from config import INIT_TICKS, MODULES, STARTUP_TICKS, TABLES_PATH
+from simulator.simulation import Backend, Scheduling, SimulationEngine
+
+SIMULATOR_DIR = Path(__file__).parent.parent
+MODULES_ABS = [(str(SIMULATOR_DIR / path), name) for path, name in MODULES]
+TABLES_ABS = str((SIMULATOR_DIR / TABLES_PATH).resolve())
+
+# ldi-ac 10; cmpi 5; jz 0x000B; ...; hlt
+TEST_ROM = bytes(
+    [0x03, 0x0A, 0xDA, 0x05, 0x6B, 0x00, 0x0B, 0x00, 0x00, 0x00, 0xDD, 0xDD]
+)
+
+
+def hold_reset(engine: SimulationEngine) -> SimulationEngine:
+    """
+    Power the engine up with reset held, for tests that tick through the
+    reset sequence themselves.
+    """
+    engine.set_power(True)
+    engine.set_component_variable("I:PAD2", "RESET", 1)
+    engine.set_component_variable("I:PAD2", "WAIT", 0)
+    return engine
+
+
+def loaded_engine(
+    scheduling: Scheduling = Scheduling.SWEEP,
+    rom: bytes = TEST_ROM,
+    reset: bool = True,
+    **kwargs,
+) -> SimulationEngine:
+    """
+    Load the CPU design with the given ROM and, unless reset is False, run
+    the power on reset sequence of the debugger.
+    """
+    engine = SimulationEngine.load(MODULES_ABS, TABLES_ABS, rom, scheduling, **kwargs)
+    if reset:
+        engine.reset(INIT_TICKS, STARTUP_TICKS)
+
+    return engine
+
+
+@pytest.fixture(params=list(Backend), ids=lambda backend: backend.name.lower())
+def backend(request) -> Backend:
+    """Run the test once on every backend of the simulation engine."""
+    return request.param
 
 
 @pytest.fixture
@@ -176,9 +222,29 @@ class MockSimulationEngine:
         self._variables[component][var] = value
         return True
 
-    def tick(self) -> MockWaveformChunk:
+    def tick(self, capture: bool = True) -> MockWaveformChunk | None:
         self._tick_count += 1
-        return MockWaveformChunk()
+        return MockWaveformChunk() if capture else None
+
+    def advance(self, ticks: int):
+        self._tick_count += ticks
+
+    def step_cycles(
+        self, cycles: int, period: int, sample=None, stop_on_halt: bool = True
+    ) -> list[MockWaveformChunk]:
+        self._tick_count += cycles * (period + 1)
+        return [MockWaveformChunk() for _ in range(cycles)]
+
+    def settle(self, max_ticks: int) -> int:
+        return 0
+
+    def reset(self, init_ticks: int, startup_ticks: int):
+        self.set_power(True)
+        self.set_component_variable("I:PAD2", "RESET", 0)
+        self.set_component_variable("I:PAD2", "WAIT", 0)
+
+    def is_halted(self) -> bool:
+        return False
 
     def get_component_pins(self) -> dict[str, dict[str, str]]:
         return {
@@ -0,0 +1,129 @@
+"""
+Tests for bit-parallel batch simulation.
+
+Every lane must follow exactly the waveform of an event-driven engine
+running the same ROM.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.batch import BatchEngine
+from simulator.engine.lanes import LaneNetlist
+from simulator.simulation import Scheduling
+from tests.conftest import MODULES_ABS, TABLES_ABS, TEST_ROM, hold_reset, loaded_engine
+
+ROMS = [
+    TEST_ROM,
+    # ldi-ac 0x5A; st [0x4000], ac; ldi-ac 0; ld-ac [0x4000]; ...; hlt
+    bytes(
+        [0x03, 0x5A, 0x1A, 0x40, 0x00, 0x03, 0x00, 0x04, 0x40, 0x00]
+        + [0x14, 0xFF, 0xF0, 0x54, 0x60, 0xDD, 0xDD]
+    ),
+    # nop forever
+    bytes(16),
+]
+
+PERIOD = 20
+
+
+def stimulus(engine, cycles: int):
+    hold_reset(engine)
+    yield from range(60)
+    engine.set_component_variable("I:PAD2", "RESET", 0)
+    yield from range(60)
+    for _ in range(cycles):
+        engine.set_component_variable("I:PAD2", "CLOCK", 0)
+        yield from range(PERIOD // 2 + 1)
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        yield from range(PERIOD // 2)
+
+
+def normalize_drivers(drivers: dict[str, list[str]]) -> dict[str, list[str]]:
+    return {name: sorted(names) for name, names in drivers.items()}
+
+
+@pytest.fixture(scope="module")
+def batch():
+    return BatchEngine.load(MODULES_ABS, TABLES_ABS, ROMS)
+
+
+class TestBatchEngine:
+    """Lanes against one event-driven engine per ROM."""
+
+    def test_lanes_match_event_engines(self):
+        batch = BatchEngine.load(MODULES_ABS, TABLES_ABS, ROMS)
+        engines = [loaded_engine(Scheduling.EVENT, rom, reset=False) for rom in ROMS]
+
+        stimuli = [stimulus(engine, 12) for engine in engines]
+        for _ in stimulus(batch, 12):
+            for steps in stimuli:
+                next(steps)
+
+            batch.advance(1)
+            for lane, engine in enumerate(engines):
+                chunk = engine.tick()
+                assert batch.get_network_states(lane) == chunk.network_states
+                assert normalize_drivers(
+                    batch.get_network_drivers(lane)
+                ) == normalize_drivers(chunk.network_drivers)
+                assert batch.get_variables(lane) == chunk.variables
+
+    def test_programs_run_per_lane(self, batch):
+        for _ in stimulus(batch, 0):
+            pass
+
+        batch.settle(200)
+        assert batch.step_cycles(100, 100) == 100
+        assert batch.is_halted() == 0b011
+        assert batch.memories[1]._rw[0] == 0x5A
+        assert batch.memories[1]._stack[0x3F0] == 0x5A
+        assert batch.memories[0]._rw[0] == 0
+
+    def test_variable_set_per_lane(self):
+        batch = BatchEngine.load(MODULES_ABS, TABLES_ABS, ROMS)
+        assert batch.set_component_variable("PC:U4", "Q", 5, lanes=0b010)
+        assert [batch.get_variables(lane)["PC:U4"]["Q"] for lane in range(3)] == [
+            0,
+            5,
+            0,
+        ]
+        assert not batch.set_component_variable("PC:U4", "X", 1)
+        assert not batch.set_component_variable("NOPE", "Q", 1)
+
+    def test_requires_rom(self):
+        with pytest.raises(ValueError):
+            BatchEngine.load(MODULES_ABS, TABLES_ABS, [])
+
+
+class TestLaneNetlist:
+    """Tests for lane resolution and bus transposition."""
+
+    @pytest.fixture
+    def netlist(self) -> LaneNetlist:
+        return LaneNetlist(["A!", "B!", "C!"], ["U1", "U2", "BP"], 4)
+
+    def test_drivers_resolved_per_lane(self, netlist):
+        netlist.drive(0, 0, 0b0011, 0b0001)
+        netlist.drive(0, 1, 0b0110, 0b0110)
+        netlist.resolve(0)
+        netlist.commit({0})
+        assert [netlist.get_state(0, lane) for lane in range(4)] == [2, 3, 2, 0]
+        assert netlist.get_drivers(0, 1) == [0, 1]
+
+    def test_first_value_wins(self, netlist):
+        netlist.drive(0, 0, 0b0001, 0b0000)
+        netlist.drive(0, 0, 0b0011, 0b0011)
+        netlist.resolve(0)
+        netlist.commit({0})
+        assert netlist.high[0] == 0b0010
+
+    def test_gather_scatter_roundtrip(self, netlist):
+        netlist.high[:3] = [0b1010, 0b0110, 0b0001]
+        values = netlist.gather([0, 1, 2])
+        assert values == [4, 3, 2, 1]
+        assert netlist.scatter(values, 3) == [0b1010, 0b0110, 0b0001]
@@ -0,0 +1,103 @@
+"""
+Tests for the benchmark runner and its regression check.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.runner import (
+    append_history,
+    compare,
+    find_baseline,
+    load_history,
+    run_workload,
+)
+from benchmarks.workloads import DIAG, Workload, get_workloads
+from simulator.simulation import Scheduling
+
+
+def make_run(
+    scheduling: str = "EVENT", peak_rss_kb: int | None = 1000, **results
+) -> dict:
+    metrics = {
+        "load_seconds": 1.0,
+        "ticks_per_second": 1000.0,
+        "cycles_per_second": 10.0,
+        "instructions_per_second": 2.0,
+    }
+    metrics.update(results)
+    return {
+        "time": "2026-01-01T00:00:00+00:00",
+        "label": "",
+        "scheduling": scheduling,
+        "period": 800,
+        "peak_rss_kb": peak_rss_kb,
+        "results": {"diag": metrics},
+    }
+
+
+class TestCompare:
+    """Regressions beyond the threshold, in the direction that is worse."""
+
+    def test_slower_throughput(self):
+        (regression,) = compare(make_run(), make_run(ticks_per_second=900.0), 0.05)
+        assert (regression.workload, regression.metric) == ("diag", "ticks_per_second")
+        assert regression.change == pytest.approx(0.1)
+        assert "+10.0% worse" in regression.line()
+
+    def test_longer_load_and_more_memory(self):
+        regressions = compare(
+            make_run(), make_run(load_seconds=1.2, peak_rss_kb=2000), 0.05
+        )
+        assert [(r.workload, r.metric) for r in regressions] == [
+            ("diag", "load_seconds"),
+            ("run", "peak_rss_kb"),
+        ]
+
+    def test_improvement_and_noise(self):
+        current = make_run(ticks_per_second=2000.0, load_seconds=1.04)
+        assert compare(make_run(), current, 0.05) == []
+
+    def test_missing_metric_skipped(self):
+        assert compare(make_run(), make_run(peak_rss_kb=None), 0.05) == []
+
+
+def test_baseline_matches_scheduling(tmp_path):
+    path = str(tmp_path / "history.json")
+    assert load_history(path) == []
+
+    event = make_run("EVENT")
+    append_history(path, event)
+    append_history(path, make_run("SWEEP"))
+    history = load_history(path)
+    assert len(history) == 2
+    assert find_baseline(history, make_run("EVENT")) == event
+    assert find_baseline(history, make_run("DELTA")) is None
+
+
+def test_history_directory_created(tmp_path):
+    path = str(tmp_path / "benchmarks" / "history.json")
+    append_history(path, make_run())
+    assert load_history(path) == [make_run()]
+
+
+def test_examples_found(tmp_path):
+    (tmp_path / "mul").mkdir()
+    (tmp_path / "mul" / "main.bin").write_bytes(b"\xdd")
+    names = [workload.name for workload in get_workloads(tmp_path)]
+    assert names == ["power-on", "nop-loop", "diag", "example:mul/main"]
+
+
+def test_run_workload(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    results = run_workload(Workload("diag", DIAG, 100), Scheduling.EVENT, 100)
+    # Runs until the halt of the program
+    assert 0 < results["cycles"] < 100
+    assert 0 < results["instructions"] < results["cycles"]
+    assert results["ticks_per_second"] > 0
+    # Process wide, only recorded for the whole run
+    assert "peak_rss_kb" not in results
@@ -0,0 +1,93 @@
+"""
+Tests for the compiled backend.
+
+Generated code must produce exactly the same waveform as the components'
+own propagate() methods.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.engine.compiler import design_hash, load_module
+from simulator.engine.entities.base import Network
+from simulator.engine.entities.ics.ic74xx import IC7400
+from simulator.engine.loader import load
+from simulator.engine.netlist import Netlist
+from simulator.simulation import Backend, Scheduling
+from tests.conftest import MODULES_ABS, TABLES_ABS, hold_reset, loaded_engine
+
+
+def run_engine(scheduling: Scheduling, backend: Backend, cycles: int = 6):
+    engine = hold_reset(loaded_engine(scheduling, reset=False, backend=backend))
+    chunks = []
+
+    for _ in range(60):
+        chunks.append(engine.tick())
+
+    engine.set_component_variable("I:PAD2", "RESET", 0)
+    for _ in range(60):
+        chunks.append(engine.tick())
+
+    for _ in range(cycles):
+        for clock in (0, 1):
+            engine.set_component_variable("I:PAD2", "CLOCK", clock)
+            for _ in range(11):
+                chunks.append(engine.tick())
+
+    return chunks
+
+
+class TestCompiledBackend:
+    """Compiled backend against the interpreted one."""
+
+    @pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+    def test_same_waveform(self, scheduling):
+        expected = run_engine(scheduling, Backend.INTERPRETED)
+        actual = run_engine(scheduling, Backend.COMPILED)
+        assert len(actual) == len(expected)
+        for chunk, reference in zip(actual, expected):
+            assert chunk.network_states == reference.network_states, chunk.tick
+            assert chunk.network_drivers == reference.network_drivers, chunk.tick
+            assert chunk.variables == reference.variables, chunk.tick
+
+    def test_gate_inlined(self):
+        netlist = Netlist(["A!", "B!", "Y!"], ["U1", "BP"])
+        networks = [Network("A"), Network("B"), Network("Y")]
+        for slot, network in enumerate(networks):
+            network.bind(netlist, slot)
+
+        pins = dict(zip((IC7400.A1, IC7400.B1, IC7400.Y1), networks))
+        gate = IC7400("U1", pins)
+        gate.bind(netlist, 0)
+        assert "    drive(2, 0, not (s[1] == 2 and s[0] == 2))" in gate.generate()
+
+
+@pytest.fixture(scope="module")
+def cpu():
+    return load(MODULES_ABS, TABLES_ABS)
+
+
+class TestDesignCache:
+    """Generated modules are cached on disk per design."""
+
+    def test_module_written_once(self, cpu, tmp_path):
+        load_module(cpu, str(tmp_path))
+        (path,) = tmp_path.glob("design_*.py")
+        assert path.stem == f"design_{design_hash(cpu)}"
+
+        path.write_text(path.read_text() + "CACHED = True\n")
+        assert load_module(cpu, str(tmp_path)).CACHED
+        assert len(list(tmp_path.glob("design_*.py"))) == 1
+
+    def test_hash_follows_wiring(self, cpu):
+        other = load(MODULES_ABS, TABLES_ABS)
+        assert design_hash(other) == design_hash(cpu)
+
+        component = other.components["ALU:U9"]
+        pin = next(iter(component.pins))
+        component.pins[pin] = other.networks["I:/Pulse!"]
+        assert design_hash(other) != design_hash(cpu)
@@ -95,6 +95,11 @@ class TestDebuggerCLIAliases:
         result = mock_cli.precmd("c")
         assert result == "continue"
 
+    def test_alias_ff_to_fastforward(self, mock_cli):
+        """Test 'ff' is aliased to 'fastforward'."""
+        result = mock_cli.precmd("ff 100")
+        assert result == "fastforward 100"
+
     def test_alias_r_to_run(self, mock_cli):
         """Test 'r' is aliased to 'run'."""
         result = mock_cli.precmd("r")
@@ -779,3 +784,76 @@ class TestDebuggerCLIEmptyLine:
         mock_cli.lastcmd = ""
         result = mock_cli.emptyline()
         assert result is False
+
+
+class TestDebuggerCLIProfileCommand:
+    """Tests for profile command."""
+
+    @pytest.fixture
+    def mock_cli(self, tmp_path):
+        """Create a DebuggerCLI with mocked dependencies."""
+        with patch("debugger.DebuggerCore") as MockCore:
+            mock_core = MagicMock()
+            mock_core.get_profile.return_value = None
+            MockCore.return_value = mock_core
+
+            from debugger import DebuggerCLI
+
+            temp_rom = tmp_path / "rom.bin"
+            temp_rom.write_bytes(bytes([0x00] * 256))
+            cli = DebuggerCLI(str(temp_rom))
+            cli.debugger = mock_core
+            yield cli
+
+    def test_profile_start_stop(self, mock_cli, capsys):
+        """Test profile start and stop reach the core."""
+        mock_cli.do_profile("start")
+        mock_cli.do_profile("stop")
+        mock_cli.debugger.start_profiling.assert_called_once()
+        mock_cli.debugger.stop_profiling.assert_called_once()
+        captured = capsys.readouterr()
+        assert "Profiling started" in captured.out
+        assert "Profiling stopped" in captured.out
+
+    def test_profile_stop_when_not_profiling(self, mock_cli, capsys):
+        """Test profile stop is rejected while profiling is off."""
+        mock_cli.debugger.stop_profiling.return_value = None
+        mock_cli.do_profile("stop")
+        captured = capsys.readouterr()
+        assert "Profiling is not active" in captured.out
+        assert "Profiling stopped" not in captured.out
+
+    def test_profile_report(self, mock_cli, capsys):
+        """Test profile report prints the report lines."""
+        from simulator.engine.profiler import ProfileReport
+
+        report = ProfileReport(
+            total=0.5,
+            components={"ALU:U4": (10, 0.25)},
+            classes={"IC74181": (10, 0.25)},
+            phases={"networks": (5, 0.1)},
+        )
+        mock_cli.debugger.get_profile.return_value = report
+        mock_cli.do_profile("report 5")
+        captured = capsys.readouterr()
+        assert "IC74181" in captured.out
+        assert "50.0%" in captured.out
+
+    def test_profile_dump(self, mock_cli, tmp_path, capsys):
+        """Test profile dump writes JSON."""
+        report = MagicMock()
+        mock_cli.debugger.get_profile.return_value = report
+        mock_cli.do_profile(f"dump {tmp_path / 'profile.json'}")
+        report.dump.assert_called_once_with(str(tmp_path / "profile.json"))
+
+    def test_profile_without_profile(self, mock_cli, capsys):
+        """Test report before profiling started."""
+        mock_cli.do_profile("report")
+        captured = capsys.readouterr()
+        assert "profile start" in captured.out
+
+    def test_profile_no_argument(self, mock_cli, capsys):
+        """Test profile without arguments shows usage."""
+        mock_cli.do_profile("")
+        captured = capsys.readouterr()
+        assert "Usage" in captured.out
@@ -227,3 +227,59 @@ class TestReadNetworksAsInt:
         networks = ["NET1!", "NET0!"]
         result = mock_core.read_networks_as_int(networks)
         assert result == 2
+
+
+class TestFastForward:
+    """Tests for running in the microcode emulator before the gate level."""
+
+    # ldi-sp 0xFF00; ldi-z 0x4000; ldi-ac 0x21; stx-ac; hlt
+    ROM = bytes([0x14, 0xFF, 0x00, 0x13, 0x40, 0x00, 0x03, 0x21, 0x22, 0xDD])
+
+    @pytest.fixture
+    def core(self, tmp_path, monkeypatch):
+        """Create a DebuggerCore on the real design."""
+        from debug.base import DebuggerCore
+
+        monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        rom_path = tmp_path / "rom.bin"
+        rom_path.write_bytes(self.ROM)
+        core = DebuggerCore(str(rom_path), snapshot_path=None, design_path=None)
+        core.set_period(100)
+        return core
+
+    def test_stops_before_breakpoint(self, core):
+        """Test the instruction at the breakpoint runs at gate level."""
+        core.breakpoints.add(0x0008)
+        bp = core.fast_forward(1000)
+        assert bp is not None and bp.address == 0x0008
+        assert (core.state.xl, core.state.zh, core.state.sp) == (0x21, 0x40, 0xFF00)
+        assert core.engine.motherboard.read(0x4000) == 0
+
+        while not core.state.halted:
+            core.step_instruction()
+        assert core.engine.motherboard.read(0x4000) == 0x21
+
+    def test_same_as_gate_level(self, core, tmp_path):
+        """Test fast forwarding to the halt matches a gate level run."""
+        from debug.base import DebuggerCore
+
+        assert core.fast_forward(1000) is None
+        assert core.state.halted
+
+        reference = DebuggerCore(core.rom_path, snapshot_path=None, design_path=None)
+        reference.set_period(100)
+        reference.initialize()
+        while not reference.state.halted:
+            reference.step_instruction()
+
+        assert core.state.cycle == reference.state.cycle
+        assert core.state == reference.state
+        assert core.engine.motherboard.read(0x4000) == 0x21
+
+    def test_picks_up_gate_level_changes(self, core):
+        """Test changes made at gate level carry over to the emulator."""
+        core.breakpoints.add(0x0008)
+        core.fast_forward(1000)
+        core.set_variable("REG:XL1", "Q", 0x55)
+        core.fast_forward(1000)
+        assert core.engine.motherboard.read(0x4000) == 0x55
@@ -0,0 +1,103 @@
+"""
+Tests for the cache of resolved designs of the loader.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.engine import loader
+from simulator.engine.loader import design_key, load
+from simulator.simulation import Scheduling, SimulationEngine
+from tests.conftest import MODULES_ABS, TABLES_ABS, loaded_engine
+
+# ldi-sp 0xFF00; ldi-z 0x4000; ldi-ac 0x21; stx-ac; hlt
+STORE_ROM = bytes.fromhex("14ff001340000321" + "22dd")
+
+
+def run_engine(design_path: str | None) -> tuple[list, SimulationEngine]:
+    engine = loaded_engine(Scheduling.EVENT, STORE_ROM, design_path=design_path)
+    return engine.step_cycles(30, 100), engine
+
+
+def test_same_waveform(tmp_path):
+    expected, _ = run_engine(None)
+    for _ in range(2):
+        chunks, engine = run_engine(str(tmp_path))
+        assert [chunk.network_states for chunk in chunks] == [
+            chunk.network_states for chunk in expected
+        ]
+        assert [chunk.variables for chunk in chunks] == [
+            chunk.variables for chunk in expected
+        ]
+        assert engine.motherboard.read(0x4000) == 0x21
+
+    assert len(list(tmp_path.glob("design_*.pkl"))) == 1
+
+
+def test_corrupt_file_rebuilt(tmp_path):
+    run_engine(str(tmp_path))
+    (path,) = tmp_path.glob("design_*.pkl")
+    path.write_bytes(b"\x80")
+
+    with pytest.warns(UserWarning, match="Ignoring cached design"):
+        chunks, engine = run_engine(str(tmp_path))
+    assert engine.is_halted()
+    assert path.stat().st_size > 1
+
+
+def test_other_errors_not_hidden(tmp_path, monkeypatch):
+    run_engine(str(tmp_path))
+
+    def broken(data: bytes):
+        raise TypeError("broken __setstate__")
+
+    monkeypatch.setattr(loader.pickle, "loads", broken)
+    with pytest.raises(TypeError, match="broken"):
+        run_engine(str(tmp_path))
+
+
+def test_key_follows_inputs():
+    key = design_key(MODULES_ABS, True)
+    assert design_key(MODULES_ABS, False) != key
+
+    renamed = [(path, f"{name}2") for path, name in MODULES_ABS]
+    assert design_key(renamed, True) != key
+
+
+def test_tables_not_cached(tmp_path):
+    tables = tmp_path / "tables"
+    tables.mkdir()
+    for i in range(8):
+        shutil.copy(Path(TABLES_ABS) / f"table{i}.bin", tables)
+
+    data = bytearray((tables / "table3.bin").read_bytes())
+    data[0] ^= 1
+    (tables / "table3.bin").write_bytes(data)
+
+    cache = str(tmp_path / "designs")
+    load(MODULES_ABS, TABLES_ABS, cache_path=cache)
+    cpu = load(MODULES_ABS, str(tables), cache_path=cache)
+    bank = cpu.components[cpu.optimization.fused[1]]
+    assert bank.chips[2].name == "C3:TABLE4"
+    assert bank.chips[2].memory == data
+    assert bank.read(0)[2] == data[0]
+
+
+def test_tables_mapped_until_written():
+    cpu = load(MODULES_ABS, TABLES_ABS, False)
+    table = cpu.components["C3:TABLE1"]
+    mapped = table.memory
+    assert isinstance(mapped, memoryview) and mapped.readonly
+
+    first = mapped[0]
+    table.load_data(bytes([first ^ 0xFF]))
+    assert isinstance(table.memory, bytearray)
+    assert table.memory[0] == first ^ 0xFF
+    assert table.memory[1:] == mapped[1:]
+    assert mapped[0] == first
@@ -0,0 +1,167 @@
+"""
+Tests for the microcode emulator against the gate level simulation.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.emulator import (
+    FLAGS,
+    NOT_CARRY,
+    SIGN,
+    ZERO,
+    MicrocodeEmulator,
+    alu,
+    alu_flags,
+    decode,
+)
+from simulator.simulation import Backend, Scheduling, SimulationEngine
+from tests.conftest import TABLES_ABS, TEST_ROM, loaded_engine
+
+# ldi-sp 0xFF00; ldi-z 0x4000; ldi-ac 0x21; shl; shr; ldi-xh 0x7F; add-xh;
+# push-ac; sbb-xh; stx-ac; st [0x4100] ac; ld yh [0x4100]; call 0x001D;
+# pop-zl; hlt; ldi-ac 0xF8; nop x 11; inc-ac; jnc 0x0028; ret
+FEATURE_ROM = bytes.fromhex(
+    "14ff001340000321dbdc057f8654b0221a41000a41007d001b64dd03f8"
+    + "00" * 11
+    + "b66d002884"
+)
+
+# Components holding the registers, nibble counters from low to high
+COUNTERS = {
+    "PC": ["PC:U4", "PC:U5", "PC:U2", "PC:U3"],
+    "SP": ["SP:U4", "SP:U5", "SP:U2", "SP:U3"],
+    "ADDR": ["I:U8", "I:U7", "I:U6", "I:U5"],
+}
+REGISTERS = {
+    "IR": "C1:INSTRUCTION1",
+    "AC": "REG:XL1",
+    "XH": "REG:XH1",
+    "YL": "REG:YL1",
+    "YH": "REG:YH1",
+    "ZL": "REG:ZL1",
+    "ZH": "REG:ZH1",
+    "ARGH": "ALU:U1",
+    "ARGL": "ALU:U6",
+    "FR": "C2:U2",
+}
+
+
+def engine_registers(engine: SimulationEngine) -> dict[str, int]:
+    components = engine.cpu.components
+    registers = {
+        name: components[component].get_variables()["Q"]
+        for name, component in REGISTERS.items()
+    }
+    for name, nibbles in COUNTERS.items():
+        registers[name] = sum(
+            components[component].get_variables()["Q"] << 4 * i
+            for i, component in enumerate(nibbles)
+        )
+
+    return registers
+
+
+def emulator_registers(emulator: MicrocodeEmulator) -> dict[str, int]:
+    registers = {
+        name: value
+        for name, value in emulator.get_registers().items()
+        if name in REGISTERS
+    }
+    registers["PC"] = emulator.program_counter
+    registers["SP"] = emulator.stack_pointer
+    registers["ADDR"] = emulator.address
+    return registers
+
+
+def run_engine(
+    rom: bytes, scheduling: Scheduling, backend: Backend = Backend.INTERPRETED
+) -> tuple[SimulationEngine, int, int]:
+    engine = loaded_engine(scheduling, rom, backend=backend)
+    reset_flags = engine_registers(engine)["FR"]
+    cycles = len(engine.step_cycles(1000, 100))
+    return engine, cycles, reset_flags
+
+
+def make_emulator(rom: bytes, flags: int = 0) -> MicrocodeEmulator:
+    # Registers other than the counters keep their power up value on reset,
+    # flags select the microcode so they start like on the engine
+    emulator = MicrocodeEmulator.load(TABLES_ABS, rom)
+    emulator.reset()
+    emulator.registers[FLAGS] = flags
+    return emulator
+
+
+class TestDecode:
+    """Control words and the ALU as the tables and the board define them."""
+
+    def test_default_word(self):
+        # code(halt=1) of microcode/compiler.py
+        fields = decode((0x30, 0x80, 0x18, 0x03))
+        assert fields[11] == 1
+        assert fields[:11] + fields[12:] == (0,) * 13
+
+    def test_alu_carry_chain(self):
+        # A plus B, the low nibble carries into the high one
+        assert alu(0x0F, 0x01, 9, 0, 0) == (0x10, 0)
+        assert alu(0x0F, 0x01, 9, 0, 1) == (0x11, 0)
+        assert alu(0xFF, 0x01, 9, 0, 0) == (0x00, 1)
+
+    def test_flags(self):
+        assert alu_flags(0x80, 1) == SIGN
+        assert alu_flags(0x01, 0) == NOT_CARRY
+        assert alu_flags(0x05, 1) == ZERO
+        assert alu_flags(0x00, 1) == 0
+
+
+class TestEquivalence:
+    """Programs run to the same state as on the gate level simulation."""
+
+    @pytest.mark.parametrize(
+        "rom, scheduling",
+        [
+            (TEST_ROM, Scheduling.EVENT),
+            (TEST_ROM, Scheduling.DELTA),
+            (FEATURE_ROM, Scheduling.DELTA),
+        ],
+    )
+    def test_same_final_state(self, rom, scheduling, backend):
+        engine, cycles, flags = run_engine(rom, scheduling, backend)
+        emulator = make_emulator(rom, flags)
+        assert emulator.step_cycles(1000) == cycles
+        assert engine.is_halted() and emulator.halted
+        assert emulator_registers(emulator) == engine_registers(engine)
+        assert (
+            emulator.memory.get_internal_state()
+            == engine.motherboard.get_internal_state()
+        )
+
+    def test_feature_program(self):
+        emulator = make_emulator(FEATURE_ROM)
+        emulator.step_cycles(1000)
+        registers = emulator.get_registers()
+        assert emulator.stack_pointer == 0xFF01
+        assert emulator.memory.read(0x4100) == registers["YH"]
+        assert registers["XH"] == 0x7F
+
+
+def test_internal_state():
+    emulator = make_emulator(FEATURE_ROM)
+    emulator.step_cycles(40)
+    state = emulator.get_internal_state()
+    expected = emulator.step_cycles(1000), emulator_registers(emulator)
+
+    emulator.set_internal_state(state)
+    assert (emulator.step_cycles(1000), emulator_registers(emulator)) == expected
+
+
+def test_undriven_writer():
+    # inth asks the interrupt controller for its code, nothing answers
+    emulator = make_emulator(bytes([0x1C]))
+    assert not emulator.halted
+    with pytest.raises(RuntimeError, match="Nothing drives the bus"):
+        emulator.step_cycles(10)
@@ -0,0 +1,249 @@
+"""
+Tests for the capture-free tick path, lazily built waveform chunks and
+clock-cycle stepping.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import PERIOD
+from simulator.simulation import (
+    CycleSample,
+    EventBus,
+    LogLevel,
+    Scheduling,
+    SimulationEngine,
+    State,
+    StopReason,
+    WaveformChunk,
+)
+from tests.conftest import hold_reset, loaded_engine
+
+
+def make_engine(scheduling: Scheduling = Scheduling.SWEEP) -> SimulationEngine:
+    return hold_reset(loaded_engine(scheduling, reset=False))
+
+
+@pytest.fixture(scope="module")
+def engines():
+    return make_engine(), make_engine()
+
+
+class TestAdvance:
+    """advance() must reach the same state as capturing every tick."""
+
+    def test_same_state_after_advance(self, engines):
+        engine, reference = engines
+        engine.advance(119)
+        for _ in range(119):
+            reference.tick()
+
+        actual = engine.tick()
+        expected = reference.tick()
+        assert actual.tick == expected.tick == 119
+        assert actual.network_states == expected.network_states
+        assert actual.network_drivers == expected.network_drivers
+        assert actual.variables == expected.variables
+
+    def test_uncaptured_tick_returns_none(self):
+        engine = make_engine()
+        assert engine.tick(capture=False) is None
+        assert engine.tick().tick == 1
+
+    def test_logs_kept_for_next_captured_chunk(self):
+        engine = make_engine()
+        engine.advance(5)
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        engine.advance(5)
+        messages = [message for _, _, message in engine.tick().logs]
+        assert "Setting clock to HIGH" in messages
+
+
+class TestLogLevels:
+    """Messages are gated per level and source and formatted when read."""
+
+    def test_formatted_on_read(self):
+        engine = make_engine()
+        engine.set_component_variable("PC:U4", "Q", 7)
+        assert (LogLevel.INFO, "PC:U4", "Setting Q to 7 (7)") in engine.tick().logs
+
+    def test_level_disabled(self):
+        engine = make_engine()
+        engine.tick()
+        engine.set_log_level(LogLevel.INFO, False)
+        engine.set_component_variable("PC:U4", "Q", 7)
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        assert {level for level, _, _ in engine.tick().logs} == {LogLevel.WARNING}
+
+    def test_source_disabled(self):
+        engine = make_engine()
+        engine.tick()
+        engine.set_log_level(LogLevel.INFO, False, "I:PAD2")
+        engine.set_component_variable("PC:U4", "Q", 7)
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        logs = [(level, source) for level, source, _ in engine.tick().logs]
+        assert (LogLevel.INFO, "PC:U4") in logs
+        assert (LogLevel.INFO, "I:PAD2") not in logs
+
+    def test_stored_raw(self):
+        bus = EventBus()
+        source, levels = bus.register("U1")
+        bus.emit(2, source, "Value {:02X}", (10,))
+        bus.emit(3, source, "Literal {}", ())
+        events = bus.collect()
+        assert events[0] == (2, source, "Value {:02X}", (10,))
+        assert bus.format(events) == [
+            (LogLevel.WARNING, "U1", "Value 0A"),
+            (LogLevel.ERROR, "U1", "Literal {}"),
+        ]
+        bus.set_level(LogLevel.WARNING, False)
+        assert levels == [True, True, False, True]
+        assert bus.register("U2")[1] == [True, True, False, True]
+
+
+class TestLazyChunk:
+    """Chunks are snapshots even though their views are built lazily."""
+
+    def test_snapshot_survives_later_ticks(self):
+        engine = make_engine()
+        engine.advance(150)
+        engine.set_component_variable("I:PAD2", "RESET", 0)
+        chunk = engine.tick()
+        eager = chunk.materialize()
+        engine.advance(300)
+
+        assert chunk.network_states == eager.network_states
+        assert chunk.network_drivers == eager.network_drivers
+        assert chunk.variables == eager.variables
+
+    def test_variables_frozen_on_next_tick(self):
+        engine = make_engine()
+        engine.advance(10)
+        chunk = engine.tick()
+        engine.set_component_variable("PC:U4", "Q", 7)
+        engine.tick()
+        assert chunk.variables["PC:U4"]["Q"] != 7
+
+    def test_materialize(self):
+        engine = make_engine()
+        chunk = engine.tick().materialize()
+        assert isinstance(chunk, WaveformChunk)
+        assert set(chunk.network_states.values()) <= set(State)
+
+
+def start(engine: SimulationEngine) -> SimulationEngine:
+    engine.advance(100)
+    engine.set_component_variable("I:PAD2", "RESET", 0)
+    engine.advance(100)
+    return engine
+
+
+def manual_cycle(engine: SimulationEngine, period: int):
+    engine.set_component_variable("I:PAD2", "CLOCK", 0)
+    engine.advance(period // 2)
+    edge = engine.tick()
+    engine.set_component_variable("I:PAD2", "CLOCK", 1)
+    engine.advance(period // 2 - 1)
+    return edge, engine.tick()
+
+
+class TestCycleStepping:
+    """step_cycles() and run_until() own the clock on I:PAD2."""
+
+    PERIOD = 100
+
+    def test_matches_manual_clocking(self):
+        engine = start(make_engine(Scheduling.EVENT))
+        reference = start(make_engine(Scheduling.EVENT))
+
+        for _ in range(3):
+            edge, _ = manual_cycle(reference, self.PERIOD)
+            (actual_edge,) = engine.step_cycles(1, self.PERIOD, CycleSample.RISING_EDGE)
+            assert actual_edge.tick == edge.tick
+            assert actual_edge.network_states == edge.network_states
+
+            (actual_end,) = engine.step_cycles(1, self.PERIOD)
+            _, end = manual_cycle(reference, self.PERIOD)
+            assert actual_end.tick == end.tick
+            assert actual_end.network_states == end.network_states
+            assert actual_end.variables == end.variables
+
+    def test_no_sampling(self):
+        engine = start(make_engine(Scheduling.EVENT))
+        assert engine.step_cycles(2, self.PERIOD, None) == []
+        assert engine.tick().tick == 200 + 2 * (self.PERIOD + 1)
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            make_engine().step_cycles(1, 1)
+
+    def test_run_until_predicate(self):
+        engine = start(make_engine(Scheduling.EVENT))
+        result = engine.run_until(
+            lambda chunk: chunk.variables["PC:U4"]["Q"] >= 2, 50, self.PERIOD
+        )
+        assert result.reason == StopReason.PREDICATE
+        assert result.chunk.variables["PC:U4"]["Q"] >= 2
+        assert 0 < result.cycles < 50
+
+    def test_run_until_halt(self):
+        engine = start(make_engine(Scheduling.EVENT))
+        result = engine.run_until(lambda chunk: False, 100, self.PERIOD)
+        assert result.reason == StopReason.HALT
+        assert engine.is_halted()
+        assert len(engine.step_cycles(5, self.PERIOD)) == 1
+        assert len(engine.step_cycles(5, self.PERIOD, stop_on_halt=False)) == 5
+
+    def test_run_until_limit(self):
+        engine = start(make_engine(Scheduling.EVENT))
+        result = engine.run_until(lambda chunk: False, 3, self.PERIOD)
+        assert result.reason == StopReason.LIMIT
+        assert result.cycles == 3
+        assert not engine.is_halted()
+
+
+class TestQuiescence:
+    """Settled states are fast-forwarded without changing the tick counter."""
+
+    @pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+    def test_settles_after_reset(self, scheduling):
+        engine = make_engine(scheduling)
+        ticks = engine.settle(1000)
+        assert 0 < ticks < 1000
+        assert engine.cpu.is_settled()
+        assert engine.settle(1000) == 0
+
+    @pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+    def test_settled_ticks_keep_counting(self, scheduling):
+        engine = make_engine(scheduling)
+        ticks = engine.settle(1000)
+        before = engine.tick()
+        engine.advance(500)
+        after = engine.tick()
+        assert after.tick == ticks + 501
+        assert after.network_states == before.network_states
+        assert after.variables == before.variables
+
+    @pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+    def test_stimulus_wakes_engine(self, scheduling):
+        engine = make_engine(scheduling)
+        engine.settle(1000)
+        engine.set_component_variable("I:PAD2", "RESET", 0)
+        assert not engine.cpu.is_settled()
+        engine.settle(1000)
+        engine.set_power(False)
+        assert not engine.cpu.is_settled()
+
+    def test_fast_forward_matches_between_schedulers(self):
+        sweep = start(make_engine(Scheduling.SWEEP))
+        event = start(make_engine(Scheduling.EVENT))
+        for expected, actual in zip(
+            sweep.step_cycles(3, PERIOD), event.step_cycles(3, PERIOD)
+        ):
+            assert actual.tick == expected.tick
+            assert actual.network_states == expected.network_states
+            assert actual.variables == expected.variables
@@ -0,0 +1,60 @@
+"""
+Tests for the lockstep run of the gate level simulation and the microcode
+emulator.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INIT_TICKS, STARTUP_TICKS
+from simulator.emulator import XH
+from simulator.lockstep import LockstepRunner
+from simulator.simulation import Scheduling
+from tests.conftest import MODULES_ABS, TABLES_ABS, TEST_ROM
+
+# ldi-sp 0xFF00; ldi-z 0x4000; ldi-ac 0x21; stx-ac; hlt
+STORE_ROM = bytes.fromhex("14ff001340000321" + "22dd")
+
+
+def make_runner(
+    rom: bytes, scheduling: Scheduling = Scheduling.DELTA, history: int = 16
+) -> LockstepRunner:
+    runner = LockstepRunner.load(MODULES_ABS, TABLES_ABS, rom, scheduling, history)
+    runner.reset(INIT_TICKS, STARTUP_TICKS)
+    return runner
+
+
+@pytest.mark.parametrize(
+    "scheduling", [Scheduling.EVENT, Scheduling.DELTA, Scheduling.TIMED]
+)
+def test_no_divergence(scheduling):
+    runner = make_runner(TEST_ROM, scheduling)
+    assert runner.run(100, 100) is None
+    assert runner.engine.is_halted() and runner.model.halted
+
+
+def test_memory_writes_recorded():
+    runner = make_runner(STORE_ROM)
+    assert runner.run(100, 100) is None
+    assert runner.engine.motherboard.read(0x4000) == 0x21
+    (record,) = [record for record in runner.history if record.writes]
+    assert record.writes == ((0x4000, 0x21),)
+    assert record.line().endswith(" WRITES=[4000<-21]")
+
+
+def test_first_divergence_with_history():
+    runner = make_runner(TEST_ROM, history=4)
+    runner.run(5, 100)
+    runner.model.registers[XH] ^= 0x80
+    divergence = runner.run(100, 100)
+    assert divergence.cycle == 6
+    assert divergence.differences == {"XH": (0, 0x80)}
+    assert [record.cycle for record in divergence.history] == [2, 3, 4, 5]
+
+    lines = divergence.lines()
+    assert lines[:2] == ["Divergence at cycle 6", "  XH: engine 00 model 80"]
+    assert len(lines) == 7
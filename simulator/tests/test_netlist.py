@@ -0,0 +1,232 @@
+"""
+Tests for the compiled netlist and the Network view over it.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.engine.entities.base import Network, NetworkState
+from simulator.engine.entities.busconnector import Backplane, BusConnector
+from simulator.engine.entities.ics.ic74xx import IC7400
+from simulator.engine.loader import compile_netlist
+from simulator.engine.netlist import (
+    CONFLICT,
+    FLOATING,
+    HIGH,
+    LOW,
+    Netlist,
+    get_sources,
+)
+
+
+@pytest.fixture
+def netlist() -> Netlist:
+    return Netlist(["A!", "B!"], ["U1", "U2", "BP"])
+
+
+@pytest.fixture
+def network(netlist) -> Network:
+    network = Network("A")
+    network.bind(netlist, 0)
+    return network
+
+
+class TestNetlistDrive:
+    """Tests for driving slots and swapping tick state."""
+
+    def test_initially_floating(self, netlist):
+        assert netlist.state[: netlist.size] == bytearray([FLOATING, FLOATING])
+        assert netlist.get_drivers(0) == []
+
+    def test_single_driver(self, netlist):
+        netlist.drive(0, 1, True)
+        netlist.swap()
+        assert netlist.state[0] == HIGH
+        assert netlist.get_drivers(0) == [1]
+
+    def test_next_state_cleared_after_swap(self, netlist):
+        netlist.drive(0, 1, False)
+        netlist.swap()
+        assert netlist.state[0] == LOW
+        netlist.swap()
+        assert netlist.state[0] == FLOATING
+        assert netlist.get_drivers(0) == []
+
+    def test_same_driver_first_value_wins(self, netlist):
+        netlist.drive(0, 0, True)
+        netlist.drive(0, 0, False)
+        netlist.swap()
+        assert netlist.state[0] == HIGH
+        assert netlist.get_drivers(0) == [0]
+
+    def test_two_drivers_conflict(self, netlist):
+        netlist.drive(0, 0, True)
+        netlist.drive(0, 1, True)
+        netlist.drive(0, 1, False)
+        netlist.swap()
+        assert netlist.state[0] == CONFLICT
+        assert netlist.get_drivers(0) == [0, 1]
+
+    def test_commit_reports_changed_slots(self, netlist):
+        netlist.drive(0, 0, True)
+        netlist.drive(1, 0, False)
+        assert netlist.commit({0, 1}) in ([0, 1], [1, 0])
+        netlist.drive(0, 0, True)
+        netlist.drive(1, 0, True)
+        assert netlist.commit({0, 1}) == [1]
+
+    def test_swap_reports_change(self, netlist):
+        netlist.drive(0, 0, True)
+        assert netlist.swap()
+        netlist.drive(0, 0, True)
+        assert not netlist.swap()
+        netlist.drive(0, 1, True)
+        assert netlist.swap()
+        assert netlist.swap()
+        assert not netlist.swap()
+
+    def test_sink_is_never_driven(self, netlist):
+        netlist.drive(netlist.sink, 0, True)
+        netlist.swap()
+        assert netlist.state[netlist.sink] == FLOATING
+
+    def test_state_updated_in_place(self, netlist):
+        state = netlist.state
+        netlist.drive(0, 1, True)
+        netlist.swap()
+        assert state[0] == HIGH
+
+
+class TestNetlistHolding:
+    """Tests for held drivers used by event-driven scheduling."""
+
+    def test_held_driver_survives_commit(self, netlist):
+        netlist.set_holding(True)
+        netlist.drive(0, 1, True)
+        netlist.resolve(0)
+        netlist.commit({0})
+        netlist.resolve(0)
+        netlist.commit({0})
+        assert netlist.state[0] == HIGH
+
+    def test_release_floats_network(self, netlist):
+        netlist.set_holding(True)
+        netlist.drive(0, 1, True)
+        netlist.release(1, {0})
+        netlist.resolve(0)
+        netlist.commit({0})
+        assert netlist.state[0] == FLOATING
+
+    def test_conflict_drivers_sorted_by_id(self, netlist):
+        netlist.set_holding(True)
+        netlist.drive(0, 2, True)
+        netlist.drive(0, 0, False)
+        netlist.resolve(0)
+        netlist.commit({0})
+        assert netlist.state[0] == CONFLICT
+        assert netlist.get_drivers(0) == [0, 2]
+
+    def test_conflict_cleared_when_released(self, netlist):
+        netlist.set_holding(True)
+        netlist.drive(0, 2, True)
+        netlist.drive(0, 1, True)
+        netlist.resolve(0)
+        netlist.commit({0})
+        netlist.release(1, {0})
+        netlist.resolve(0)
+        assert netlist.commit({0}) == [0]
+        assert netlist.state[0] == HIGH
+        assert netlist.get_drivers(0) == [2]
+        assert netlist.extra == {}
+
+    def test_get_sources(self):
+        assert get_sources(0) == []
+        assert get_sources(0b10110) == [1, 2, 4]
+
+
+class TestNetworkView:
+    """Tests for the Network API on top of the netlist."""
+
+    def test_set_by_component_name(self, netlist, network):
+        network.set("U2", True)
+        assert network.new_state == NetworkState.DRIVEN_HIGH
+        assert network.new_drivers == ["U2"]
+
+    def test_propagate_commits_single_slot(self, netlist, network):
+        network.set("U1", False)
+        netlist.drive(1, 0, True)
+        network.propagate()
+        assert network.state == NetworkState.DRIVEN_LOW
+        assert network.drivers == ["U1"]
+        assert not network.get()
+        assert netlist.state[1] == FLOATING
+
+    def test_is_floating(self, network):
+        assert network.is_floating()
+
+
+class TestComponentBinding:
+    """Tests for resolving pin constants into netlist slots."""
+
+    @pytest.fixture
+    def gate(self, netlist, network) -> IC7400:
+        gate = IC7400("U1", {IC7400.A1: network})
+        gate.bind(netlist, 0)
+        return gate
+
+    def test_connected_pin_resolved_to_slot(self, gate, network):
+        assert gate.A1 == network.slot
+        assert IC7400.A1 == "1"
+
+    def test_unconnected_pin_resolved_to_sink(self, gate, netlist):
+        assert gate.B1 == netlist.sink
+        assert not gate.get(gate.B1)
+        assert gate.is_floating(gate.B1)
+
+    def test_set_and_get_through_slot(self, gate, netlist):
+        gate.set(gate.A1, True)
+        gate.set(gate.Y1, True)
+        netlist.swap()
+        assert gate.get(gate.A1)
+        assert not gate.get(gate.Y1)
+
+    def test_pin_aliases_use_pin_numbers(self, gate):
+        assert ("1", "A1") in gate.get_pin_aliases()
+
+
+class TestBackplaneMerge:
+    """Tests for joining networks that share a backplane pin."""
+
+    @pytest.fixture
+    def netlist(self) -> Netlist:
+        backplane = Backplane("BP")
+        networks = {
+            name: Network(name) for name in ("A:DATA", "A:VCC", "B:DATA", "B:X")
+        }
+        components = {
+            "A:X1": BusConnector(
+                "A:X1", {"A7": networks["A:DATA"], "A1": networks["A:VCC"]}
+            ),
+            "B:X1": BusConnector("B:X1", {"A7": networks["B:DATA"]}),
+        }
+        for connector in components.values():
+            connector.set_backplane(backplane)
+
+        netlist = compile_netlist(components, networks, backplane)
+        backplane.power_on()
+        backplane.propagate()
+        netlist.swap()
+        return netlist
+
+    def test_shared_pin_shares_slot(self, netlist):
+        assert netlist.names == ["A:DATA", "A:VCC", "B:DATA", "B:X"]
+        assert netlist.slots == [0, 1, 0, 2]
+        assert netlist.size == 3
+
+    def test_power_driven_once(self, netlist):
+        assert netlist.state[1] == HIGH
+        assert netlist.get_drivers(1) == [2]
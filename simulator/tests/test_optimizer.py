@@ -0,0 +1,157 @@
+"""
+Tests for the optimizer passes run by the loader.
+
+Optimized designs must produce exactly the same waveform as the plain ones.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INIT_TICKS, STARTUP_TICKS
+from simulator.engine.compiler import design_hash
+from simulator.engine.entities.base import Network
+from simulator.engine.entities.ics.ic28c256 import IC28C256, IC28C256Bank
+from simulator.engine.entities.ics.ic74245 import IC74245
+from simulator.engine.entities.ics.ic74xx import IC7400, IC7402
+from simulator.engine.loader import load
+from simulator.engine.netlist import Netlist
+from simulator.simulation import Scheduling
+from tests.conftest import MODULES_ABS, TABLES_ABS, hold_reset, loaded_engine
+
+
+def normalize_drivers(chunk) -> dict[str, list[str]]:
+    return {network: sorted(names) for network, names in chunk.network_drivers.items()}
+
+
+def run_engine(scheduling: Scheduling, optimize: bool, cycles: int = 4):
+    engine = hold_reset(loaded_engine(scheduling, reset=False, optimize=optimize))
+    chunks = [engine.tick() for _ in range(100)]
+    engine.set_component_variable("I:PAD2", "RESET", 0)
+    chunks.extend(engine.tick() for _ in range(100))
+    for _ in range(cycles):
+        for clock in (0, 1):
+            engine.set_component_variable("I:PAD2", "CLOCK", clock)
+            chunks.extend(engine.tick() for _ in range(50))
+
+    return chunks
+
+
+@pytest.fixture(scope="module")
+def cpu():
+    return load(MODULES_ABS, TABLES_ABS)
+
+
+class TestReport:
+    """The loader reports what every pass changed."""
+
+    def test_rail_inputs_folded(self, cpu):
+        assert "ALU:U8.DIR" in cpu.optimization.folded
+        assert "ALU:U3.A4" in cpu.optimization.folded
+
+    def test_unconnected_outputs_pruned(self, cpu):
+        assert {"ALU:U5.P", "ALU:U5.G"} <= set(cpu.optimization.pruned)
+        assert cpu.netlist.sink in cpu.components["ALU:U5"].dead
+        assert cpu.optimization.lines()[1] == (
+            f"Skipped {len(cpu.optimization.pruned)} unconnected outputs"
+            " (compiled backend)"
+        )
+
+    def test_transceivers_fixed(self, cpu):
+        assert "ALU:U8 B to A" in cpu.optimization.direct
+        assert cpu.optimization.lines()[2] == (
+            f"Fixed {len(cpu.optimization.direct)} transceivers"
+        )
+
+    def test_skipped(self):
+        assert load(MODULES_ABS, TABLES_ABS, False).optimization is None
+
+
+class TestPinUsage:
+    """Fanout and driven slots follow the pins a model reads and drives."""
+
+    def test_outputs_do_not_wake_driver(self, cpu):
+        gate = cpu.components["ALU:U3"]
+        for pin in (IC7402.Y1, IC7402.Y2):
+            assert gate not in cpu.fanout[gate.pins[pin].slot]
+
+    def test_bus_connectors_are_passive(self, cpu):
+        connector = cpu.components["ALU:BC1"]
+        assert cpu._component_slots[connector] == set()
+        assert not any(connector in readers for readers in cpu.fanout)
+
+    def test_fixed_transceiver_reads_one_side(self, cpu):
+        transceiver = cpu.components["ALU:U8"]
+        assert not transceiver.direction
+        assert not transceiver.get_read_pins() & set(IC74245.A)
+        assert not transceiver.get_driven_pins() & set(IC74245.B)
+
+    def test_eeproms_fused(self, cpu):
+        assert cpu.optimization.fused == [
+            "C2:TABLE7+C3:TABLE5+C3:TABLE3+C3:TABLE1",
+            "C2:TABLE8+C3:TABLE6+C3:TABLE4+C3:TABLE2",
+        ]
+        bank = cpu.components[cpu.optimization.fused[0]]
+        assert isinstance(bank, IC28C256Bank)
+        assert not any(isinstance(c, IC28C256) for c in cpu.components.values())
+
+        # Byte k from the k-th chip, whose mapped table the bank shares
+        table1 = bank.chips[3]
+        assert table1.name == "C3:TABLE1"
+        assert bank.memories[3] is table1.memory
+        assert memoryview(bank.memories[3]).readonly
+        assert all(
+            bank.read(address)[3] == table1.memory[address]
+            for address in range(0, 32768, 97)
+        )
+
+    def test_hash_follows_folding(self, cpu):
+        plain = load(MODULES_ABS, TABLES_ABS, False)
+        assert design_hash(plain) != design_hash(cpu)
+
+
+class TestGeneratedCode:
+    """Folded constants and pruned outputs disappear from generated code."""
+
+    def test_constant_and_dead_output(self):
+        netlist = Netlist(["A!", "Y!"], ["U1", "BP"])
+        networks = [Network("A"), Network("Y")]
+        for slot, network in enumerate(networks):
+            network.bind(netlist, slot)
+
+        gate = IC7400("U1", dict(zip((IC7400.A1, IC7400.Y1), networks)))
+        gate.bind(netlist, 0)
+        gate.fold({0: True}, {netlist.sink})
+        lines = gate.generate()
+        assert "    drive(1, 0, not (s[2] == 2 and True))" in lines
+        assert "    pass" in lines
+
+
+class TestEquivalence:
+    """Optimized designs against the plain ones."""
+
+    @pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+    def test_same_waveform(self, scheduling):
+        # Banks report their chips as drivers, in the order of the bank
+        expected = run_engine(scheduling, False)
+        actual = run_engine(scheduling, True)
+        assert len(actual) == len(expected)
+        for chunk, reference in zip(actual, expected):
+            assert chunk.network_states == reference.network_states, chunk.tick
+            assert normalize_drivers(chunk) == normalize_drivers(reference), chunk.tick
+            assert chunk.variables == reference.variables, chunk.tick
+
+    def test_chips_named_as_in_netlists(self):
+        plain = loaded_engine(optimize=False, reset=False)
+        engine = loaded_engine(reset=False)
+        assert engine.get_component_pins() == plain.get_component_pins()
+        assert engine.get_component_pins()["C2:TABLE7"]["D0"]
+
+        # TABLE1 and TABLE2 share their data lines and take turns driving them
+        engine.reset(INIT_TICKS, STARTUP_TICKS)
+        drivers = engine.tick().network_drivers
+        table = engine.get_component_pins()["C3:TABLE1"]
+        assert drivers[table["D0"]] in (["C3:TABLE1"], ["C3:TABLE2"])
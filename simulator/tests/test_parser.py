@@ -0,0 +1,89 @@
+"""
+Tests for the .frp netlist parser.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.engine.entities.ics.ic74xx import IC7404
+from simulator.engine.parser import parse
+
+NETLIST = """\
+.HEA
+.TYP FULL
+
+.ADD_COM     U1     "74LS04"     "Package_DIP:DIP-14_W7.62mm_Socket_LongPads"
+.ADD_COM     R1     "R"     "Resistor_THT:R_Axial"
+.ADD_COM     R2     "5kOhm"     "Resistor_THT:R_Axial"
+.ADD_COM     C1     "C"     "Capacitor_THT:C_Disc"
+
+.ADD_TER   U1   14     "VCC"
+.TER       R1   1
+.TER       C1   1
+
+.ADD_TER   R1   2     "/In"
+.TER       U1   1
+.TER       R2   1
+
+.ADD_TER   R2   2     "/Out"
+.TER       U1   2
+.END
+"""
+
+
+def pins(component) -> dict[str, str]:
+    # Network names without the "!" suffix of the engine
+    return {pin: network.name[:-1] for pin, network in component.pins.items()}
+
+
+def test_pull_ups_joined_to_vcc():
+    components, networks = parse(NETLIST)
+    assert [network.name for network in networks] == ["VCC!"]
+    (inverter,) = components
+    assert isinstance(inverter, IC7404)
+    assert pins(inverter) == {"14": "VCC", "1": "VCC", "2": "VCC"}
+
+
+def test_formatting_drift():
+    drifted = (
+        '.ADD_COM U1\t"74LS04"  "$noname"\n'
+        '  .ADD_TER\tU1 1  "/Sheet A/Net 1"\n'
+        ".TER U1\t2\n"
+        "   U1    3\n"
+    )
+    (inverter,), (network,) = parse(drifted.splitlines(keepends=True))
+    assert network.name == "/Sheet A/Net 1!"
+    assert pins(inverter) == dict.fromkeys(["1", "2", "3"], "/Sheet A/Net 1")
+
+
+@pytest.mark.parametrize(
+    "netlist, message",
+    [
+        ('.ADD_COM U1 "74LS04"\n', "Line 1: expected 3 fields"),
+        ('.ADD_COM U1 "74LS04" "x"\n.TER U1 1\n', "Line 2: .TER found before"),
+        ('.ADD_COM U1 "74LS04" "x"\n.ADD_TER U2 1 "A"\n', "Line 2: Component U2 not"),
+        (
+            '.ADD_COM U1 "74LS04" "x"\n.ADD_COM U1 "74LS04" "x"\n',
+            "Line 2: Component U1 defined multiple times",
+        ),
+        (
+            '.ADD_COM U1 "74LS04" "x"\n.ADD_TER U1 1 "A"\n.ADD_TER U1 2 "A"\n',
+            "Line 3: Network A defined multiple times",
+        ),
+        (
+            '.ADD_COM R1 "R" "x"\n.ADD_TER R1 1 "A"\n.ADD_TER R1 2 "B"\n',
+            "Resistor R1 is not connected to VCC",
+        ),
+        (
+            '.ADD_COM R1 "R" "x"\n.ADD_TER R1 1 "VCC"\n.TER R1 2\n',
+            "Resistor R1 does not have exactly two connections",
+        ),
+    ],
+)
+def test_errors(netlist, message):
+    with pytest.raises(ValueError, match=message):
+        parse(netlist)
@@ -0,0 +1,69 @@
+"""
+Tests for the profiling instrumentation of CPU.propagate.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.simulation import Scheduling
+from tests.conftest import loaded_engine
+
+
+@pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+def test_same_waveform(scheduling):
+    reference = loaded_engine(scheduling)
+    engine = loaded_engine(scheduling)
+    engine.cpu.start_profiling()
+    for actual, expected in zip(
+        engine.step_cycles(4, 100), reference.step_cycles(4, 100)
+    ):
+        assert actual.network_states == expected.network_states
+        assert actual.variables == expected.variables
+
+
+def test_report():
+    engine = loaded_engine(Scheduling.SWEEP)
+    engine.cpu.start_profiling()
+    engine.step_cycles(2, 100)
+    report = engine.cpu.stop_profiling()
+
+    assert report.total > 0
+    assert {"IC28C256Bank", "IC74181"} <= set(report.classes)
+    assert set(report.phases) == {"networks", "backplane"}
+    calls, _ = report.classes["IC74181"]
+    assert calls == sum(report.components[name][0] for name in ("ALU:U4", "ALU:U5"))
+    assert report.lines(3)[0].startswith("Propagate: ")
+
+
+def test_stop_restores_plain_loop():
+    engine = loaded_engine(Scheduling.EVENT)
+    cpu = engine.cpu
+    propagators = cpu._propagators
+    cpu.start_profiling()
+    assert cpu._propagators is not propagators
+    assert "propagate" in vars(cpu) and "resolve" in vars(cpu.netlist)
+
+    cpu.stop_profiling()
+    assert cpu.profiler is None
+    assert cpu._propagators is propagators
+    assert "propagate" not in vars(cpu)
+    assert not {"resolve", "commit", "swap"} & set(vars(cpu.netlist))
+    assert "drive_power" not in vars(cpu.backplane)
+    assert cpu.stop_profiling() is None
+
+
+def test_dump(tmp_path):
+    engine = loaded_engine(Scheduling.EVENT)
+    engine.cpu.start_profiling()
+    engine.step_cycles(2, 100)
+    path = tmp_path / "profile.json"
+    engine.cpu.stop_profiling().dump(str(path))
+
+    data = json.loads(path.read_text())
+    assert set(data) == {"total", "phases", "classes", "components"}
+    assert data["components"]["I:PAD2"]["calls"] > 0
@@ -0,0 +1,222 @@
+"""
+Tests for event-driven, delta cycle and timed scheduling.
+
+The event-driven engine must produce exactly the same waveform as the
+full-sweep engine, tick for tick. The delta cycle and timed engines must agree
+with it at the clock edges.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.engine.entities import cpu
+from simulator.engine.entities.ics.ic28c256 import IC28C256, IC28C256Bank
+from simulator.engine.netlist import HIGH
+from simulator.simulation import CycleSample, Scheduling
+from tests.conftest import hold_reset, loaded_engine
+from tests.test_lockstep import STORE_ROM
+
+
+def run_engine(scheduling: Scheduling, cycles: int = 8, period: int = 20):
+    engine = hold_reset(loaded_engine(scheduling, reset=False))
+    chunks = []
+
+    for _ in range(100):
+        chunks.append(engine.tick())
+
+    engine.set_component_variable("I:PAD2", "RESET", 0)
+    for _ in range(100):
+        chunks.append(engine.tick())
+
+    for _ in range(cycles):
+        engine.set_component_variable("I:PAD2", "CLOCK", 0)
+        for _ in range(period // 2 + 1):
+            chunks.append(engine.tick())
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        for _ in range(period // 2):
+            chunks.append(engine.tick())
+
+    return chunks
+
+
+@pytest.fixture(scope="module")
+def waveforms():
+    return run_engine(Scheduling.SWEEP), run_engine(Scheduling.EVENT)
+
+
+class TestEventScheduling:
+    """Event-driven scheduling against the full-sweep reference."""
+
+    def test_same_number_of_ticks(self, waveforms):
+        sweep, event = waveforms
+        assert len(sweep) == len(event)
+
+    def test_network_states_match(self, waveforms):
+        for expected, actual in zip(*waveforms):
+            assert actual.network_states == expected.network_states, actual.tick
+
+    def test_network_drivers_match(self, waveforms):
+        for expected, actual in zip(*waveforms):
+            assert actual.network_drivers == expected.network_drivers, actual.tick
+
+    def test_variables_match(self, waveforms):
+        for expected, actual in zip(*waveforms):
+            assert actual.variables == expected.variables, actual.tick
+
+    def test_switching_mode_mid_run(self):
+        engine = loaded_engine(reset=False)
+        reference = loaded_engine(reset=False)
+
+        for target in (engine, reference):
+            target.set_power(True)
+            target.set_component_variable("I:PAD2", "RESET", 1)
+
+        for _ in range(50):
+            engine.tick()
+            reference.tick()
+
+        engine.set_scheduling(Scheduling.EVENT)
+        for _ in range(50):
+            actual = engine.tick()
+            expected = reference.tick()
+            assert actual.network_states == expected.network_states
+
+
+class TestDeltaScheduling:
+    """Delta cycle scheduling settles every tick and agrees at the clock edges."""
+
+    PERIOD = 100
+
+    def test_settles_in_one_tick(self):
+        engine = loaded_engine(Scheduling.DELTA, reset=False)
+        engine.set_power(True)
+        engine.tick()
+        assert engine.cpu.is_settled()
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        engine.tick()
+        assert engine.cpu.is_settled()
+
+    def test_matches_event_scheduling(self):
+        event = loaded_engine(Scheduling.EVENT)
+        delta = loaded_engine(Scheduling.DELTA)
+        for _ in range(10):
+            for sample in (CycleSample.RISING_EDGE, CycleSample.END):
+                (expected,) = event.step_cycles(1, self.PERIOD, sample)
+                (actual,) = delta.step_cycles(1, self.PERIOD, sample)
+                assert actual.network_states == expected.network_states
+                assert actual.variables == expected.variables
+
+    def test_oscillation_detected(self, monkeypatch):
+        monkeypatch.setattr(cpu, "DELTA_LIMIT", 3)
+        engine = loaded_engine(Scheduling.DELTA, reset=False)
+        engine.set_power(True)
+        with pytest.raises(RuntimeError, match="Oscillation"):
+            engine.tick()
+
+
+class TestTimedScheduling:
+    """Timed scheduling applies the delay of every part's logic family."""
+
+    PERIOD = 100
+
+    def test_part_delays(self):
+        components = loaded_engine(Scheduling.TIMED).cpu.components
+        assert components["ALU:U5"].delay == 2
+        assert components["C1:U1"].delay == 1
+        assert all(
+            component.delay == 10
+            for component in components.values()
+            if isinstance(component, (IC28C256, IC28C256Bank))
+        )
+
+    def test_eeprom_responds_after_access_time(self):
+        engine = loaded_engine(Scheduling.TIMED)
+        bank = engine.cpu.components[engine.cpu.optimization.fused[0]]
+        state = engine.cpu.netlist.state
+
+        def sample() -> tuple[bytes, bytes]:
+            address, data = bank.A, bank.D
+            return bytes(state[s] for s in address), bytes(state[s] for s in data)
+
+        changes = {}
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        previous = sample()
+        for tick in range(40):
+            engine.tick(capture=False)
+            current = sample()
+            for i, name in enumerate(("address", "data")):
+                if current[i] != previous[i]:
+                    changes.setdefault(name, tick)
+
+            previous = current
+
+        assert changes["data"] - changes["address"] == 10
+
+    def test_runs_program_like_delta_scheduling(self):
+        # Registers loaded while reset settles may differ, the longer decoder
+        # delay lets other glitches through, the program must not
+        delta = loaded_engine(Scheduling.DELTA).step_cycles(100, self.PERIOD)
+        timed = loaded_engine(Scheduling.TIMED).step_cycles(100, self.PERIOD)
+        assert len(timed) == len(delta) < 100
+        assert timed[-1].variables == delta[-1].variables
+        assert timed[-1].network_states == delta[-1].network_states
+
+    def test_flags_clock_glitch_at_power_on(self):
+        # The flags register has no reset, its clock is NOR(~CLK, U3-Pad4) and
+        # the interface only drives ~CLK once the memory strobes are valid. With
+        # delays the strobes resolve a tick after U3-Pad4 falls, so the clock
+        # pulses once and the register loads its D inputs
+        nets = ["C2:/~CLK!", "C2:Net-(U3-Pad4)!", "C2:Net-(U2-Cp)!"]
+        trace = {}
+        for scheduling in (Scheduling.SWEEP, Scheduling.TIMED):
+            engine = hold_reset(loaded_engine(scheduling, reset=False))
+            slots = [engine.cpu.networks[net].slot for net in nets]
+            state = engine.cpu.netlist.state
+            trace[scheduling] = []
+            for _ in range(8):
+                engine.tick(capture=False)
+                trace[scheduling].append([state[slot] == HIGH for slot in slots])
+
+        for scheduling, ticks in trace.items():
+            for (clock, pad4, _), (_, _, cp) in zip(ticks, ticks[1:]):
+                assert cp == (not clock and not pad4), scheduling
+
+        cp = {
+            scheduling: [tick[2] for tick in ticks]
+            for scheduling, ticks in trace.items()
+        }
+        assert cp[Scheduling.SWEEP][:5] == [False, True, False, False, False]
+        assert cp[Scheduling.TIMED][:5] == [False, True, False, True, False]
+
+    def test_runs_store_program_like_sweep_scheduling(self):
+        # Only the power on contents of the flags register differ
+        sweep = loaded_engine(rom=STORE_ROM).step_cycles(100, 800)
+        timed = loaded_engine(Scheduling.TIMED, STORE_ROM).step_cycles(100, 800)
+        assert len(timed) == len(sweep) < 100
+        for expected, actual in zip(sweep, timed):
+            assert actual.variables.pop("C2:U2") == {"Q": 0x40}
+            del expected.variables["C2:U2"]
+            assert actual.variables == expected.variables
+
+    def test_settled_once_nothing_is_due(self):
+        engine = loaded_engine(Scheduling.TIMED)
+        assert engine.cpu.is_settled()
+        engine.set_component_variable("I:PAD2", "CLOCK", 1)
+        engine.tick()
+        assert not engine.cpu.is_settled()
+        assert engine.settle(200) < 200
+        assert not any(engine.cpu._wheel)
+
+    def test_clone_keeps_scheduled_components(self):
+        reference = loaded_engine(Scheduling.TIMED)
+        reference.set_component_variable("I:PAD2", "CLOCK", 1)
+        reference.advance(3)
+        assert any(reference.cpu._wheel)
+
+        engine = reference.clone()
+        for _ in range(60):
+            assert engine.tick().network_states == reference.tick().network_states
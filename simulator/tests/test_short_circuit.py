@@ -20,8 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import INIT_TICKS, MODULES, PERIOD, STARTUP_TICKS, TABLES_PATH
 from simulator.base import State
-from simulator.engine.loader import load
-from simulator.simulation import SimulationEngine
+from simulator.simulation import Backend, SimulationEngine
 
 # Resolve paths relative to simulator directory
 SIMULATOR_DIR = Path(__file__).parent.parent
@@ -50,14 +49,18 @@ class ShortCircuitDetector:
     a network to different logic levels simultaneously.
     """
 
-    def __init__(self, rom: Optional[bytes] = None):
+    def __init__(
+        self, rom: Optional[bytes] = None, backend: Backend = Backend.INTERPRETED
+    ):
         """
         Initialize the detector.
 
         Args:
             rom: ROM contents to use. Defaults to NOP-filled ROM.
+            backend: Backend the simulation engine propagates with.
         """
         self.rom = rom if rom is not None else bytes([0x00] * 65536)
+        self.backend = backend
         self.conflicts: list[ConflictReport] = []
         self.engine: Optional[SimulationEngine] = None
 
@@ -84,8 +87,12 @@ class ShortCircuitDetector:
             # Build absolute paths for modules
             modules_abs = [(str(SIMULATOR_DIR / path), name) for path, name in MODULES]
 
-            cpu = load(modules_abs, str(MICROCODE_TABLES_PATH))
-            self.engine = SimulationEngine(cpu, self.rom)
+            self.engine = SimulationEngine.load(
+                modules_abs,
+                str(MICROCODE_TABLES_PATH),
+                self.rom,
+                backend=self.backend,
+            )
             return True
         except Exception as e:
             print(f"Failed to load CPU: {e}")
@@ -245,9 +252,9 @@ class TestShortCircuitDetection:
     SKIP_STARTUP_TICKS = 50
 
     @pytest.fixture
-    def detector(self):
-        """Create a fresh ShortCircuitDetector."""
-        return ShortCircuitDetector()
+    def detector(self, backend):
+        """Create a fresh ShortCircuitDetector for every backend."""
+        return ShortCircuitDetector(backend=backend)
 
     @pytest.fixture
     def nop_rom(self):
@@ -0,0 +1,25 @@
+"""
+Tests for the startup of the command line simulator.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import INIT_TICKS, PERIOD, STARTUP_TICKS
+from simulate import Simulator
+from tests.conftest import loaded_engine
+
+
+def test_every_startup_tick_checked(capsys):
+    """Conflicts of startup ticks before the design settles are reported."""
+    simulator = Simulator(loaded_engine(reset=False), PERIOD)
+    checked = []
+    simulator.check_conflicts = lambda chunk: checked.append(chunk.tick)
+
+    chunk = simulator.start(INIT_TICKS, STARTUP_TICKS)
+    assert len(checked) > 1
+    assert checked == list(range(checked[0], chunk.tick + 1))
+    assert simulator.simulation_engine.cpu.is_settled()
+    assert "Power connected on pin VCC" in capsys.readouterr().out
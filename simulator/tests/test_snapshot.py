@@ -0,0 +1,115 @@
+"""
+Tests for saving and restoring full engine state snapshots and for engine
+clones.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import PERIOD
+from simulator import simulation
+from simulator.simulation import Scheduling
+from tests.conftest import TEST_ROM, loaded_engine
+
+LABEL = "reset"
+
+
+@pytest.mark.parametrize("scheduling", [Scheduling.SWEEP, Scheduling.EVENT])
+def test_restored_engine_runs_the_same(scheduling, tmp_path):
+    reference = loaded_engine(scheduling)
+    reference.save_snapshot(str(tmp_path), LABEL)
+
+    engine = loaded_engine(scheduling, reset=False)
+    assert engine.load_snapshot(str(tmp_path), LABEL)
+    assert engine._tick == reference._tick
+    for actual, expected in zip(
+        engine.step_cycles(6, PERIOD), reference.step_cycles(6, PERIOD)
+    ):
+        assert actual.tick == expected.tick
+        assert actual.network_states == expected.network_states
+        assert actual.network_drivers == expected.network_drivers
+        assert actual.variables == expected.variables
+
+
+def test_restore_replaces_memory(tmp_path):
+    engine = loaded_engine(Scheduling.EVENT)
+    engine.save_snapshot(str(tmp_path), LABEL)
+
+    engine.motherboard.write(0x4000, 0x5A)
+    engine.set_component_variable("PC:U4", "Q", 7)
+    assert engine.load_snapshot(str(tmp_path), LABEL)
+    assert engine.motherboard.read(0x4000) == 0
+    assert engine.tick().variables["PC:U4"]["Q"] != 7
+
+
+def test_key(tmp_path):
+    def get_key(scheduling: Scheduling, rom: bytes = TEST_ROM) -> str:
+        return loaded_engine(scheduling, rom, reset=False).get_snapshot_key(LABEL)
+
+    engine = loaded_engine(Scheduling.EVENT, reset=False)
+    key = engine.get_snapshot_key(LABEL)
+    assert key != engine.get_snapshot_key("other")
+    assert key != get_key(Scheduling.EVENT, TEST_ROM[:-1])
+    assert key != get_key(Scheduling.SWEEP)
+    assert key == get_key(Scheduling.EVENT)
+
+
+def test_key_follows_sources(monkeypatch):
+    key = loaded_engine(Scheduling.EVENT, reset=False).get_snapshot_key(LABEL)
+    monkeypatch.setattr(simulation, "hash_sources", lambda root: "edited")
+    assert loaded_engine(Scheduling.EVENT, reset=False).get_snapshot_key(LABEL) != key
+
+
+def test_missing_or_corrupt(tmp_path):
+    engine = loaded_engine(Scheduling.EVENT, reset=False)
+    assert not engine.load_snapshot(str(tmp_path), LABEL)
+
+    engine.save_snapshot(str(tmp_path), LABEL)
+    (path,) = tmp_path.glob("state_*.bin")
+    path.write_bytes(b"garbage")
+    assert not engine.load_snapshot(str(tmp_path), LABEL)
+
+
+@pytest.mark.parametrize(
+    "scheduling", [Scheduling.SWEEP, Scheduling.EVENT, Scheduling.DELTA]
+)
+def test_clone_runs_the_same(scheduling):
+    reference = loaded_engine(scheduling)
+    reference.step_cycles(3, PERIOD)
+
+    engine = reference.clone()
+    for actual, expected in zip(
+        engine.step_cycles(6, PERIOD), reference.step_cycles(6, PERIOD)
+    ):
+        assert actual.tick == expected.tick
+        assert actual.network_states == expected.network_states
+        assert actual.network_drivers == expected.network_drivers
+        assert actual.variables == expected.variables
+
+
+def test_clone_is_independent():
+    reference = loaded_engine(Scheduling.EVENT)
+    engine = reference.clone()
+
+    engine.motherboard.write(0x4000, 0x5A)
+    engine.set_component_variable("PC:U4", "Q", 7)
+    engine.set_component_variable("I:PAD2", "RESET", 1)
+    assert engine.tick().variables["PC:U4"]["Q"] == 7
+
+    assert reference.motherboard.read(0x4000) == 0
+    chunk = reference.tick()
+    assert chunk.variables["PC:U4"]["Q"] != 7
+    assert chunk.variables["I:PAD2"]["RESET"] == 0
+
+
+def test_clone_shares_design():
+    reference = loaded_engine(Scheduling.EVENT, reset=False)
+    engine = reference.clone()
+    name = reference.cpu.optimization.fused[0]
+    bank = reference.cpu.components[name]
+    assert engine.cpu.components[name].memories[0] is bank.memories[0]
+    assert engine.cpu.netlist.names is reference.cpu.netlist.names
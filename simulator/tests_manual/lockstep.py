@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Run main.bin on the simulation and the microcode emulator in lockstep"""
+
+import sys
+
+from config import CYCLES, INIT_TICKS, MODULES, PERIOD, STARTUP_TICKS, TABLES_PATH
+from simulator.lockstep import LockstepRunner
+
+with open("main.bin", "rb") as f:
+    rom_data = f.read()
+
+runner = LockstepRunner.load(MODULES, TABLES_PATH, rom_data)
+runner.reset(INIT_TICKS, STARTUP_TICKS)
+divergence = runner.run(CYCLES, PERIOD)
+if divergence is None:
+    print(f"No divergence in {runner.cycle} cycles")
+    sys.exit(0)
+
+print("\n".join(divergence.lines()))
+sys.exit(1)
@@ -40,14 +40,7 @@ def read_register(chunk, registers, size):
 
 
 def step():
-    engine.set_component_variable("I:PAD2", "CLOCK", 0)
-    for _ in range(PERIOD // 2):
-        engine.tick()
-    chunk = engine.tick()
-    engine.set_component_variable("I:PAD2", "CLOCK", 1)
-    for _ in range(PERIOD // 2):
-        chunk = engine.tick()
-    return chunk
+    return engine.step_cycles(1, PERIOD, stop_on_halt=False)[0]
 
 
 # Run until we see halt
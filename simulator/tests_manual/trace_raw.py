@@ -29,14 +29,7 @@ for _ in range(STARTUP_TICKS):
 
 
 def step():
-    engine.set_component_variable("I:PAD2", "CLOCK", 0)
-    for _ in range(PERIOD // 2):
-        engine.tick()
-    engine.tick()
-    engine.set_component_variable("I:PAD2", "CLOCK", 1)
-    for _ in range(PERIOD // 2):
-        chunk = engine.tick()
-    return chunk
+    return engine.step_cycles(1, PERIOD, stop_on_halt=False)[0]
 
 
 def read_reg(chunk, regs, size):